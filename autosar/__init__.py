@@ -49,13 +49,11 @@ class DcfParser:
 def workspace(version=3.0, packages=None):
    return autosar.Workspace(version, packages)
 
-def dcfImport(filename):
+def dcfImport(filename, processes=1, cacheDir=None):
    parser = DcfParser()
    dcf = parser.readFile(filename)
    ws = workspace()
-   result = {}
-   for elem in dcf['fileRef']:
-      ws.loadXML(elem['path'])
+   ws.loadXMLFiles([elem['path'] for elem in dcf['fileRef']], processes, cacheDir)
    return ws
 
 def loadDcf(filename):
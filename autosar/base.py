@@ -1,5 +1,7 @@
 import xml.etree.ElementTree as ElementTree
 import re
+import hashlib
+import weakref
 
 class AdminData(object):
    def __init__(self):
@@ -41,13 +43,350 @@ class SpecialDataGroup(object):
    def __ne__(self, other): return not (self == other)
    
 
-def removeNamespace(doc, namespace):
-   """Removes XML namespace in place."""
+#workspaces having a reverse reference index (see Workspace.findReferences)
+_refIndexWorkspaces = weakref.WeakSet()
+
+def registerRefIndex(ws):
+   """
+   Registers ws to be notified by referencesChanged (called when ws builds its reverse reference index).
+   """
+   _refIndexWorkspaces.add(ws)
+
+def referencesChanged(obj):
+   """
+   Notifies the workspace of obj that the references made by obj (or one of its child objects) may have changed.
+   The package element containing obj is indexed again by the reverse reference index the next time the index is used.
+   Called automatically when a reference attribute (name ending with Ref), the parent or a tracked list or object (see trackObject)
+   of an object in the element tree changes.
+   """
+   if (len(_refIndexWorkspaces) == 0) or hasattr(obj, '_subPackages'):
+      return
+   visited = set()
+   elem = obj
+   parent = _parentObject(elem)
+   while (parent is not None) and not hasattr(parent, '_subPackages'):
+      if id(parent) in visited:
+         return
+      visited.add(id(parent))
+      elem = parent
+      parent = _parentObject(elem)
+   if parent is not None:
+      ws = parent.rootWS()
+      if (ws is not None) and (ws in _refIndexWorkspaces):
+         ws._referencesChanged(elem)
+
+def getCachedRef(obj, calcFunc):
+   """
+   Returns the reference string of obj. The result of calcFunc is cached in obj._refCache together with the reference of the parent
+   it was calculated from. A parent returns the same string object for as long as its own reference is unchanged, renaming or moving
+   an object therefore only invalidates the cached references of its own subtree.
+   """
+   parent = obj.parent
+   parentRef = None if parent is None else parent.ref
+   refCache = getattr(obj, '_refCache', None)
+   if (refCache is not None) and (refCache[0] is parentRef):
+      return refCache[1]
+   ref = calcFunc()
+   object.__setattr__(obj, '_refCache', (parentRef, ref))
+   return ref
+
+def setElementAttribute(obj, key, value):
+   """
+   Assigns value to the attribute key of obj (an element, port, value or package) and invalidates the data depending on it:
+   the cached reference of obj (name and parent), the reverse reference index (parent, lists and attributes with a name ending
+   with Ref) and the fingerprints of obj and its parents.
+   """
+   if key == 'name' or key == 'parent':
+      object.__setattr__(obj, '_refCache', None)
+   if key != 'name':
+      referencesChanged(obj)
+   if getattr(obj, '_fingerprint', None) is not None:
+      clearFingerprint(obj)
+   object.__setattr__(obj, key, value)
+   if key == 'parent':
+      clearFingerprint(obj) #new parent
+      referencesChanged(obj)
+
+_attributeNames = {}
+
+def objectAttributeNames(cls):
+   """
+   Returns the names of the attributes stored in the __slots__ of cls (and its base classes), excluding internal caches.
+   """
+   names = _attributeNames.get(cls)
+   if names is None:
+      names = []
+      for baseClass in reversed(cls.__mro__):
+         slots = baseClass.__dict__.get('__slots__', ())
+         if isinstance(slots, str):
+            slots = (slots,)
+         for name in slots:
+            if (name not in ('__dict__', '__weakref__', '_refCache', '_fingerprint', '_owner')) and (name not in names):
+               names.append(name)
+      _attributeNames[cls] = names
+   return names
+
+def objectItems(obj):
+   """
+   Returns a list of (name, value) pairs for the attributes of obj.
+   Attributes stored in __slots__ are returned before the ones stored in __dict__, unassigned slots are skipped.
+   """
+   names = objectAttributeNames(obj.__class__)
+   items = []
+   for name in names:
+      try:
+         items.append((name, getattr(obj, name)))
+      except AttributeError:
+         pass
+   if hasattr(obj, '__dict__'):
+      items.extend(obj.__dict__.items())
+   return items
+
+#attributes not included in fingerprints (InternalBehavior.swc is a cached link to the component referenced by componentRef)
+_fingerprintIgnored = frozenset(['parent', 'swc'])
+
+def getFingerprint(obj):
+   """
+   Returns the fingerprint (SHA-1 hex digest) of obj: a stable hash of its class, attributes and child objects.
+   Child objects with a fingerprint of their own (elements, ports, values) contribute their cached fingerprint, other objects found
+   inside obj only contribute their reference when they have a parent of their own (e.g. a package element).
+   The result is cached in obj._fingerprint until obj or one of its child objects is modified (see trackObject).
+   """
+   fingerprint = getattr(obj, '_fingerprint', None)
+   if fingerprint is None:
+      sha = hashlib.sha1()
+      sha.update(obj.__class__.__name__.encode('utf-8'))
+      if hasattr(obj, 'subPackages'):
+         #package: only its own name and role, the fingerprints of its elements and sub-packages
+         _updateFingerprint(sha, [obj.name, obj.role, obj.elements, obj.subPackages], obj)
+      else:
+         _updateFingerprint(sha, sorted((name, value) for name, value in trackObject(obj) if name not in _fingerprintIgnored), obj)
+      fingerprint = sha.hexdigest()
+      object.__setattr__(obj, '_fingerprint', fingerprint)
+   return fingerprint
+
+def clearFingerprint(obj):
+   """
+   Removes the cached fingerprint of obj and of its parents (or owners, see trackObject).
+   Called automatically when an attribute of a model object is assigned or when a tracked list is modified.
+   """
+   visited = set()
+   while (obj is not None) and (id(obj) not in visited):
+      visited.add(id(obj))
+      if getattr(obj, '_fingerprint', None) is not None:
+         object.__setattr__(obj, '_fingerprint', None)
+      obj = _parentObject(obj)
+      if (obj is not None) and hasattr(type(obj), '_fingerprint') and (getattr(obj, '_fingerprint', None) is None):
+         break #the parents of an object without cached fingerprint have no cached fingerprint either
+
+def setObjectState(obj, state):
+   """
+   Restores the state of an unpickled (or copied) model object, used by the __setstate__ methods of the model objects.
+   The attributes are assigned directly, without the change tracking of __setattr__: the cached fingerprints and references in state
+   are consistent with the objects restored with them.
+   """
+   slotState = None
+   if isinstance(state, tuple):
+      state, slotState = state
+   if state:
+      obj.__dict__.update(state)
+   if slotState:
+      for key, value in slotState.items():
+         object.__setattr__(obj, key, value)
+
+def objectChanged(obj):
+   """
+   Called when obj (a model object) was modified in place.
+   Clears the cached fingerprints of obj and its parents and notifies the reverse reference index.
+   """
+   clearFingerprint(obj)
+   referencesChanged(obj)
+
+def _parentObject(obj):
+   """returns the parent of obj, or its owner when obj has no parent"""
+   parent = getattr(obj, 'parent', None)
+   if parent is None:
+      parent = getattr(obj, '_owner', None)
+   return parent
+
+def _setOwner(value, owner):
+   if isinstance(value, OwnedObject):
+      object.__setattr__(value, '_owner', owner)
+
+def trackObject(obj):
+   """
+   Returns objectItems(obj) after preparing obj for change tracking.
+   List attributes of obj are replaced by TrackedLists and the objects without parent held by obj (com-specs, instance references etc.)
+   get obj as their owner. Modifying them in place afterwards clears the cached fingerprint of obj and notifies the reverse reference index.
+   Called when data derived from obj is cached: by getFingerprint and when the reverse reference index of a workspace is built.
+   """
+   items = objectItems(obj)
+   if isinstance(obj, OwnedObject) or hasattr(type(obj), '_fingerprint'):
+      for i, (name, value) in enumerate(items):
+         if type(value) is list:
+            value = TrackedList(obj, value)
+            object.__setattr__(obj, name, value)
+            items[i] = (name, value)
+         elif name != 'parent':
+            _setOwner(value, obj)
+   return items
+
+class TrackedList(list):
+   """
+   List attribute of a model object (see trackObject).
+   Modifying the list clears the cached fingerprint of its owner and notifies the reverse reference index of the workspace.
+   """
+   __slots__ = ('owner',)
+
+   def __init__(self, owner, items=()):
+      list.__init__(self, items)
+      self.owner = owner
+      for item in self:
+         _setOwner(item, owner)
+
+   def _changed(self, items=()):
+      owner = getattr(self, 'owner', None) #not yet assigned while unpickling
+      if owner is not None:
+         for item in items:
+            _setOwner(item, owner)
+         objectChanged(owner)
+
+   def append(self, item):
+      list.append(self, item)
+      self._changed((item,))
+
+   def extend(self, items):
+      start = len(self)
+      list.extend(self, items)
+      self._changed(self[start:])
+
+   def insert(self, index, item):
+      list.insert(self, index, item)
+      self._changed((item,))
+
+   def remove(self, item):
+      list.remove(self, item)
+      self._changed()
+
+   def pop(self, *args):
+      item = list.pop(self, *args)
+      self._changed()
+      return item
+
+   def clear(self):
+      list.clear(self)
+      self._changed()
+
+   def sort(self, *args, **kwargs):
+      list.sort(self, *args, **kwargs)
+      self._changed()
+
+   def reverse(self):
+      list.reverse(self)
+      self._changed()
+
+   def __setitem__(self, index, value):
+      if isinstance(index, slice):
+         value = list(value)
+         list.__setitem__(self, index, value)
+         self._changed(value)
+      else:
+         list.__setitem__(self, index, value)
+         self._changed((value,))
+
+   def __delitem__(self, index):
+      list.__delitem__(self, index)
+      self._changed()
+
+   def __iadd__(self, items):
+      self.extend(items)
+      return self
+
+   def __imul__(self, count):
+      list.__imul__(self, count)
+      self._changed()
+      return self
+
+class OwnedObject(object):
+   """
+   Base class of the objects without parent held by model elements (com-specs, instance references, runnable access points etc.).
+   Once the object has an owner (see trackObject), assigning one of its attributes clears the cached fingerprint of the owner.
+   """
+   __slots__ = ('_owner',)
+
+   def __setstate__(self, state):
+      setObjectState(self, state)
+
+   def __setattr__(self, key, value):
+      object.__setattr__(self, key, value)
+      if key != '_owner':
+         owner = getattr(self, '_owner', None)
+         if owner is not None:
+            objectChanged(owner)
+
+def _updateFingerprint(sha, value, owner):
+   if value is None or isinstance(value, (str, int, float, bool)):
+      sha.update(repr(value).encode('utf-8'))
+   elif isinstance(value, (list, tuple)):
+      sha.update(b'[')
+      for item in value:
+         _updateFingerprint(sha, item, owner)
+      sha.update(b']')
+   elif isinstance(value, (set, frozenset)):
+      _updateFingerprint(sha, sorted(value, key=repr), owner)
+   elif isinstance(value, dict):
+      _updateFingerprint(sha, sorted(value.items(), key=lambda item: repr(item[0])), owner)
+   elif hasattr(value, '__dict__') or hasattr(value, '__slots__'):
+      parent = getattr(value, 'parent', None)
+      if value is owner:
+         sha.update(b'<self>')
+      elif (parent is owner) and hasattr(value.__class__, '_fingerprint'):
+         sha.update(getFingerprint(value).encode('ascii'))
+      elif (parent is not owner) and hasattr(value, 'ref') and ((parent is not None) or not hasattr(value, 'parent')):
+         #object found elsewhere in the workspace (or the workspace itself)
+         sha.update(('<%s>'%value.ref).encode('utf-8'))
+      else:
+         sha.update(value.__class__.__name__.encode('utf-8'))
+         _updateFingerprint(sha, sorted((name, item) for name, item in trackObject(value) if name not in _fingerprintIgnored), value)
+   else:
+      sha.update(repr(value).encode('utf-8'))
+
+class StringPool(object):
+   """
+   Pool of shared strings. Equal strings passed to intern are replaced by a single str object.
+   """
+   def __init__(self):
+      self.strings = {}
+
+   def __len__(self):
+      return len(self.strings)
+
+   def intern(self, value):
+      if value is None:
+         return None
+      return self.strings.setdefault(value, value)
+
+   def internNode(self, xmlElem):
+      """
+      Interns the tag of xmlElem as well as its text for SHORT-NAME and reference nodes (tags ending with REF).
+      """
+      tag = self.strings.setdefault(xmlElem.tag, xmlElem.tag)
+      xmlElem.tag = tag
+      if (tag == 'SHORT-NAME' or tag.endswith('REF')) and (xmlElem.text is not None):
+         xmlElem.text = self.strings.setdefault(xmlElem.text, xmlElem.text)
+
+def removeNamespace(doc, namespace, stringPool=None):
+   """
+   Removes XML namespace in place.
+   Tags, short names and references are interned in stringPool when it is not None.
+   """
    ns = u'{%s}' % namespace
    nsl = len(ns)
-   for elem in doc.getiterator():
+   for elem in doc.iter():
       if elem.tag.startswith(ns):
          elem.tag = elem.tag[nsl:]
+      if stringPool is not None:
+         stringPool.internNode(elem)
 
 def parseXMLFile(filename,namespace=None):
    arxml_tree = ElementTree.ElementTree()
@@ -57,6 +396,13 @@ def parseXMLFile(filename,namespace=None):
       removeNamespace(arxml_root,namespace)      
    return arxml_root
 
+def iterparseXMLFile(filename):
+   """
+   Returns an iterator of ('start', elem) and ('end', elem) events for an XML file.
+   The document tree is built incrementally, it is up to the consumer to remove nodes it has finished processing.
+   """
+   return ElementTree.iterparse(filename, events=('start','end'))
+
 def getXMLNamespace(element):
     m = re.match(r'\{(.*)\}', element.tag)
     return m.group(1) if m else None
@@ -90,6 +436,13 @@ def parseAdminDataNode(xmlRoot):
          adminData.specialDataGroups.append(SpecialDataGroup(GID,SD,SD_GID))
    return adminData
 
+def childNodeMap(xmlElem):
+   """
+   Returns a dictionary mapping the tag of each child node of xmlElem to the child node, the children are only walked once.
+   When several children have the same tag the first one is used, the same node as returned by xmlElem.find(tag).
+   """
+   return {xmlChild.tag: xmlChild for xmlChild in reversed(xmlElem)}
+
 def parseTextNode(xmlElem):
    return None if xmlElem is None else xmlElem.text
 def parseIntNode(xmlElem):
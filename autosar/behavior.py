@@ -3,16 +3,18 @@ import autosar.component
 import autosar.portinterface
 import autosar.base
 from autosar.element import Element
-import collections
+import collections.abc
 
 ###################################### Events ###########################################
 class Event(Element):
+   __slots__ = ('startOnEventRef', 'modeDependency')
    def __init__(self,name,startOnEventRef=None, parent=None):
       super().__init__(name,parent)
       self.startOnEventRef = startOnEventRef
       self.modeDependency=None
 
 class ModeSwitchEvent(Event):
+   __slots__ = ('modeInstRef', 'activationType')
    def __init__(self,name,startOnEventRef=None, activationType='ENTRY', parent=None, version=3.0):
       super().__init__(name, startOnEventRef, parent)
       self.modeInstRef=None
@@ -30,6 +32,7 @@ class ModeSwitchEvent(Event):
       return 'MODE-SWITCH-EVENT'
 
 class TimingEvent(Event):
+   __slots__ = ('period',)
    def __init__(self,name,startOnEventRef=None, period=0, parent=None):
       super().__init__(name, startOnEventRef, parent)
       self.period=int(period)
@@ -39,6 +42,7 @@ class TimingEvent(Event):
    
 
 class DataReceivedEvent(Event):
+   __slots__ = ('dataInstanceRef', 'swDataDefsProps')
    def __init__(self, name, startOnEventRef=None, parent=None):
       super().__init__(name, startOnEventRef, parent)
       self.dataInstanceRef=None
@@ -48,6 +52,7 @@ class DataReceivedEvent(Event):
 
 
 class OperationInvokedEvent(Event):
+   __slots__ = ('operationInstanceRef', 'swDataDefsProps')
    def __init__(self, name, startOnEventRef=None, parent=None):
       super().__init__(name, startOnEventRef, parent)
       self.operationInstanceRef=None
@@ -57,6 +62,7 @@ class OperationInvokedEvent(Event):
       return "OPERATION-INVOKED-EVENT"
 
 class InitEvent(Event):
+   __slots__ = ()
    def __init__(self,name,startOnEventRef=None, parent=None):
       super().__init__(name, startOnEventRef, parent)      
    
@@ -66,7 +72,8 @@ class InitEvent(Event):
    
 ####################################################################################################   
 
-class ModeDependency(object):
+class ModeDependency(autosar.base.OwnedObject):
+   __slots__ = ('modeInstanceRefs',)
    def __init__(self):      
       self.modeInstanceRefs=[]
    def asdict(self):
@@ -74,6 +81,7 @@ class ModeDependency(object):
       for modeInstanceRef in self.modeInstanceRefs:
          data['modeInstanceRefs'].append(modeInstanceRef.asdict())
       if len(data['modeInstanceRefs'])==0: del data['modeInstanceRefs']
+      return data
    
    def append(self, item):
       if isinstance(item, ModeInstanceRef) or isinstance(item, ModeDependencyRef):
@@ -81,28 +89,30 @@ class ModeDependency(object):
       else:
          raise ValueError('invalid type: '+str(type(item)))
 
-class ModeInstanceRef(object):
+class ModeInstanceRef(autosar.base.OwnedObject):
+   __slots__ = ('modeDeclarationRef', 'modeDeclarationGroupPrototypeRef', 'requirePortPrototypeRef')
    def __init__(self,modeDeclarationRef,modeDeclarationGroupPrototypeRef=None,requirePortPrototypeRef=None):      
       self.modeDeclarationRef=modeDeclarationRef #MODE-DECLARATION-REF
       self.modeDeclarationGroupPrototypeRef=modeDeclarationGroupPrototypeRef #MODE-DECLARATION-GROUP-PROTOTYPE-REF
       self.requirePortPrototypeRef=requirePortPrototypeRef #R-PORT-PROTOTYPE-REF
    def asdict(self):
       data={'type': self.__class__.__name__}
-      for key, value in self.__dict__.items():
+      for key, value in autosar.base.objectItems(self):
          data[key]=value
       return data
    
    def tag(self,version=None):
       return 'MODE-IREF'
 
-class ModeDependencyRef(object):
+class ModeDependencyRef(autosar.base.OwnedObject):
+   __slots__ = ('modeDeclarationRef', 'modeDeclarationGroupPrototypeRef', 'requirePortPrototypeRef')
    def __init__(self,modeDeclarationRef,modeDeclarationGroupPrototypeRef=None,requirePortPrototypeRef=None):      
       self.modeDeclarationRef=modeDeclarationRef #MODE-DECLARATION-REF
       self.modeDeclarationGroupPrototypeRef=modeDeclarationGroupPrototypeRef #MODE-DECLARATION-GROUP-PROTOTYPE-REF
       self.requirePortPrototypeRef=requirePortPrototypeRef #R-PORT-PROTOTYPE-REF
    def asdict(self):
       data={'type': self.__class__.__name__}
-      for key, value in self.__dict__.items():
+      for key, value in autosar.base.objectItems(self):
          data[key]=value
       return data
    
@@ -111,7 +121,8 @@ class ModeDependencyRef(object):
 
 
 
-class PortAPIOption():
+class PortAPIOption(autosar.base.OwnedObject):
+   __slots__ = ('portRef', 'takeAddress', 'indirectAPI')
    def __init__(self,portRef,takeAddress=False,indirectAPI=False):
       self.portRef = portRef
       self.takeAddress = bool(takeAddress)
@@ -122,25 +133,36 @@ class PortAPIOption():
    
    def tag(self,version=None): return "PORT-API-OPTION"
    
-class DataReceivePoint:
+class DataReceivePoint(autosar.base.OwnedObject):
+   __slots__ = ('portRef', 'dataElemRef', 'name', 'parent')
    def __init__(self,portRef,dataElemRef=None,name=None,parent=None):
       self.portRef=portRef
       self.dataElemRef=dataElemRef
       self.name=name
       self.parent=parent
+
+   def asdict(self):
+      data={'type': self.__class__.__name__,'name':self.name, 'portRef':self.portRef, 'dataElemRef':self.dataElemRef}
+      return data
    
    def tag(self,version=None): return "DATA-RECEIVE-POINT"
 
-class DataSendPoint:
+class DataSendPoint(autosar.base.OwnedObject):
+   __slots__ = ('portRef', 'dataElemRef', 'name', 'parent')
    def __init__(self,portRef,dataElemRef=None,name=None,parent=None):
       self.portRef=portRef
       self.dataElemRef=dataElemRef
       self.name=name
       self.parent=parent
+
+   def asdict(self):
+      data={'type': self.__class__.__name__,'name':self.name, 'portRef':self.portRef, 'dataElemRef':self.dataElemRef}
+      return data
    
    def tag(self,version=None): return "DATA-SEND-POINT"
       
 class RunnableEntity(Element):
+   __slots__ = ('invokeConcurrently', 'dataReceivePoints', 'dataSendPoints', 'serverCallPoints', 'exclusiveAreaRefs', 'symbol')
    def __init__(self, name, invokeConcurrently=False, symbol=None, parent=None, adminData=None):
       super().__init__(name,parent,adminData)
       self.invokeConcurrently = invokeConcurrently
@@ -167,8 +189,8 @@ class RunnableEntity(Element):
          data['dataReceivePoints'].append(dataReceivePoint.asdict())
       for dataSendPoint in self.dataSendPoints:
          data['dataSendPoints'].append(dataSendPoint.asdict())
-      if len(self.syncServerCallPoints)>0:
-         data['syncServerCallPoints']=[x.asdict for x in self.syncServerCallPoints]
+      if len(self.serverCallPoints)>0:
+         data['syncServerCallPoints']=[x.asdict() for x in self.serverCallPoints]
       if len(self.exclusiveAreaRefs)>0:
          data['exclusiveAreaRefs']=[x for x in self.exclusiveAreaRefs]
       if len(data['dataReceivePoints'])==0: del data['dataReceivePoints']
@@ -244,19 +266,19 @@ class RunnableEntity(Element):
       else:
          return self.parent.rootWS()
 
-   @property
-   def ref(self):
+   def _calcRef(self):
       if self.parent is not None:
          return self.parent.ref+'/%s'%self.name
       else:
          return None
 
-class DataElementInstanceRef(object):
+class DataElementInstanceRef(autosar.base.OwnedObject):
    """
    <DATA-ELEMENT-IREF>
    Note: This object seems to be identical to an <DATA-IREF>
    Note 2: Observe that there are multiple <DATA-ELEMENT-IREF> definitions in the AUTOSAR XSD (used for different purposes)
    """
+   __slots__ = ('portRef', 'dataElemRef')
    def __init__(self,portRef,dataElemRef):
       self.portRef = portRef
       self.dataElemRef = dataElemRef
@@ -268,11 +290,12 @@ class DataElementInstanceRef(object):
 
 
 
-class DataInstanceRef(object):
+class DataInstanceRef(autosar.base.OwnedObject):
    """
    <DATA-IREF>
    Note: This object seems to be identical to an <DATA-ELEMENT-IREF>
    """
+   __slots__ = ('portRef', 'dataElemRef')
    def __init__(self,portRef,dataElemRef):
       self.portRef = portRef
       self.dataElemRef = dataElemRef
@@ -284,10 +307,11 @@ class DataInstanceRef(object):
       return 'DATA-IREF'
    
 
-class OperationInstanceRef(object):
+class OperationInstanceRef(autosar.base.OwnedObject):
    """
    <OBJECT-IREF>   
    """
+   __slots__ = ('portRef', 'operationRef')
    def __init__(self,portRef,operationRef):
       self.portRef = portRef
       self.operationRef = operationRef
@@ -308,6 +332,7 @@ class PerInstanceMemory(Element):
    Note: I don't know why this XML object has both <TYPE> and <TYPE-DEFINITION> where a simple TYPE-TREF should suffice.
    Internally use a typeRef for PerInstanceMemory. We can transform it back to <TYPE> and <TYPE-DEFINITION> when serializing to XML
    """
+   __slots__ = ('typeRef',)
    def __init__(self, name, typeRef, parent=None):
       super().__init__(name, parent)
       self.typeRef=typeRef
@@ -319,7 +344,8 @@ class PerInstanceMemory(Element):
       return 'PER-INSTANCE-MEMORY'
    
 
-class SwcNvBlockNeeds(object):
+class SwcNvBlockNeeds(autosar.base.OwnedObject):
+   __slots__ = ('name', 'numberOfDataSets', 'readOnly', 'reliability', 'resistantToChangedSW', 'restoreAtStart', 'writeOnlyOnce', 'writingFrequency', 'writingPriority', 'defaultBlockRef', 'mirrorBlockRef', 'serviceCallPorts')
    def __init__(self,name,numberOfDataSets,readOnly,reliability,resistantToChangedSW,
                 restoreAtStart,writeOnlyOnce,writingFrequency,writingPriority,
                 defaultBlockRef,mirrorBlockRef):
@@ -341,7 +367,7 @@ class SwcNvBlockNeeds(object):
       self.serviceCallPorts=[]      
    def asdict(self):
       data={'type': self.__class__.__name__,'serviceCallPorts':[]}
-      for key, value in self.__dict__.items():
+      for key, value in autosar.base.objectItems(self):
          if 'key'=='serviceCallPorts':
             pass
          else:
@@ -353,13 +379,14 @@ class SwcNvBlockNeeds(object):
       return 'SWC-NV-BLOCK-NEEDS'
    
 
-class RoleBasedRPortAssignment(object):
+class RoleBasedRPortAssignment(autosar.base.OwnedObject):
+   __slots__ = ('portRef', 'role')
    def __init__(self,portRef,role):
       self.portRef=portRef
       self.role=role
    def asdict(self):
       data={'type': self.__class__.__name__}
-      for key, value in self.__dict__.items():
+      for key, value in autosar.base.objectItems(self):
          data[key]=value
       return data
    
@@ -371,6 +398,7 @@ class CalPrmElemPrototype(Element):
    """
    <CALPRM-ELEMENT-PROTOTYPE>
    """
+   __slots__ = ('typeRef', 'swDataDefsProps')
    def __init__(self,name, typeRef, parent=None, adminData=None):
       super().__init__(name, parent, adminData)
       self.typeRef=typeRef
@@ -388,6 +416,7 @@ class CalPrmElemPrototype(Element):
    
 
 class ExclusiveArea(Element):
+   __slots__ = ()
    def __init__(self, name, parent=None, adminData=None):
       super().__init__(name,parent,adminData)
    
@@ -400,10 +429,11 @@ class ExclusiveArea(Element):
 
       
  
-class SyncServerCallPoint(object):
+class SyncServerCallPoint(autosar.base.OwnedObject):
    """
    <SYNCHRONOUS-SERVER-CALL-POINT>
    """
+   __slots__ = ('name', 'timeout', 'operationInstanceRefs')
    def __init__(self,name,timeout=0.0):
       self.name=name
       self.timeout=timeout
@@ -417,6 +447,7 @@ class SyncServerCallPoint(object):
    
 class InternalBehavior(Element):
    """ InternalBehavior class """
+   __slots__ = ('componentRef', 'multipleInstance', 'events', 'portAPIOptions', 'runnables', 'perInstanceMemories', 'swcNvBlockNeeds', 'sharedCalParams', 'exclusiveAreas', 'swc')
    def __init__(self,name,componentRef,multipleInstance=False,parent=None):
       super().__init__(name,parent)
       if not isinstance(componentRef,str): #this is a helper, in case the user called the function with obj instead of obj.ref
@@ -449,7 +480,7 @@ class InternalBehavior(Element):
          data['perInstanceMemories'].append(perInstanceMemory.asdict())
       for swcNvBlockNeed in self.swcNvBlockNeeds:
          data['swcNvBlockNeeds'].append(swcNvBlockNeed.asdict())
-      for sharedCalPrm in self.sharedCalPrms:
+      for sharedCalPrm in self.sharedCalParams:
          data['sharedCalPrms'].append(sharedCalPrm.asdict())
       for exclusiveArea in self.exclusiveAreas:
          data['exclusiveAreas'].append(exclusiveArea.asdict())
@@ -542,7 +573,7 @@ class InternalBehavior(Element):
       if exclusiveAreas is not None:
          if isinstance(exclusiveAreas, str):
             exclusiveAreas =[exclusiveAreas]
-         if isinstance(exclusiveAreas, collections.Iterable):
+         if isinstance(exclusiveAreas, collections.abc.Iterable):
             for exclusiveAreaName in exclusiveAreas:
                found = False
                for exclusiveArea in self.exclusiveAreas:
@@ -901,7 +932,7 @@ class InternalBehavior(Element):
          serviceCallPorts=[blockParams['serviceCallPorts']]
       else:
          serviceCallPorts = blockParams['serviceCallPorts']
-      if isinstance(serviceCallPorts, collections.Iterable):
+      if isinstance(serviceCallPorts, collections.abc.Iterable):
          for data in serviceCallPorts:
             parts = autosar.base.splitRef(data)
             if len(parts)!=2:
@@ -930,6 +961,7 @@ class InternalBehavior(Element):
       
 
 class VariableAccess(Element):
+   __slots__ = ('portPrototypeRef', 'targetDataPrototypeRef')
    def __init__(self, name, portPrototypeRef, targetDataPrototypeRef, parent=None):
       super().__init__(name, parent)
       self.portPrototypeRef=portPrototypeRef
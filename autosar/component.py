@@ -1,10 +1,12 @@
 from autosar.element import Element
 import autosar.portinterface
 import autosar.constant
+import autosar.base
 import copy
-import collections
+import collections.abc
 
 class ComponentType(Element):   
+   __slots__ = ('requirePorts', 'providePorts')
    def __init__(self,name,parent=None):
       super().__init__(name,parent)      
       self.requirePorts=[]
@@ -105,12 +107,14 @@ class AtomicSoftwareComponent(ComponentType):
    """
    base class for ApplicationSoftwareComponent and ComplexDeviceDriverComponent
    """
+   __slots__ = ('behavior', 'implementation')
    def __init__(self,name,parent=None):
       super().__init__(name,parent)      
       self.behavior=None
       self.implementation=None
 
 class ApplicationSoftwareComponent(AtomicSoftwareComponent):
+   __slots__ = ()
    
    def tag(self,version=None): return "APPLICATION-SOFTWARE-COMPONENT-TYPE"
    
@@ -118,6 +122,7 @@ class ApplicationSoftwareComponent(AtomicSoftwareComponent):
       super().__init__(name,parent)
 
 class ComplexDeviceDriverComponent(AtomicSoftwareComponent):   
+   __slots__ = ()
    def tag(self,version=None): return "COMPLEX-DEVICE-DRIVER-COMPONENT-TYPE"
    
    def __init__(self,name,parent=None):
@@ -125,18 +130,14 @@ class ComplexDeviceDriverComponent(AtomicSoftwareComponent):
 
 
 class ServiceComponent(AtomicSoftwareComponent):
-   def tag(self,version=None): return "SERVICE-COMPONENT-TYPE"
-   
-   def __init__(self,name,parent=None):
-      super().__init__(name,parent)
-
-class ServiceComponent(AtomicSoftwareComponent):
+   __slots__ = ()
    def tag(self,version=None): return "SERVICE-COMPONENT-TYPE"
    
    def __init__(self,name,parent=None):
       super().__init__(name,parent)
 
 class ParameterComponent(AtomicSoftwareComponent):
+   __slots__ = ()
    def tag(self,version=None):
       if version < 4.0: 
          return "CALPRM-COMPONENT-TYPE"
@@ -151,6 +152,7 @@ class CompositionComponent(ComponentType):
    """
    Composition Component
    """      
+   __slots__ = ('components', 'assemblyConnectors', 'delegationConnectors')
    def __init__(self,name,parent=None):
       super().__init__(name,parent) 
       self.components=[]
@@ -287,6 +289,19 @@ class CompositionComponent(ComponentType):
 
       
 class Port(object):
+   __slots__ = ('__dict__', '__weakref__', '_refCache', '_fingerprint', 'name', 'portInterfaceRef', 'comspec', 'parent')
+
+   def __setattr__(self, key, value):
+      if key == 'name' or key == 'parent' or key.endswith('Ref') or type(value) is list:
+         autosar.base.setElementAttribute(self, key, value)
+      else:
+         if getattr(self, '_fingerprint', None) is not None:
+            autosar.base.clearFingerprint(self)
+         object.__setattr__(self, key, value)
+
+   def __setstate__(self, state):
+      autosar.base.setObjectState(self, state)
+
    def __init__(self,name, portInterfaceRef, comspec=None, parent=None):
       self.name = name      
       if portInterfaceRef is not None and not isinstance(portInterfaceRef,str):
@@ -297,12 +312,12 @@ class Port(object):
       if comspec is not None:
          ws = self.rootWS()
          assert(ws is not None)
-         if isinstance(comspec, collections.Mapping):
+         if isinstance(comspec, collections.abc.Mapping):
             comspecObj = self.createComSpecFromDict(ws,portInterfaceRef,comspec)
             if comspecObj is None:
                raise ValueError('failed to create comspec from comspec data: '+repr(comspec))
             self.comspec.append(comspecObj)
-         elif isinstance(comspec, collections.Iterable):
+         elif isinstance(comspec, collections.abc.Iterable):
             for data in comspec:
                comspecObj = self.createComSpecFromDict(ws,portInterfaceRef,data)
                if comspecObj is None:
@@ -313,6 +328,9 @@ class Port(object):
       
    @property
    def ref(self):
+      return autosar.base.getCachedRef(self, self._calcRef)
+
+   def _calcRef(self):
       if self.parent is not None:
          return self.parent.ref+'/%s'%self.name
       else:
@@ -323,11 +341,15 @@ class Port(object):
          return None
       else:
          return self.parent.rootWS()
+
+   def fingerprint(self):
+      """returns a stable hash of the contents of this port (including its com-specs), see autosar.base.getFingerprint"""
+      return autosar.base.getFingerprint(self)
    
    def asdict(self):
       data={'type': self.__class__.__name__,'name':self.name, 'portInterfaceRef':self.portInterfaceRef, 'attributes':[]}
-      for attribute in self.attributes:
-         data['attributes'].append(attribute.asdict())
+      for comspec in self.comspec:
+         data['attributes'].append(comspec.asdict())
       if len(data['attributes'])==0: del data['attributes']
       return data
    
@@ -381,6 +403,7 @@ class Port(object):
             
       
 class RequirePort(Port):      
+   __slots__ = ()
    def __init__(self,name,portInterfaceRef=None,comspec=None,parent=None):      
       if isinstance(name,str):
          #normal constructor
@@ -396,6 +419,7 @@ class RequirePort(Port):
    def tag(self,version=None): return "R-PORT-PROTOTYPE"
 
 class ProvidePort(Port):         
+   __slots__ = ()
    def __init__(self,name,portInterfaceRef=None,comspec=None,parent=None):
       if isinstance(name,str):
       #normal constructor      
@@ -410,7 +434,8 @@ class ProvidePort(Port):
       
    def tag(self,version=None): return "P-PORT-PROTOTYPE"      
 
-class OperationComSpec(object):
+class OperationComSpec(autosar.base.OwnedObject):
+   __slots__ = ('name', 'queueLength')
    def __init__(self,name=None,queueLength=1):
       self.name = name
       self.queueLength=queueLength
@@ -418,8 +443,10 @@ class OperationComSpec(object):
       data={'type': self.__class__.__name__,'name':self.name}
       if self.queueLength is not None:
          data['queueLength']=self.queueLength
+      return data
 
-class DataElementComSpec(object):
+class DataElementComSpec(autosar.base.OwnedObject):
+   __slots__ = ('name', 'initValueRef', '_aliveTimeout', '_queueLength', 'canInvalidate')
    def __init__(self,name=None,initValueRef=None,aliveTimeout=None,queueLength=None,canInvalidate=None):
       self.name = name
       self.initValueRef = str(initValueRef) if initValueRef is not None else None
@@ -453,12 +480,14 @@ class DataElementComSpec(object):
       return data
 
 class SwcImplementation(Element):
+   __slots__ = ('behaviorRef',)
    def __init__(self,name,behaviorRef,parent=None):
       super().__init__(name,parent)
       self.behaviorRef=behaviorRef
 
 
 class ComponentPrototype(Element):
+   __slots__ = ('typeRef',)
    def __init__(self,name,typeRef,parent=None):
       super().__init__(name,parent)
       self.typeRef=typeRef
@@ -471,10 +500,11 @@ class ComponentPrototype(Element):
 
 
 
-class ProviderInstanceRef:
+class ProviderInstanceRef(autosar.base.OwnedObject):
    """
    <PROVIDER-IREF>
    """
+   __slots__ = ('componentRef', 'portRef')
    def __init__(self,componentRef, portRef):
       self.componentRef=componentRef
       self.portRef=portRef
@@ -484,10 +514,11 @@ class ProviderInstanceRef:
       return 'PROVIDER-IREF'
    
 
-class RequesterInstanceRef:
+class RequesterInstanceRef(autosar.base.OwnedObject):
    """
    <REQUESTER-IREF>
    """
+   __slots__ = ('componentRef', 'portRef')
    def __init__(self,componentRef, portRef):
       self.componentRef=componentRef
       self.portRef=portRef
@@ -497,10 +528,11 @@ class RequesterInstanceRef:
       return 'REQUESTER-IREF'
    
 
-class InnerPortInstanceRef:
+class InnerPortInstanceRef(autosar.base.OwnedObject):
    """
    <INNER-PORT-IREF>
    """
+   __slots__ = ('componentRef', 'portRef')
    def __init__(self,componentRef,portRef):
       self.componentRef=componentRef
       self.portRef=portRef
@@ -510,10 +542,11 @@ class InnerPortInstanceRef:
       return 'INNER-PORT-IREF'
    
 
-class OuterPortRef:
+class OuterPortRef(autosar.base.OwnedObject):
    """
    <OUTER-PORT-REF>
    """
+   __slots__ = ('portRef',)
    def __init__(self,portRef):
       self.portRef=portRef
    def asdict(self):
@@ -526,6 +559,7 @@ class AssemblyConnector(Element):
    """
    <ASSEMBLY-CONNECTOR-PROTOTYPE>
    """
+   __slots__ = ('providerInstanceRef', 'requesterInstanceRef')
    def __init__(self,name,providerInstanceRef,requesterInstanceRef,parent=None):
       assert(isinstance(providerInstanceRef,ProviderInstanceRef))
       assert(isinstance(requesterInstanceRef,RequesterInstanceRef))
@@ -543,6 +577,7 @@ class DelegationConnector(Element):
    """
    <DELEGATION-CONNECTOR-PROTOTYPE>
    """
+   __slots__ = ('innerPortInstanceRef', 'outerPortRef')
    def __init__(self, name, innerPortInstanceRef, outerPortRef, parent=None):
       assert(isinstance(innerPortInstanceRef,InnerPortInstanceRef))
       assert(isinstance(outerPortRef,OuterPortRef))
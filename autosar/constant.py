@@ -1,15 +1,32 @@
 from autosar.element import Element
+import autosar.base
 
 class Value(object):
+   __slots__ = ('__dict__', '__weakref__', '_refCache', '_fingerprint', 'name', 'parent')
+
+   def __setattr__(self, key, value):
+      if key == 'name' or key == 'parent' or key.endswith('Ref') or type(value) is list:
+         autosar.base.setElementAttribute(self, key, value)
+      else:
+         if getattr(self, '_fingerprint', None) is not None:
+            autosar.base.clearFingerprint(self)
+         object.__setattr__(self, key, value)
+
+   def __setstate__(self, state):
+      autosar.base.setObjectState(self, state)
+
    def __init__(self,name,parent=None):
       self.name = name
       self.parent=parent
    def asdict(self):
       data={'type': self.__class__.__name__}
-      data.update(self.__dict__)
+      data.update(autosar.base.objectItems(self))
       return data
    @property
    def ref(self):
+      return autosar.base.getCachedRef(self, self._calcRef)
+
+   def _calcRef(self):
       if self.parent is not None:
          return self.parent.ref+'/%s'%self.name
       else:
@@ -21,7 +38,12 @@ class Value(object):
       else:
          return self.parent.rootWS()
 
+   def fingerprint(self):
+      """returns a stable hash of the contents of this value, see autosar.base.getFingerprint"""
+      return autosar.base.getFingerprint(self)
+
 class IntegerValue(Value):
+   __slots__ = ('typeRef', '_value')
    
    def tag(self,version=None): return "INTEGER-LITERAL"   
 
@@ -43,6 +65,7 @@ class IntegerValue(Value):
          self._value=None
 
 class StringValue(Value):
+   __slots__ = ('typeRef', '_value')
    
    def tag(self,version=None): return "STRING-LITERAL"
 
@@ -67,6 +90,7 @@ class StringValue(Value):
          self._value=None
 
 class BooleanValue(Value):
+   __slots__ = ('typeRef', '_value')
    
    def tag(self,version=None): return "BOOLEAN-LITERAL"
 
@@ -90,6 +114,7 @@ class BooleanValue(Value):
          self._value=None
 
 class RecordValue(Value):
+   __slots__ = ('typeRef', 'elements')
    
    def tag(self,version=None): return "RECORD-SPECIFICATION"
    
@@ -105,6 +130,7 @@ class RecordValue(Value):
       
    
 class ArrayValue(Value):
+   __slots__ = ('typeRef', 'elements')
    
    def tag(self,version=None): return "ARRAY-SPECIFICATION"
 
@@ -120,6 +146,7 @@ class ArrayValue(Value):
 
 
 class Constant(Element):
+   __slots__ = ('value',)
    def __init__(self, name, value=None, parent=None, adminData=None):
       super().__init__(name, parent, adminData)
       self.value=value
@@ -2,15 +2,28 @@ from autosar.element import Element
 import math
 import json
 import copy
-import collections
+import collections.abc
+import autosar.base
 
 class ConstElement(object):
+   __slots__ = ('_fingerprint', 'parent')
+
+   def __setattr__(self, key, value):
+      if getattr(self, '_fingerprint', None) is not None:
+         autosar.base.clearFingerprint(self)
+      object.__setattr__(self, key, value)
+      if key == 'parent':
+         autosar.base.clearFingerprint(self) #new parent
+
+   def __setstate__(self, state):
+      autosar.base.setObjectState(self, state)
+
    def __init__(self,parent=None):
       self.parent=parent
    
    def asdict(self):
       data={'type': self.__class__.__name__}
-      data.update(self.__dict__)
+      data.update(autosar.base.objectItems(self))
       return data
    def find(self,ref):
       if ref.startswith('/'):
@@ -23,6 +36,7 @@ class ConstElement(object):
 
 
 class RecordTypeElement(ConstElement):
+   __slots__ = ('name', 'typeRef')
    def __init__(self,name,typeRef,parent=None):
       super().__init__(parent)
       self.name=name
@@ -39,6 +53,7 @@ class RecordTypeElement(ConstElement):
       return False
 
 class CompuConstElement(ConstElement):
+   __slots__ = ('lowerLimit', 'upperLimit', 'textValue')
    def __init__(self,lowerLimit,upperLimit,textValue):
       self.lowerLimit=lowerLimit
       self.upperLimit=upperLimit
@@ -51,6 +66,7 @@ class CompuConstElement(ConstElement):
       
 
 class CompuRationalElement(ConstElement):
+   __slots__ = ('offset', 'numerator', 'denominator')
    def __init__(self,offset,numerator,denominator):
       self.offset=offset
       self.numerator=numerator
@@ -62,6 +78,7 @@ class CompuRationalElement(ConstElement):
       return False      
 
 class DataTypeUnitElement(Element):
+   __slots__ = ('displayName',)
    def __init__(self,name,displayName):
       super().__init__(name)
       self.displayName=displayName
@@ -72,6 +89,7 @@ class DataTypeUnitElement(Element):
       return False       
 
 class DataType(Element):
+   __slots__ = ()
    def __init__(self, name, parent=None, adminData=None):
       super().__init__(name, parent, adminData)
    
@@ -81,6 +99,7 @@ class DataType(Element):
 
 
 class IntegerDataType(DataType):
+   __slots__ = ('minVal', 'maxVal', '_minValType', '_maxValType', 'compuMethodRef')
    
    def tag(self,version=None): return 'INTEGER-TYPE'
    def __init__(self, name, minVal=0, maxVal=0, compuMethodRef=None, parent=None, adminData=None):
@@ -130,6 +149,7 @@ class IntegerDataType(DataType):
       return obj
             
 class RecordDataType(DataType):   
+   __slots__ = ('elements',)
    def tag(self,version=None): return 'RECORD-TYPE'      
    def __init__(self, name, elements=None,  parent=None, adminData=None):
       super().__init__(name, parent, adminData)
@@ -141,7 +161,7 @@ class RecordDataType(DataType):
                elem.parent=self
             elif isinstance(elem, tuple):
                self.elements.append(RecordTypeElement(elem[0],elem[1],self))
-            elif isinstance(elem, collections.Mapping):
+            elif isinstance(elem, collections.abc.Mapping):
                self.elements.append(RecordTypeElement(elem['name'],elem['typeRef'],self))
             else:
                raise ValueError('element must be either Mapping, RecordTypeElement or tuple')
@@ -171,6 +191,7 @@ class RecordDataType(DataType):
    
 
 class ArrayDataType(DataType):
+   __slots__ = ('typeRef', 'length')
    
    def tag(self,version=None): return 'ARRAY-TYPE'
    
@@ -180,6 +201,7 @@ class ArrayDataType(DataType):
       self.length = length
 
 class BooleanDataType(DataType):
+   __slots__ = ()
    
    def tag(self,version=None): return 'BOOLEAN-TYPE'
    
@@ -188,6 +210,7 @@ class BooleanDataType(DataType):
 
 
 class StringDataType(DataType):
+   __slots__ = ('length', 'encoding')
    def tag(self,version=None): return 'STRING-TYPE'
    
    def __init__(self,name,length,encoding, parent=None, adminData=None):
@@ -210,6 +233,7 @@ class StringDataType(DataType):
 
       
 class RealDataType(DataType):
+   __slots__ = ('minVal', 'maxVal', 'minValType', 'maxValType', 'hasNaN', 'encoding')
    def tag(self,version=None): return 'REAL-TYPE'
    
    def __init__(self, name, minVal, maxVal, minValType='CLOSED', maxValType='CLOSED', hasNaN=False, encoding='SINGLE', parent=None, adminData=None):
@@ -223,6 +247,7 @@ class RealDataType(DataType):
       
 
 class CompuMethodRational(Element):
+   __slots__ = ('unitRef', 'elements')
    def tag(self,version=None): return 'COMPU-INTERNAL-TO-PHYS'
    def __init__(self,name,unitRef,elements):      
       super().__init__(name)
@@ -257,6 +282,7 @@ class CompuMethodRational(Element):
 
       
 class CompuMethodConst(Element):
+   __slots__ = ('elements',)
    def __init__(self, name, elements, parent=None, adminData=None):
       super().__init__(name, parent, adminData)
       self.elements = []
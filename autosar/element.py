@@ -2,6 +2,19 @@ import xml.etree.ElementTree as ElementTree
 import autosar.base
 
 class Element(object):
+   __slots__ = ('__dict__', '__weakref__', '_refCache', '_fingerprint', 'name', 'adminData', 'parent', 'desc', 'descAttr')
+
+   def __setattr__(self, key, value):
+      if key == 'name' or key == 'parent' or key.endswith('Ref') or type(value) is list:
+         autosar.base.setElementAttribute(self, key, value)
+      else:
+         if getattr(self, '_fingerprint', None) is not None:
+            autosar.base.clearFingerprint(self)
+         object.__setattr__(self, key, value)
+
+   def __setstate__(self, state):
+      autosar.base.setObjectState(self, state)
+
    def __init__(self, name, parent=None, adminData=None):
       if isinstance(adminData, dict):
          adminDataObj=autosar.base.createAdminData(adminData)
@@ -15,14 +28,21 @@ class Element(object):
       
    @property
    def ref(self):
+      return autosar.base.getCachedRef(self, self._calcRef)
+
+   def _calcRef(self):
       if self.parent is not None:
          return self.parent.ref+'/%s'%self.name
       else:
          return None
+
+   def fingerprint(self):
+      """returns a stable hash of the contents of this element (including its child elements), see autosar.base.getFingerprint"""
+      return autosar.base.getFingerprint(self)
    
    def asdict(self):
       data={'type': self.__class__.__name__}
-      for key, value in self.__dict__.items():
+      for key, value in autosar.base.objectItems(self):
          if value is not None:
             if key=='adminData':
                if self.adminData is not None:
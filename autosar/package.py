@@ -7,18 +7,66 @@ import copy
 import autosar.base
 import re
 from fractions import Fraction
-import collections
+import collections.abc
 import decimal
 
 class Package(object):
+   __slots__ = ('__dict__', '__weakref__', '_refCache', '_fingerprint')
    packageName = None
+
+   def __setattr__(self, key, value):
+      if key == 'name' or key == 'parent':
+         autosar.base.setElementAttribute(self, key, value)
+      else:
+         if getattr(self, '_fingerprint', None) is not None:
+            autosar.base.clearFingerprint(self)
+         object.__setattr__(self, key, value)
+
+   def __setstate__(self, state):
+      autosar.base.setObjectState(self, state)
+
    def __init__(self, name, parent=None, role=None):
+      self._deferredXML = None
       self.name = name
       self.elements = []
       self.subPackages = []
       self.parent=parent
       self.role=role
       self.map={'elements':{}}
+
+   @property
+   def elements(self):
+      if self._deferredXML is not None:
+         self._loadDeferredXML()
+      return self._elements
+
+   @elements.setter
+   def elements(self, value):
+      self._elements = value
+
+   @property
+   def subPackages(self):
+      if self._deferredXML is not None:
+         self._loadDeferredXML()
+      return self._subPackages
+
+   @subPackages.setter
+   def subPackages(self, value):
+      self._subPackages = value
+
+   def _deferXML(self, parser, xmlPackage):
+      """
+      Stores xmlPackage for later. It is parsed (using parser) the first time the contents of this package is accessed.
+      """
+      if self._deferredXML is None:
+         self._deferredXML = []
+      self._deferredXML.append((parser, xmlPackage))
+
+   def _loadDeferredXML(self):
+      deferredXML = self._deferredXML
+      self._deferredXML = None
+      for parser, xmlPackage in deferredXML:
+         parser.loadXML(self, xmlPackage, lazy=True)
    
    def __getitem__(self,key):
       if isinstance(key,str):
@@ -28,6 +76,9 @@ class Package(object):
    
    @property
    def ref(self):
+      return autosar.base.getCachedRef(self, self._calcRef)
+
+   def _calcRef(self):
       if self.parent is not None:
          return self.parent.ref+'/%s'%self.name
       else:
@@ -35,6 +86,8 @@ class Package(object):
 
    def find(self,ref):
       if ref.startswith('/'): return self.parent.find(ref)
+      if self._deferredXML is not None:
+         self._loadDeferredXML()
       ref = ref.partition('/')      
       name = ref[0]
       for package in self.subPackages:
@@ -122,7 +175,12 @@ class Package(object):
             if len(ref[2])>0:
                return element.delete(ref[2])
             else:
+               ws = self.rootWS()
+               if ws is not None:
+                  ws._unregisterRef(element)
                del self.elements[i]
+               self.map['elements'].pop(element.name, None)
+               autosar.base.clearFingerprint(self)
                break
 
    
@@ -138,7 +196,7 @@ class Package(object):
 
       portInterface = autosar.portinterface.SenderReceiverInterface(str(name), isService, adminData=adminData)
       if dataElements is not None:
-         if isinstance(dataElements,collections.Iterable):
+         if isinstance(dataElements,collections.abc.Iterable):
             for elem in dataElements:
                dataType=ws.find(elem.typeRef, role='DataType')
                if dataType is None:
@@ -154,7 +212,7 @@ class Package(object):
          else:
             raise ValueError("dataElements: expected autosar.portinterface.DataElement instance or list")
       if modeGroups is not None:
-         if isinstance(modeGroups,collections.Iterable):
+         if isinstance(modeGroups,collections.abc.Iterable):
             for elem in modeGroups:
                portInterface.append(elem)
          elif isinstance(modeGroups,autosar.portinterface.ModeGroup):         
@@ -178,7 +236,7 @@ class Package(object):
       if (adminDataObj is not None) and not isinstance(adminDataObj, autosar.base.AdminData):
          raise ValueError("adminData must be of type dict or AdminData")
       portInterface = autosar.portinterface.ParameterInterface(str(name), adminData=adminDataObj)
-      if isinstance(dataElements,collections.Iterable):
+      if isinstance(dataElements,collections.abc.Iterable):
          for elem in dataElements:
             dataType=ws.find(elem.typeRef, role='DataType')
             if dataType is None:
@@ -209,9 +267,21 @@ class Package(object):
          return None
       else:
          return self.parent.root()
+
+   def root(self):
+      return self.rootWS()
+
+   def fingerprint(self):
+      """
+      Returns a stable hash of this package, computed from its name, its role and the fingerprints of its elements and sub-packages.
+      Packages whose fingerprints are equal can be skipped when looking for changes, see autosar.base.getFingerprint.
+      """
+      return autosar.base.getFingerprint(self)
       
    def append(self,elem):
       """appends elem to the self.elements list"""
+      if self._deferredXML is not None:
+         self._loadDeferredXML()
       isNewElement = True
       if elem.name in self.map['elements']:
          isNewElement = False
@@ -231,6 +301,9 @@ class Package(object):
            elem.parent=self
          else:
             raise ValueError('unexpected value type %s'%str(type(elem)))
+         ws = self.rootWS()
+         if ws is not None:
+            ws._registerRef(elem)
 
    def update(self,other):
       """copies/clones each element from other into self.elements"""
@@ -242,10 +315,16 @@ class Package(object):
                i=self.index('elements',otherElem.name)
                oldElem=self.elements[i]
                self.elements[i]=newElem
+               ws = self.rootWS()
+               if ws is not None:
+                  ws._unregisterRef(oldElem)
                oldElem.parent=None               
             except ValueError:
                self.elements.append(newElem)
             newElem.parent=self
+            ws = self.rootWS()
+            if ws is not None:
+               ws._registerRef(newElem)
       else:
          raise ValueError('cannot update from object of different type')
 
@@ -341,7 +420,7 @@ class Package(object):
       for name in operations:
          portInterface.append(autosar.portinterface.Operation(name))      
       if errors is not None:
-         if isinstance(errors, collections.Iterable):
+         if isinstance(errors, collections.abc.Iterable):
             for error in errors:
                portInterface.append(error)
          else:            
@@ -481,13 +560,13 @@ class Package(object):
             raise ValueError('initValue: expected type int, got '+str(type(initValue)))
          value=autosar.constant.IntegerValue(name, dataType.ref, initValue)         
       elif isinstance(dataType, autosar.datatype.RecordDataType):
-         if isinstance(initValue, collections.Mapping) or isinstance(initValue, collections.Iterable):
+         if isinstance(initValue, collections.abc.Mapping) or isinstance(initValue, collections.abc.Iterable):
             pass
          else:
             raise ValueError('initValue: expected type Mapping or Iterable, got '+str(type(initValue)))
          value=self._createRecordValue(ws, name, dataType, initValue)         
       elif isinstance(dataType, autosar.datatype.ArrayDataType):
-         if isinstance(initValue, collections.Iterable):
+         if isinstance(initValue, collections.abc.Iterable):
             pass
          else:
             raise ValueError('initValue: expected type Iterable, got '+str(type(initValue)))
@@ -521,7 +600,7 @@ class Package(object):
       
    def _createRecordValue(self, ws, name, dataType, initValue, parent=None):
       value = autosar.constant.RecordValue(name, dataType.ref, parent)
-      if isinstance(initValue, collections.Mapping):
+      if isinstance(initValue, collections.abc.Mapping):
          for elem in dataType.elements:
             if elem.name in initValue:
                v = initValue[elem.name]               
@@ -533,13 +612,13 @@ class Package(object):
                      raise ValueError('v: expected type int, got '+str(type(v)))                     
                   value.elements.append(autosar.constant.IntegerValue(elem.name, childType.ref, v, value))
                elif isinstance(childType, autosar.datatype.RecordDataType):
-                  if isinstance(v, collections.Mapping) or isinstance(v, collections.Iterable):
+                  if isinstance(v, collections.abc.Mapping) or isinstance(v, collections.abc.Iterable):
                      pass
                   else:
                      raise ValueError('v: expected type Mapping or Iterable, got '+str(type(v)))                     
                   value.elements.append(self._createRecordValue(ws, elem.name, childType, v, value))
                elif isinstance(childType, autosar.datatype.ArrayDataType):
-                  if isinstance(v, collections.Iterable):
+                  if isinstance(v, collections.abc.Iterable):
                      pass
                   else:
                      raise ValueError('v: expected type Iterable, got '+str(type(v)))                     
@@ -578,7 +657,7 @@ class Package(object):
       childType = ws.find(dataType.typeRef, role='DataType')
       if childType is None:
          raise ValueError('invalid reference: '+str(elem.typeRef))      
-      if isinstance(initValue, collections.Iterable):         
+      if isinstance(initValue, collections.abc.Iterable):         
          for i in range(dataType.length):
             try:
                v=initValue[i]
@@ -590,13 +669,13 @@ class Package(object):
                   raise ValueError('v: expected type int, got '+str(type(v)))                     
                value.elements.append(autosar.constant.IntegerValue(elemName, childType.ref, v, value))
             elif isinstance(childType, autosar.datatype.RecordDataType):
-               if isinstance(v, collections.Mapping) or isinstance(v, collections.Iterable):
+               if isinstance(v, collections.abc.Mapping) or isinstance(v, collections.abc.Iterable):
                   pass
                else:
                   raise ValueError('v: expected type Mapping or Iterable, got '+str(type(v)))                     
                value.elements.append(self._createRecordValue(ws, elemName, childType, v, value))
             elif isinstance(childType, autosar.datatype.ArrayDataType):
-               if isinstance(v, collections.Iterable):
+               if isinstance(v, collections.abc.Iterable):
                   pass
                else:
                   raise ValueError('v: expected type Iterable, got '+str(type(v)))                     
@@ -1,6 +1,6 @@
 from autosar.element import Element
 from autosar.constant import *
-from autosar.base import hasAdminData,parseAdminDataNode
+from autosar.base import parseAdminDataNode,childNodeMap
 
 class ConstantPackageParser(object):
    """
@@ -11,46 +11,51 @@ class ConstantPackageParser(object):
                   
    def parseConstantSpecification(self,xmlRoot,rootProject=None,parent=None):
       assert(xmlRoot.tag == 'CONSTANT-SPECIFICATION')
-      xmlName = xmlRoot.find('SHORT-NAME')
+      xmlNodes = childNodeMap(xmlRoot)
+      xmlName = xmlNodes.get('SHORT-NAME')
       if xmlName is not None:
-         name = xmlName.text         
-         xmlValue = xmlRoot.find('./VALUE/*')         
-         if xmlValue is not None:
-            constantValue = self.parseConstantValue(xmlValue)
+         name = xmlName.text
+         xmlValue = xmlNodes.get('VALUE')
+         if (xmlValue is not None) and (len(xmlValue) > 0):
+            constantValue = self.parseConstantValue(xmlValue[0])
          else:
             constantValue = None
          constant = Constant(name,constantValue)
-         if hasAdminData(xmlRoot):
-            constant.adminData=parseAdminDataNode(xmlRoot.find('ADMIN-DATA'))
+         xmlAdminData = xmlNodes.get('ADMIN-DATA')
+         if xmlAdminData is not None:
+            constant.adminData=parseAdminDataNode(xmlAdminData)
          return constant
       return None
                
    def parseConstantValue(self,xmlValue):
       constantValue = None
-      xmlName = xmlValue.find('SHORT-NAME')
+      xmlNodes = childNodeMap(xmlValue)
+      xmlName = xmlNodes.get('SHORT-NAME')
       if xmlName is not None:
          name=xmlName.text
          if xmlValue.tag == 'INTEGER-LITERAL':
-            typeRef = xmlValue.find('./TYPE-TREF').text
-            innerValue = xmlValue.find('./VALUE').text
+            typeRef = xmlNodes['TYPE-TREF'].text
+            innerValue = xmlNodes['VALUE'].text
             constantValue = IntegerValue(name,typeRef,innerValue)
          elif xmlValue.tag=='STRING-LITERAL':
-            typeRef = xmlValue.find('./TYPE-TREF').text
-            innerValue = xmlValue.find('./VALUE').text
+            typeRef = xmlNodes['TYPE-TREF'].text
+            innerValue = xmlNodes['VALUE'].text
             constantValue = StringValue(name,typeRef,innerValue)
          elif xmlValue.tag=='BOOLEAN-LITERAL':
-            typeRef = xmlValue.find('./TYPE-TREF').text
-            innerValue = xmlValue.find('./VALUE').text
+            typeRef = xmlNodes['TYPE-TREF'].text
+            innerValue = xmlNodes['VALUE'].text
             constantValue = BooleanValue(name,typeRef,innerValue)
          elif xmlValue.tag == 'RECORD-SPECIFICATION' or xmlValue.tag == 'ARRAY-SPECIFICATION':
-            typeRef = xmlValue.find('./TYPE-TREF').text
+            typeRef = xmlNodes['TYPE-TREF'].text
             if xmlValue.tag == 'RECORD-SPECIFICATION':
                constantValue=RecordValue(name,typeRef)                        
             else:
                constantValue=ArrayValue(name,typeRef)
-            for innerElem in xmlValue.findall('./ELEMENTS/*'):               
-               innerConstant = self.parseConstantValue(innerElem)
-               if innerConstant is not None:
-                  constantValue.elements.append(innerConstant)
-                  innerConstant.parent=constantValue
+            xmlElements = xmlNodes.get('ELEMENTS')
+            if xmlElements is not None:
+               for innerElem in xmlElements:
+                  innerConstant = self.parseConstantValue(innerElem)
+                  if innerConstant is not None:
+                     constantValue.elements.append(innerConstant)
+                     innerConstant.parent=constantValue
       return constantValue
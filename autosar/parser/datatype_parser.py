@@ -1,4 +1,4 @@
-from autosar.base import parseXMLFile,splitRef,parseTextNode
+from autosar.base import parseXMLFile,splitRef,parseTextNode,childNodeMap
 from autosar.datatype import *
 from autosar.parser.parser_base import BaseParser
 
@@ -10,12 +10,13 @@ class DataTypeParser(BaseParser):
          
    def parseIntegerType(self,root,rootProject=None,parent=None):    
       if self.version>=3.0:
-         name=root.find("./SHORT-NAME").text
-         minval = int(root.find("./LOWER-LIMIT").text)
-         maxval = int(root.find("./UPPER-LIMIT").text)
-         dataDefXML = root.find('./SW-DATA-DEF-PROPS')
+         xmlNodes = childNodeMap(root)
+         name=xmlNodes['SHORT-NAME'].text
+         minval = int(xmlNodes['LOWER-LIMIT'].text)
+         maxval = int(xmlNodes['UPPER-LIMIT'].text)
+         dataDefXML = xmlNodes.get('SW-DATA-DEF-PROPS')
          dataType = IntegerDataType(name,minval,maxval)
-         self.parseDesc(root,dataType)
+         self.parseDescNode(xmlNodes.get('DESC'),dataType)
          if dataDefXML is not None:
             for elem in dataDefXML.findall('./*'):
                if elem.tag=='COMPU-METHOD-REF':
@@ -62,21 +63,22 @@ class DataTypeParser(BaseParser):
 
    def parseRealType(self,root,rootProject=None,parent=None):
       if self.version>=3.0:
-         name=root.find("./SHORT-NAME").text
+         xmlNodes = childNodeMap(root)
+         name=xmlNodes['SHORT-NAME'].text
          
-         elem = root.find("./LOWER-LIMIT")
+         elem = xmlNodes.get('LOWER-LIMIT')
          if elem is not None:
             minval = elem.text
             minvalType = elem.attrib['INTERVAL-TYPE']
-         elem = root.find("./UPPER-LIMIT")
+         elem = xmlNodes.get('UPPER-LIMIT')
          if elem is not None:
             maxval = elem.text
             maxvalType = elem.attrib['INTERVAL-TYPE']
-         hasNaNText = parseTextNode(root.find("./ALLOW-NAN"))         
+         hasNaNText = parseTextNode(xmlNodes.get('ALLOW-NAN'))
          hasNaN = True if (hasNaNText is not None and hasNaNText == 'true') else False
-         encoding = parseTextNode(root.find("./ENCODING"))
+         encoding = parseTextNode(xmlNodes.get('ENCODING'))
          dataType=RealDataType(name,minval,maxval,minvalType,maxvalType,hasNaN,encoding)
-         self.parseDesc(root,dataType)
+         self.parseDescNode(xmlNodes.get('DESC'),dataType)
          return dataType
 
 
@@ -1,5 +1,8 @@
 import autosar.package
 import autosar.element
+import fnmatch
+import logging
+import re
 
 
 from autosar.base import hasAdminData,parseAdminDataNode
@@ -11,13 +14,42 @@ from autosar.parser.signal_parser import SignalParser
 from autosar.parser.system_parser import SystemParser
 from autosar.parser.component_parser import ComponentTypeParser
 
+_logger = logging.getLogger(__name__)
+
+class ElementFilter(object):
+   """
+   Selects the package elements loaded by PackageParser.
+   refs is an optional list of reference patterns using shell-style wildcards (e.g. '/ComponentType/*', note that * also matches '/'),
+   tags is an optional list of element tags (e.g. ['SYSTEM', 'SYSTEM-SIGNAL']). An element is loaded when its reference matches
+   one of the patterns and its tag is in tags, None means no restriction.
+   """
+   def __init__(self, refs=None, tags=None):
+      if isinstance(refs, str): refs=[refs]
+      if isinstance(tags, str): tags=[tags]
+      self.refs = None if refs is None else list(refs)
+      self.tags = None if tags is None else frozenset(tags)
+      self.refPatterns = None if refs is None else [re.compile(fnmatch.translate(x)).match for x in self.refs]
+
+   def matchTag(self, tag):
+      return (self.tags is None) or (tag in self.tags)
+
+   def matchRef(self, ref):
+      if self.refPatterns is None:
+         return True
+      for match in self.refPatterns:
+         if match(ref) is not None:
+            return True
+      return False
+
 class PackageParser(object):
-   def __init__(self,version,rootProject=None):
+   def __init__(self,version,rootProject=None,elementFilter=None):
       self.version=version
       self.rootProject=rootProject
+      self.switcher=None
+      self.elementFilter=elementFilter
       
             
-   def loadXML(self,package,xmlRoot):
+   def _createSwitcher(self):
       dataTypeParser = DataTypeParser(self,self.version)
       componentTypeParser = ComponentTypeParser(self,self.version)
       dataTypeSemanticsParser = DataTypeSemanticsParser(self,self.version)
@@ -29,10 +61,10 @@ class PackageParser(object):
       behaviorParser=BehaviorParser(self,self.version)
       signalParser=SignalParser(self,self.version)
       systemParser=SystemParser(self,self.version)
-      self.switcher=None
+      switcher=None
       
       if self.version >= 3.0 and self.version < 4.0:         
-         self.switcher = {'ARRAY-TYPE': dataTypeParser.parseArrayType,
+         switcher = {'ARRAY-TYPE': dataTypeParser.parseArrayType,
                           'BOOLEAN-TYPE': dataTypeParser.parseBooleanType,
                           'INTEGER-TYPE': dataTypeParser.parseIntegerType,
                           'REAL-TYPE': dataTypeParser.parseRealType,
@@ -58,7 +90,7 @@ class PackageParser(object):
                           'SYSTEM': systemParser.parseSystem,                    
                           }
       elif self.version >= 4.0:         
-         self.switcher = {
+         switcher = {
             'APPLICATION-SW-COMPONENT-TYPE' : componentTypeParser.parseSoftwareComponent,
             'SWC-IMPLEMENTATION': componentTypeParser.parseSwcImplementation
          }
@@ -66,29 +98,124 @@ class PackageParser(object):
       else:
          raise NotImplementedError('Version of ARXML not supported')
       
-      assert(self.switcher is not None)
-         
+      assert(switcher is not None)
+      return switcher
+
+   def elementTags(self):
+      """returns the set of package element tags handled by the parser (and accepted by its element filter)"""
+      if self.switcher is None:
+         self.switcher = self._createSwitcher()
+      if self.elementFilter is not None:
+         return set(tag for tag in self.switcher.keys() if self.elementFilter.matchTag(tag))
+      return set(self.switcher.keys())
+   
+   def loadXML(self,package,xmlRoot,lazy=False,packageRef=None):
+      """
+      Loads all elements and sub-packages of xmlRoot into package.
+      When lazy is True, sub-packages are only created as empty stubs that will be parsed on first access.
+      packageRef is the reference of package, it is only given for sub-packages not yet inserted into their parent package.
+      """
+      if self.switcher is None:
+         self.switcher = self._createSwitcher()
+      if (packageRef is None) and (self.elementFilter is not None) and (self.elementFilter.refPatterns is not None):
+         packageRef = package.ref
       if xmlRoot.find('ELEMENTS'):
          elementNames = set([x.name for x in package.elements])
          for xmlElement in xmlRoot.findall('./ELEMENTS/*'):
-            parseFunc = self.switcher.get(xmlElement.tag)
-            if parseFunc is not None:
-               element = parseFunc(xmlElement,self.rootProject,parent=package)
-               element.parent=package
-               if isinstance(element,autosar.element.Element)==True:
-                  if element.name not in elementNames:
-                     #ignore duplicated items                        
-                     package.append(element)
-                     elementNames.add(element.name)
-               else:
-                  #raise ValueError("parse error: %s"%type(element))
-                  raise ValueError("parse error: %s"%xmlElement.tag)
-            else:
-               print("unhandled: %s"%xmlElement.tag)
+            self._loadElement(package,xmlElement,elementNames,packageRef)
       if xmlRoot.find('SUB-PACKAGES'):
          for xmlPackage in xmlRoot.findall('./SUB-PACKAGES/AR-PACKAGE'):
             name = xmlPackage.find("./SHORT-NAME").text
             subPackage = autosar.package.Package(name)           
-            self.loadXML(subPackage,xmlPackage)
+            if lazy:
+               subPackage._deferXML(self,xmlPackage)
+            else:
+               self.loadXML(subPackage,xmlPackage,packageRef=None if packageRef is None else packageRef+'/'+name)
             package.subPackages.append(subPackage)
             subPackage.parent=package
+            ws = package.rootWS()
+            if ws is not None:
+               ws._registerRef(subPackage)
+
+   def loadXMLStream(self,events,namespace=None):
+      """
+      Loads packages from an iterator of ('start', elem) and ('end', elem) events (as returned by ElementTree.iterparse).
+      The namespace is removed from each tag once the element is complete. Each element below <ELEMENTS> is handed to its
+      parse function as soon as it has been read and is then removed from the tree, the same goes for each <AR-PACKAGE>.
+      Peak memory usage is therefore proportional to the largest element and not to the size of the file.
+      """
+      if self.switcher is None:
+         self.switcher = self._createSwitcher()
+      ws = self.rootProject
+      assert(ws is not None)
+      stringPool = ws.stringPool
+      ns = None if namespace is None else u'{%s}' % namespace
+      nsl = 0 if ns is None else len(ns)
+      path = [] #tag names (without namespace) of currently open XML nodes
+      frames = [] #list of (xmlPackage, package, elementNames)
+      xmlParents = []
+      for event, xmlElem in events:
+         tag = xmlElem.tag
+         if (ns is not None) and tag.startswith(ns):
+            tag = tag[nsl:]
+         if event == 'start':
+            path.append(tag)
+            xmlParents.append(xmlElem)
+            continue
+         xmlElem.tag = tag
+         stringPool.internNode(xmlElem)
+         path.pop()
+         xmlParents.pop()
+         if len(path)==0:
+            break
+         xmlParent = xmlParents[-1]
+         if tag == 'SHORT-NAME' and path[-1] == 'AR-PACKAGE':
+            if len(frames)==0 or frames[-1][0] is not xmlParent:
+               name = xmlElem.text
+               if len(frames)==0:
+                  package = ws.find(name)
+                  if package is None:
+                     package = autosar.package.Package(name, parent=ws)
+                     ws.packages.append(package)
+                     ws._registerRef(package)
+               else:
+                  parentPackage = frames[-1][1]
+                  package = autosar.package.Package(name)
+                  parentPackage.subPackages.append(package)
+                  package.parent=parentPackage
+                  ws._registerRef(package)
+               frames.append((xmlParent, package, set([x.name for x in package.elements])))
+         elif path[-1] == 'ELEMENTS' and len(path)>1 and path[-2] == 'AR-PACKAGE':
+            if len(frames)>0 and frames[-1][0] is xmlParents[-2]:
+               self._loadElement(frames[-1][1], xmlElem, frames[-1][2])
+            xmlParent.remove(xmlElem)
+         elif tag == 'AR-PACKAGE':
+            if len(frames)>0 and frames[-1][0] is xmlElem:
+               frames.pop()
+            xmlParent.remove(xmlElem)
+
+   def _loadElement(self,package,xmlElement,elementNames,packageRef=None):
+      parseFunc = self.switcher.get(xmlElement.tag)
+      if parseFunc is not None:
+         elementFilter = self.elementFilter
+         if elementFilter is not None:
+            if not elementFilter.matchTag(xmlElement.tag):
+               return
+            if elementFilter.refPatterns is not None:
+               xmlName = xmlElement.find('SHORT-NAME')
+               if packageRef is None:
+                  packageRef = package.ref
+               if (xmlName is None) or not elementFilter.matchRef(packageRef+'/'+xmlName.text):
+                  return
+         element = parseFunc(xmlElement,self.rootProject,parent=package)
+         element.parent=package
+         if isinstance(element,autosar.element.Element)==True:
+            if element.name not in elementNames:
+               #ignore duplicated items                        
+               package.append(element)
+               elementNames.add(element.name)
+         else:
+            #raise ValueError("parse error: %s"%type(element))
+            raise ValueError("parse error: %s"%xmlElement.tag)
+      else:
+         _logger.warning('unhandled element: %s', xmlElement.tag)
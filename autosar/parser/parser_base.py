@@ -5,7 +5,9 @@ class BaseParser:
       self.version=version
       
    def parseDesc(self,xmlRoot,elem):
-      descXml = xmlRoot.find('DESC')      
+      self.parseDescNode(xmlRoot.find('DESC'),elem)
+
+   def parseDescNode(self,descXml,elem):
       if descXml is not None:
          L2Xml = descXml.find('L-2')
          if L2Xml is not None:
@@ -1,4 +1,4 @@
-from autosar.base import hasAdminData,parseAdminDataNode,parseTextNode
+from autosar.base import hasAdminData,parseAdminDataNode,parseTextNode,childNodeMap
 import autosar.portinterface
 from autosar.parser.parser_base import BaseParser
 
@@ -17,24 +17,35 @@ class PortInterfacePackageParser(BaseParser):
                   self.handler.portInterfaces.append(portInterface)
    
    def parseSenderReceiverInterface(self,xmlRoot,rootProject=None,parent=None): 
-         name = xmlRoot.find("./SHORT-NAME")
+         xmlNodes = childNodeMap(xmlRoot)
+         name = xmlNodes.get('SHORT-NAME')
          if name is not None:
             if self.version==3:
                portInterface = autosar.portinterface.SenderReceiverInterface(name.text)
-               if hasAdminData(xmlRoot):
-                  portInterface.adminData=parseAdminDataNode(xmlRoot.find('ADMIN-DATA'))               
-               if xmlRoot.find("./IS-SERVICE").text == 'true': portInterface.isService = True
-               for xmlItem in xmlRoot.findall('./DATA-ELEMENTS/DATA-ELEMENT-PROTOTYPE'):
-                  name = xmlItem.find("./SHORT-NAME")
-                  if name is not None:
-                     isQueued = True if xmlItem.find("./IS-QUEUED").text=='true' else False
-                     typeRef=xmlItem.find("./TYPE-TREF").text
-                     dataElem = autosar.portinterface.DataElement(name.text,typeRef,isQueued,parent=portInterface)
-                     portInterface.dataElements.append(dataElem)
-               if xmlRoot.find('MODE-GROUPS') is not None:
+               xmlAdminData = xmlNodes.get('ADMIN-DATA')
+               if xmlAdminData is not None:
+                  portInterface.adminData=parseAdminDataNode(xmlAdminData)
+               if xmlNodes['IS-SERVICE'].text == 'true': portInterface.isService = True
+               xmlDataElements = xmlNodes.get('DATA-ELEMENTS')
+               if xmlDataElements is not None:
+                  for xmlItem in xmlDataElements:
+                     if xmlItem.tag != 'DATA-ELEMENT-PROTOTYPE':
+                        continue
+                     xmlItemNodes = childNodeMap(xmlItem)
+                     name = xmlItemNodes.get('SHORT-NAME')
+                     if name is not None:
+                        isQueued = True if xmlItemNodes['IS-QUEUED'].text=='true' else False
+                        typeRef=xmlItemNodes['TYPE-TREF'].text
+                        dataElem = autosar.portinterface.DataElement(name.text,typeRef,isQueued,parent=portInterface)
+                        portInterface.dataElements.append(dataElem)
+               xmlModeGroups = xmlNodes.get('MODE-GROUPS')
+               if xmlModeGroups is not None:
                   portInterface.modeGroups=[]
-                  for xmlItem in xmlRoot.findall('./MODE-GROUPS/MODE-DECLARATION-GROUP-PROTOTYPE'):
-                     modeGroup = autosar.portinterface.ModeGroup(xmlItem.find("./SHORT-NAME").text,xmlItem.find("./TYPE-TREF").text,portInterface)                     
+                  for xmlItem in xmlModeGroups:
+                     if xmlItem.tag != 'MODE-DECLARATION-GROUP-PROTOTYPE':
+                        continue
+                     xmlItemNodes = childNodeMap(xmlItem)
+                     modeGroup = autosar.portinterface.ModeGroup(xmlItemNodes['SHORT-NAME'].text,xmlItemNodes['TYPE-TREF'].text,portInterface)
                      portInterface.modeGroups.append(modeGroup)
                return portInterface
 
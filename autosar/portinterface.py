@@ -1,9 +1,10 @@
 from autosar.element import Element
-import collections
+import collections.abc
 import autosar.base
 
 
 class PortInterface(Element):
+   __slots__ = ('isService',)
    def __init__(self, name, isService=False, parent=None, adminData=None):
       super().__init__(name,parent,adminData)
       self.isService=bool(isService)
@@ -15,6 +16,7 @@ class PortInterface(Element):
          raise ValueError('expected string')
       
 class SenderReceiverInterface(PortInterface):
+   __slots__ = ('dataElements', 'modeGroups')
    def __init__(self, name, isService=False, parent=None, adminData=None):
       super().__init__(name, isService, parent, adminData)
       self.dataElements=[]
@@ -81,6 +83,7 @@ class SenderReceiverInterface(PortInterface):
    
 
 class ParameterInterface(PortInterface):
+   __slots__ = ('dataElements',)
    def tag(self,version=None):
       return 'CALPRM-INTERFACE'
 
@@ -112,6 +115,7 @@ class ParameterInterface(PortInterface):
    
 
 class ClientServerInterface(PortInterface):
+   __slots__ = ('operations', 'applicationErrors')
    def __init__(self, name, isService=False, parent=None, adminData=None):
       super().__init__(name, isService, parent, adminData)
       self.operations=[]
@@ -175,6 +179,7 @@ class ClientServerInterface(PortInterface):
 
 
 class DataElement(Element):
+   __slots__ = ('isQueued', 'swAddrMethodRefList', 'typeRef')
    def __init__(self,name, typeRef, isQueued=False, softwareAddressMethodRef=None, parent=None, adminData=None):
       super().__init__(name,parent,adminData)
       if isinstance(typeRef,str):
@@ -199,6 +204,7 @@ class DataElement(Element):
       return data
 
 class ModeGroup(Element):
+   __slots__ = ('typeRef',)
    def __init__(self, name, typeRef, parent=None, adminData=None):
       super().__init__(name, parent, adminData)
       self.typeRef=typeRef
@@ -217,6 +223,7 @@ class ModeGroup(Element):
       return not (self == other)  
 
 class Operation(Element):
+   __slots__ = ('arguments', 'errorRefs')
    def __init__(self,name,parent=None):
       super().__init__(name,parent)      
       self.arguments=[]
@@ -302,7 +309,7 @@ class Operation(Element):
          raise ValueError('cannot call this method without valid parent object')
       if isinstance(data, str):
          data=[data]         
-      if isinstance(data, collections.Iterable):
+      if isinstance(data, collections.abc.Iterable):
          del self.errorRefs[:]
          for name in data:
             found=False
@@ -317,7 +324,8 @@ class Operation(Element):
          raise ValueError("input argument must be string or iterrable")
    
 
-class Argument(object):
+class Argument(autosar.base.OwnedObject):
+   __slots__ = ('name', 'typeRef', 'direction')
    def __init__(self,name,typeRef,direction):
       self.name=name
       self.typeRef=typeRef
@@ -332,6 +340,7 @@ class Argument(object):
       return {'type': self.__class__.__name__, 'name':self.name, 'typeRef':self.typeRef, 'direction': self.direction}
 
 class ApplicationError(Element):
+   __slots__ = ('errorCode',)
    def __init__(self, name, errorCode, parent=None, adminData=None):
       super().__init__(name, parent, adminData)
       self.errorCode=int(errorCode)
@@ -345,6 +354,7 @@ class ApplicationError(Element):
 
 
 class SoftwareAddressMethod(Element):
+   __slots__ = ()
    def __init__(self, name, parent=None, adminData=None):
       super().__init__(name, parent, adminData)
    
@@ -352,6 +362,7 @@ class SoftwareAddressMethod(Element):
       return 'SW-ADDR-METHOD'
 
 class ModeDeclarationGroup(Element):
+   __slots__ = ('initialModeRef', 'modeDeclarations')
    def __init__(self, name, initialModeRef=None, modeDeclarations=None, parent=None, adminData=None):
       super().__init__(name, parent, adminData)
       self.initialModeRef = initialModeRef
@@ -385,6 +396,7 @@ class ModeDeclarationGroup(Element):
       return not (self == other)
 
 class ModeDeclaration(Element):
+   __slots__ = ()
    def __init__(self,name,parent=None):
       super().__init__(name,parent)
    def __eq__(self, other):
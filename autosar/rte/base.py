@@ -1,27 +1,85 @@
 import autosar.datatype
+import autosar.portinterface
+import heapq
 
 class RteTypeManager:
    
    def __init__(self):
       self.typeMap = {}
+      self.childTypeMap = {} #maps the reference of a record or array type to the references of its element types
+      self.resolvedTypes = {} #memoized results of ws.find(typeRef, role='DataType')
+      self.typedefOrder = None
+      self._processing = [] #references of the record and array types currently being processed (used for cycle detection)
+   
+   def findType(self, ws, typeRef):
+      """
+      Returns the data type referenced by typeRef. The result is memoized.
+      """
+      dataType = self.resolvedTypes.get(typeRef)
+      if dataType is None:
+         dataType = ws.find(typeRef, role='DataType')
+         if dataType is None:
+            raise ValueError('invalid reference: ' + typeRef)
+         self.resolvedTypes[typeRef] = dataType
+      return dataType
    
    def processType(self, ws, dataType):
-      if dataType.ref not in self.typeMap:         
+      ref = dataType.ref
+      if ref in self.typeMap:
+         return
+      if ref in self._processing:
+         cycle = self._processing[self._processing.index(ref):]+[ref]
+         raise ValueError('cyclic type reference: ' + ' -> '.join(cycle))
+      if isinstance(dataType, autosar.datatype.RecordDataType) or isinstance(dataType, autosar.datatype.ArrayDataType):
          if isinstance(dataType, autosar.datatype.RecordDataType):
-            for elem in dataType.elements:
-               childType = ws.find(elem.typeRef, role='DataType')
-               if childType is None:
-                  raise ValueError('invalid reference: ' + elem.typeRef)
-               self.processType(ws, childType)
-            self.typeMap[dataType.ref]=dataType
-         elif isinstance(dataType, autosar.datatype.ArrayDataType):
-               childType = ws.find(dataType.typeRef, role='DataType')
-               if childType is None:
-                  raise ValueError('invalid reference: ' + elem.typeRef)
-               self.processType(ws, childType)
-               self.typeMap[dataType.ref]=dataType
+            typeRefs = [elem.typeRef for elem in dataType.elements]
          else:
-            self.typeMap[dataType.ref]=dataType
+            typeRefs = [dataType.typeRef]
+         childRefs = []
+         self._processing.append(ref)
+         try:
+            for typeRef in typeRefs:
+               childType = self.findType(ws, typeRef)
+               self.processType(ws, childType)
+               childRefs.append(childType.ref)
+         finally:
+            self._processing.pop()
+         self.childTypeMap[ref] = childRefs
+      self.typeMap[ref] = dataType
+      self.typedefOrder = None
+   
+   def getTypedefOrder(self):
+      """
+      Returns all data types (except mode types) in topological order, each type comes after the types of its elements.
+      Among the types whose element types have been defined, basic types come before record and array types and are sorted by reference.
+      The order is computed once and is kept until a new type is processed.
+      """
+      if self.typedefOrder is None:
+         refs = [ref for ref, dataType in self.typeMap.items() if not isinstance(dataType, autosar.portinterface.ModeDeclarationGroup)]
+         remaining = {}
+         dependents = {}
+         for ref in refs:
+            childRefs = set(self.childTypeMap.get(ref, []))
+            remaining[ref] = len(childRefs)
+            for childRef in childRefs:
+               dependents.setdefault(childRef, []).append(ref)
+         ready = [(self._typeGroup(ref), ref) for ref in refs if remaining[ref] == 0]
+         heapq.heapify(ready)
+         order = []
+         while len(ready) > 0:
+            ref = heapq.heappop(ready)[1]
+            order.append(ref)
+            for parentRef in dependents.get(ref, []):
+               remaining[parentRef] -= 1
+               if remaining[parentRef] == 0:
+                  heapq.heappush(ready, (self._typeGroup(parentRef), parentRef))
+         if len(order) != len(refs):
+            raise ValueError('cyclic type reference: ' + ', '.join(sorted(ref for ref in refs if remaining[ref] > 0)))
+         self.typedefOrder = order
+      return [self.typeMap[ref] for ref in self.typedefOrder]
+   
+   def _typeGroup(self, ref):
+      return 1 if ref in self.childTypeMap else 0
    
    def getTypes(self):
       basicTypes=set()
@@ -2,6 +2,12 @@ import os
 import autosar.rte.partition
 import cfile as C
 import io
+import json
+import hashlib
+import locale
+import multiprocessing
+
+_manifestName = 'Rte_manifest.json'
 
 def _genCommentHeader(comment):
    lines = []
@@ -10,6 +16,155 @@ def _genCommentHeader(comment):
    lines.append('*********************************************************************************************************************/')
    return lines
 
+def _writeIfChanged(filename, text):
+   """
+   Writes text to filename unless the file already contains the exact same bytes. Returns True if the file was written.
+   """
+   data = text.encode(locale.getpreferredencoding(False))
+   if os.path.isfile(filename) and os.path.getsize(filename) == len(data):
+      if _fileHash(filename) == hashlib.sha1(data).hexdigest():
+         return False
+   with open(filename, 'wb') as fp:
+      fp.write(data)
+   return True
+
+def _fileHash(filename):
+   with open(filename, 'rb') as fp:
+      return hashlib.sha1(fp.read()).hexdigest()
+
+class _OutputFile:
+   """
+   Opens a generated file for writing.
+   In incremental mode the text is collected in memory and the file is only written (on exit) if the new content differs from the old.
+   """
+   def __init__(self, filename, incremental=False):
+      self.filename = filename
+      self.incremental = incremental
+      self.fp = None
+
+   def __enter__(self):
+      if self.incremental:
+         self.fp = io.StringIO()
+      else:
+         self.fp = io.open(self.filename, 'w', newline='\n')
+      return self.fp
+
+   def __exit__(self, exc_type, exc_value, traceback):
+      if self.incremental:
+         if exc_type is None:
+            _writeIfChanged(self.filename, self.fp.getvalue())
+      else:
+         self.fp.close()
+      return False
+
+class _CodeWriter:
+   """
+   Writes C code to a file one section at a time instead of collecting the whole file in a cfile object.
+   The output is identical to writing '\n'.join(hfile.lines()) of a C.hfile containing all sections.
+   """
+   def __init__(self, fp):
+      self.fp = fp
+      self.guard = None
+      self.isEmpty = True
+
+   def writeLines(self, lines):
+      if len(lines) > 0:
+         if not self.isEmpty:
+            self.fp.write('\n')
+         self.fp.write('\n'.join(lines))
+         self.isEmpty = False
+
+   def write(self, code):
+      """writes a C.sequence or a list of C code elements"""
+      if not isinstance(code, C.sequence):
+         code = C.sequence().extend(code)
+      self.writeLines(code.lines())
+
+   def beginHeader(self, guard):
+      self.guard = guard
+      self.writeLines([str(C.ifndef(guard)), str(C.define(guard)), ''])
+
+   def endHeader(self):
+      self.writeLines(['\n%s %s\n'%(str(C.endif()), str(C.linecomment(self.guard)))])
+
+def _updateDigest(sha, obj, visited):
+   """
+   Adds the content of obj to sha. Objects are traversed through their attributes (except parent), packages and other workspace
+   level objects are only represented by their ref.
+   """
+   if obj is None or isinstance(obj, (str, int, float, bool)):
+      sha.update(repr(obj).encode('utf-8'))
+   elif isinstance(obj, (list, tuple)):
+      sha.update(b'[')
+      for item in obj:
+         _updateDigest(sha, item, visited)
+      sha.update(b']')
+   elif isinstance(obj, (set, frozenset)):
+      _updateDigest(sha, sorted(obj, key=repr), visited)
+   elif isinstance(obj, dict):
+      sha.update(b'{')
+      for key in sorted(obj.keys(), key=repr):
+         _updateDigest(sha, key, visited)
+         _updateDigest(sha, obj[key], visited)
+      sha.update(b'}')
+   elif isinstance(obj, (autosar.package.Package, autosar.Workspace)):
+      sha.update(('<%s>'%obj.ref).encode('utf-8'))
+   elif hasattr(obj, '__dict__') or hasattr(obj, '__slots__'):
+      if id(obj) in visited:
+         sha.update(('<%s>'%getattr(obj, 'ref', '')).encode('utf-8'))
+         return
+      visited.add(id(obj))
+      sha.update(obj.__class__.__name__.encode('utf-8'))
+      _updateDigest(sha, dict((k,v) for k,v in autosar.base.objectItems(obj) if k != 'parent'), visited)
+   else:
+      sha.update(repr(obj).encode('utf-8'))
+
+def _collectRefs(obj, result, visited):
+   """
+   Collects all reference strings (attributes with names ending in 'Ref') found in obj and its child objects
+   """
+   if isinstance(obj, (list, tuple)):
+      for item in obj:
+         _collectRefs(item, result, visited)
+   elif isinstance(obj, dict):
+      for item in obj.values():
+         _collectRefs(item, result, visited)
+   elif (hasattr(obj, '__dict__') or hasattr(obj, '__slots__')) and not isinstance(obj, (autosar.package.Package, autosar.Workspace)):
+      if id(obj) in visited:
+         return
+      visited.add(id(obj))
+      for key, value in autosar.base.objectItems(obj):
+         if key == 'parent':
+            continue
+         if key.endswith('Ref') and isinstance(value, str):
+            result.add(value)
+         else:
+            _collectRefs(value, result, visited)
+
+def _loadManifest(filename):
+   if os.path.isfile(filename):
+      try:
+         with open(filename, 'r') as fp:
+            data = json.load(fp)
+         if isinstance(data, dict):
+            return data
+      except ValueError:
+         pass
+   return {}
+
+def _saveManifest(filename, data):
+   _writeIfChanged(filename, json.dumps(data, indent=2, sort_keys=True)+'\n')
+
+_workerGenerator = None
+
+def _initHeaderWorker(snapshot):
+   global _workerGenerator
+   _workerGenerator = ComponentHeaderGenerator(autosar.rte.partition.loadSnapshot(snapshot))
+
+def _headerWorker(args):
+   (index, destdir, incremental, entry) = args
+   return _workerGenerator._generateHeader(_workerGenerator.partition.components[index], destdir, incremental, entry)
+
 class TypeGenerator:
    
    def __init__(self, partition, useDefaultTypes=True):
@@ -19,104 +174,105 @@ class TypeGenerator:
          self._initDefaultType()
       
    
-   def generate(self, filename='Rte_Type.h', dummy=None):
+   def generate(self, filename='Rte_Type.h', dummy=None, incremental=False):
       """
       Generates Rte_Type.h
-      Note: The last argument has been deprecated and is no longer in use
+      Note: The dummy argument has been deprecated and is no longer in use
+      When incremental is True the file is only written when its content has changed.
       """
       if self.partition.isFinalized == False:
          self.partition.finalize()
-      with io.open(filename, 'w', newline='\n') as fp:         
-         hfile=C.hfile(filename)
-         hfile.code.extend([C.line(x) for x in _genCommentHeader('Includes')])         
-         hfile.code.append(C.include("Std_Types.h"))
-         hfile.code.append(C.blank())
+      with _OutputFile(filename, incremental) as fp:         
+         writer = _CodeWriter(fp)
+         writer.beginHeader(os.path.splitext(os.path.basename(filename))[0].upper()+'_H')
+         code = C.sequence()
+         code.extend([C.line(x) for x in _genCommentHeader('Includes')])
+         code.append(C.include("Std_Types.h"))
+         code.append(C.blank())
          (basicTypes,complexTypes,modeTypes) = self.partition.types.getTypes()         
-         hfile.code.extend([C.line(x) for x in _genCommentHeader('Data Type Definitions')])
-         hfile.code.append(C.blank())
+         code.extend([C.line(x) for x in _genCommentHeader('Data Type Definitions')])
+         code.append(C.blank())
+         writer.write(code)
          ws = self.partition.ws
          unusedDefaultTypes = self._findUnusedDefaultTypes(ws, basicTypes)
          
          first=True
-         for ref in sorted(basicTypes)+sorted(complexTypes):
-            dataType = ws.find(ref)
-            if dataType is not None:
-               typedef = None
-               if first:
-                  first=False
+         for dataType in self.partition.types.getTypedefOrder():
+            code = C.sequence()
+            typedef = None
+            if first:
+               first=False
+            else:
+               code.append(C.blank())
+            code.append('#define Rte_TypeDef_%s'%dataType.name)
+            if isinstance(dataType,autosar.datatype.BooleanDataType):
+               typedef = C.typedef('boolean', dataType.name)
+               code.append(C.statement(typedef))
+            elif isinstance(dataType,autosar.datatype.IntegerDataType):
+               valrange = dataType.maxVal-dataType.minVal
+               bitcount = valrange.bit_length()
+               typename = dataType.name
+               basetype = self._typename(bitcount,dataType.minVal)
+               typedef = C.typedef(basetype, typename)
+               code.append(C.statement(typedef))                  
+               isUnsigned = True if basetype in ('uint8','uint16','uint32') else False
+               if isUnsigned:
+                  minval=str(dataType.minVal)+'u'
+                  maxval=str(dataType.maxVal)+'u'
                else:
-                  hfile.code.append(C.blank())
-               hfile.code.append('#define Rte_TypeDef_%s'%dataType.name)
-               if isinstance(dataType,autosar.datatype.BooleanDataType):
-                  typedef = C.typedef('boolean', dataType.name)
-                  hfile.code.append(C.statement(typedef))
-               elif isinstance(dataType,autosar.datatype.IntegerDataType):
-                  valrange = dataType.maxVal-dataType.minVal
-                  bitcount = valrange.bit_length()
-                  typename = dataType.name
-                  basetype = self._typename(bitcount,dataType.minVal)
-                  typedef = C.typedef(basetype, typename)
-                  hfile.code.append(C.statement(typedef))                  
-                  isUnsigned = True if basetype in ('uint8','uint16','uint32') else False
-                  if isUnsigned:
-                     minval=str(dataType.minVal)+'u'
-                     maxval=str(dataType.maxVal)+'u'
-                  else:
-                     minval=str(dataType.minVal)
-                     maxval=str(dataType.maxVal)
-                  hfile.code.append('#define %s_LowerLimit ((%s)%s)'%(typename,typename,minval))
-                  hfile.code.append('#define %s_UpperLimit ((%s)%s)'%(typename,typename,maxval))
-                  if dataType.compuMethodRef is not None:
-                     compuMethod = ws.find(dataType.compuMethodRef)
-                     if compuMethod is not None:
-                        lines1=[]
-                        lines2=[]
-                        if isinstance(compuMethod,autosar.datatype.CompuMethodConst):
-                           for elem in compuMethod.elements:
-                              if isUnsigned:
-                                 value = str(elem.upperLimit)+'u'
-                              else:
-                                 value = str(elem.upperLimit)
-                              lines1.append('#define RTE_CONST_%s (%s)'%(elem.textValue,value))
-                              lines2.append('#define %s ((%s)%s)'%(elem.textValue,typename,value))
-                        if len(lines2)>0:
-                           tmp=lines1+[C.blank()]+lines2
-                        else:
-                           tmp=lines1
-                        for line in tmp:
-                           hfile.code.append(line)
+                  minval=str(dataType.minVal)
+                  maxval=str(dataType.maxVal)
+               code.append('#define %s_LowerLimit ((%s)%s)'%(typename,typename,minval))
+               code.append('#define %s_UpperLimit ((%s)%s)'%(typename,typename,maxval))
+               if dataType.compuMethodRef is not None:
+                  compuMethod = ws.find(dataType.compuMethodRef)
+                  if compuMethod is not None:
+                     lines1=[]
+                     lines2=[]
+                     if isinstance(compuMethod,autosar.datatype.CompuMethodConst):
+                        for elem in compuMethod.elements:
+                           if isUnsigned:
+                              value = str(elem.upperLimit)+'u'
+                           else:
+                              value = str(elem.upperLimit)
+                           lines1.append('#define RTE_CONST_%s (%s)'%(elem.textValue,value))
+                           lines2.append('#define %s ((%s)%s)'%(elem.textValue,typename,value))
+                     if len(lines2)>0:
+                        tmp=lines1+[C.blank()]+lines2
                      else:
-                        raise ValueError(dataType.compuMethodRef)
-               elif isinstance(dataType, autosar.datatype.RecordDataType):
-                  body = C.block(innerIndent=3)               
-                  for elem in dataType.elements:
-                     childType = ws.find(elem.typeRef, role='DataType')
-                     body.append(C.statement(C.variable(elem.name, childType.name)))
-                  struct = C.struct(None,body, typedef=dataType.name)
-                  hfile.code.append(C.statement(struct))
-               elif isinstance(dataType, autosar.datatype.StringDataType):
-                  hfile.code.append('typedef uint8 %s[%d];'%(dataType.name, dataType.length+1))
-               elif isinstance(dataType, autosar.datatype.ArrayDataType):
-                  childType = ws.find(dataType.typeRef, role='DataType')
-                  if childType is None:
-                     raise ValueError('invalid type reference: '+dataType.typeRef)
-                  hfile.code.append('typedef %s %s[%d];'%(childType.name, dataType.name, dataType.length))
-               elif isinstance(dataType, autosar.datatype.RealDataType):
-                  if dataType.encoding == 'DOUBLE':
-                     platform_typename = 'float64'
+                        tmp=lines1
+                     for line in tmp:
+                        code.append(line)
                   else:
-                     platform_typename = 'float32'
-                  hfile.code.append('typedef %s %s;'%(platform_typename, dataType.name))
+                     raise ValueError(dataType.compuMethodRef)
+            elif isinstance(dataType, autosar.datatype.RecordDataType):
+               body = C.block(innerIndent=3)               
+               for elem in dataType.elements:
+                  childType = self.partition.types.findType(ws, elem.typeRef)
+                  body.append(C.statement(C.variable(elem.name, childType.name)))
+               struct = C.struct(None,body, typedef=dataType.name)
+               code.append(C.statement(struct))
+            elif isinstance(dataType, autosar.datatype.StringDataType):
+               code.append('typedef uint8 %s[%d];'%(dataType.name, dataType.length+1))
+            elif isinstance(dataType, autosar.datatype.ArrayDataType):
+               childType = self.partition.types.findType(ws, dataType.typeRef)
+               code.append('typedef %s %s[%d];'%(childType.name, dataType.name, dataType.length))
+            elif isinstance(dataType, autosar.datatype.RealDataType):
+               if dataType.encoding == 'DOUBLE':
+                  platform_typename = 'float64'
                else:
-                  raise NotImplementedError(type(dataType))
-                  #sys.stderr.write('not implemented: %s\n'%str(type(dataType)))
+                  platform_typename = 'float32'
+               code.append('typedef %s %s;'%(platform_typename, dataType.name))
             else:
-               raise ValueError(ref)
+               raise NotImplementedError(type(dataType))
+               #sys.stderr.write('not implemented: %s\n'%str(type(dataType)))
+            writer.write(code)
    
+         code = C.sequence()
          if len(modeTypes)>0:         
             lines=self._genCommentHeader('Mode Types')
             tmp=[]
-            hfile.code.extend(lines)
+            code.extend(lines)
             first=True
             for ref in modeTypes:
                if first:
@@ -124,23 +280,24 @@ class TypeGenerator:
                else:
                   tmp.append(C.blank())
                modeType = ws.find(ref)
-               hfile.code.append(C.statement(C.typedef('uint8', 'Rte_ModeType_'+modeType.name)))
+               code.append(C.statement(C.typedef('uint8', 'Rte_ModeType_'+modeType.name)))
                
                for i,elem in enumerate(modeType.modeDeclarations):
                   # define RTE_MODE_EcuM_Mode_POST_RUN ((Rte_ModeType_EcuM_Mode)0)
                   tmp.append(C.define('RTE_MODE_%s_%s'%(modeType.name,elem.name),'((Rte_ModeType_EcuM_Mode)%d)'%i))
                
-            hfile.code.append(C.blank())
-            hfile.code.extend(tmp)
+            code.append(C.blank())
+            code.extend(tmp)
          if len(unusedDefaultTypes)>0:
-            hfile.code.append(C.blank(2))
-            hfile.code.append(C.line('#ifndef RTE_SUPPRESS_UNUSED_DATATYPES'))
+            code.append(C.blank(2))
+            code.append(C.line('#ifndef RTE_SUPPRESS_UNUSED_DATATYPES'))
             for name in sorted(unusedDefaultTypes):
-               hfile.code.append(C.blank())
-               hfile.code.extend(self.defaultTypes[name])
-            hfile.code.append(C.blank())
-            hfile.code.append(C.line('#endif'))            
-         fp.write('\n'.join(hfile.lines()))
+               code.append(C.blank())
+               code.extend(self.defaultTypes[name])
+            code.append(C.blank())
+            code.append(C.line('#endif'))            
+         writer.write(code)
+         writer.endHeader()
          fp.write('\n')
          
    
@@ -196,10 +353,13 @@ class RteGenerator:
             self.includes.append(elem)
    
    
-   def generate(self, filename):
+   def generate(self, filename, incremental=False):
+      """
+      Generates Rte.c. When incremental is True the file is only written when its content has changed.
+      """
       self._generate_com_access()
       self._generate_local_vars()
-      with io.open(filename, 'w', newline='\n') as fp:
+      with _OutputFile(filename, incremental) as fp:
          self._write_includes(fp)
          self._write_constants_and_typedefs(fp)
          self._write_local_vars(fp)
@@ -319,70 +479,128 @@ class RteGenerator:
          fp.write(str(proto.func)+'\n')
          fp.write('\n'.join(body.lines())+'\n\n')     
       
+#(clientAPI key, comment header) of the #define sections in Rte_<swc>.h
+_componentHeaderSections = [('read', 'Rte_Read_<p>_<d>'), ('write', 'Rte_Write_<p>_<d>'), ('receive', 'Rte_Receive_<p>_<d>'),
+                            ('send', 'Rte_Send_<p>_<d>'), ('mode', 'Rte_Mode_<p>_<d>'), ('mode', 'Rte_Mode_<mode>'),
+                            ('calprm', 'Rte_Calprm_<name>'), ('call', 'Rte_Call_<p>_<o> ')]
+
 class ComponentHeaderGenerator():
    def __init__(self, partition):
       self.partition = partition
    
-   def generate(self, destdir):
-      for component in self.partition.components:
-         with io.open(os.path.join(destdir, 'Rte_%s.h'%component.swc.name), 'w', newline='\n') as fp:
-            self._genComponentHeader(fp, component)
+   def generate(self, destdir, incremental=False, processes=1):
+      """
+      Generates Rte_<swc>.h for each component in the partition.
+      When incremental is True the manifest file Rte_manifest.json in destdir keeps track of the inputs used for each header.
+      Headers whose inputs are unchanged are skipped, other headers are only written when their content has changed.
+      When processes is not 1 the headers are generated in parallel by a pool of worker processes (processes=None uses one process per CPU).
+      Each worker process receives a snapshot of the finalized partition (see Partition.snapshot).
+      """
+      manifest = {}
+      if incremental:
+         manifestPath = os.path.join(destdir, _manifestName)
+         manifest = _loadManifest(manifestPath)
+      basenames = ['Rte_%s.h'%component.swc.name for component in self.partition.components]
+      if (processes == 1) or (len(self.partition.components) < 2):
+         results = [self._generateHeader(component, destdir, incremental, manifest.get(basenames[i]))
+                    for i,component in enumerate(self.partition.components)]
+      else:
+         pool = multiprocessing.Pool(processes, _initHeaderWorker, (self.partition.snapshot(),))
+         try:
+            results = pool.map(_headerWorker, [(i, destdir, incremental, manifest.get(basename)) for i,basename in enumerate(basenames)])
+         finally:
+            pool.terminate()
+      if incremental:
+         for i,entry in enumerate(results):
+            manifest[basenames[i]] = entry
+         _saveManifest(manifestPath, manifest)
+   
+   def _generateHeader(self, component, destdir, incremental, entry):
+      """
+      Generates the header of a single component. In incremental mode the header is skipped when entry (the manifest entry of the
+      header) matches the current inputs. Returns the new manifest entry (None when incremental is False).
+      """
+      filename = os.path.join(destdir, 'Rte_%s.h'%component.swc.name)
+      if incremental:
+         inputs = self._inputDigest(component)
+         if (entry is not None) and (entry.get('inputs') == inputs) and os.path.isfile(filename) and \
+            (entry.get('output') == _fileHash(filename)):
+            return entry
+      with _OutputFile(filename, incremental) as fp:
+         self._genComponentHeader(fp, component)
+      if incremental:
+         return {'inputs': inputs, 'output': _fileHash(filename)}
+      return None
+
+   def _inputDigest(self, component):
+      """
+      Calculates a digest of everything used to generate the header of component: the component type, its behavior,
+      all elements found by following references (port interfaces, constants, data types etc.) and the RTE API of the component.
+      """
+      ws = component.swc.rootWS()
+      assert(ws is not None)
+      elements = {}
+      pending = [component.swc]
+      if component.swc.behavior is not None:
+         pending.append(component.swc.behavior)
+      while len(pending)>0:
+         elem = pending.pop()
+         if elem.ref in elements:
+            continue
+         elements[elem.ref] = elem
+         refs = set()
+         _collectRefs(elem, refs, set())
+         for ref in refs:
+            item = ws.find(ref)
+            #use the package element (e.g. the port interface) in case ref points inside an element (e.g. a data element)
+            while (item is not None) and (item.parent is not None) and not isinstance(item.parent, autosar.package.Package):
+               item = item.parent
+            if (item is not None) and isinstance(item.parent, autosar.package.Package) and (item.ref not in elements):
+               pending.append(item)
+      sha = hashlib.sha1()
+      visited = set()
+      for ref in sorted(elements.keys()):
+         _updateDigest(sha, ref, visited)
+         _updateDigest(sha, elements[ref], visited)
+      for proto in component.clientAPI.get_all():
+         _updateDigest(sha, [proto.shortname, str(proto.func)], visited)
+      for name in sorted(component.rte_runnables):
+         _updateDigest(sha, [name, str(component.rte_runnables[name].prototype)], visited)
+      return sha.hexdigest()
    
    def _genComponentHeader(self, fp, component):
       ws = component.swc.rootWS()
       assert(ws is not None)
-      hfile=C.hfile(None, guard='RTE_%s_H'%(component.swc.name.upper()))
-      hfile.code.append(C.include('Rte.h'))
-      hfile.code.append(C.include('Rte_Type.h'))      
+      writer = _CodeWriter(fp)
+      writer.beginHeader('RTE_%s_H'%(component.swc.name.upper()))
+      writer.write([C.include('Rte.h'), C.include('Rte_Type.h')])
       lines = self._genInitValues(ws, component.swc.requirePorts+component.swc.providePorts)
       if len(lines)>0:
-         hfile.code.extend([C.line(x) for x in _genCommentHeader('Init Values')])
-         hfile.code.extend(lines)
+         writer.write([C.line(x) for x in _genCommentHeader('Init Values')])
+         writer.write(lines)
       
       #Write API
-      hfile.code.append(C.blank())
-      hfile.code.extend([C.line(x) for x in _genCommentHeader('API Prototypes')])
+      code = C.sequence()
+      code.append(C.blank())
+      code.extend([C.line(x) for x in _genCommentHeader('API Prototypes')])
       for proto in component.clientAPI.get_all():
          assert proto.func is not None
-         hfile.code.append(C.statement(proto.func))
-      if len(component.clientAPI.final['read'])>0:
-         hfile.code.append(C.blank())
-         hfile.code.extend([C.line(x) for x in _genCommentHeader('Rte_Read_<p>_<d>')])         
-         hfile.code.extend([C.define(proto.shortname, proto.func.name) for proto in component.clientAPI.final['read']])
-      if len(component.clientAPI.final['write'])>0:
-         hfile.code.append(C.blank())
-         hfile.code.extend([C.line(x) for x in _genCommentHeader('Rte_Write_<p>_<d>')])         
-         hfile.code.extend([C.define(proto.shortname, proto.func.name) for proto in component.clientAPI.final['write']])
-      if len(component.clientAPI.final['receive'])>0:
-         hfile.code.append(C.blank())
-         hfile.code.extend([C.line(x) for x in _genCommentHeader('Rte_Receive_<p>_<d>')])         
-         hfile.code.extend([C.define(proto.shortname, proto.func.name) for proto in component.clientAPI.final['receive']])
-      if len(component.clientAPI.final['send'])>0:
-         hfile.code.append(C.blank())
-         hfile.code.extend([C.line(x) for x in _genCommentHeader('Rte_Send_<p>_<d>')])         
-         hfile.code.extend([C.define(proto.shortname, proto.func.name) for proto in component.clientAPI.final['send']])
-      if len(component.clientAPI.final['mode'])>0:
-         hfile.code.append(C.blank())
-         hfile.code.extend([C.line(x) for x in _genCommentHeader('Rte_Mode_<p>_<d>')])         
-         hfile.code.extend([C.define(proto.shortname, proto.func.name) for proto in component.clientAPI.final['mode']])
-      if len(component.clientAPI.final['mode'])>0:
-         hfile.code.append(C.blank())
-         hfile.code.extend([C.line(x) for x in _genCommentHeader('Rte_Mode_<mode>')])         
-         hfile.code.extend([C.define(proto.shortname, proto.func.name) for proto in component.clientAPI.final['mode']])
-      if len(component.clientAPI.final['calprm'])>0:
-         hfile.code.append(C.blank())
-         hfile.code.extend([C.line(x) for x in _genCommentHeader('Rte_Calprm_<name>')])
-         hfile.code.extend([C.define(proto.shortname, proto.func.name) for proto in component.clientAPI.final['calprm']])
-      if len(component.clientAPI.final['call'])>0:
-         hfile.code.append(C.blank())
-         hfile.code.extend([C.line(x) for x in _genCommentHeader('Rte_Call_<p>_<o> ')])
-         hfile.code.extend([C.define(proto.shortname, proto.func.name) for proto in component.clientAPI.final['call']])         
+         code.append(C.statement(proto.func))
+      writer.write(code)
+      #Write #define maps, one section at a time
+      for (key, title) in _componentHeaderSections:
+         prototypes = component.clientAPI.final[key]
+         if len(prototypes)>0:
+            code = C.sequence()
+            code.append(C.blank())
+            code.extend([C.line(x) for x in _genCommentHeader(title)])
+            code.extend([C.define(proto.shortname, proto.func.name) for proto in prototypes])
+            writer.write(code)
       if len(component.rte_runnables)>0:
          for name in sorted(component.rte_runnables):
             runnable = component.rte_runnables[name]
-            tmp = self._writeRunnableProto(runnable)
-            hfile.code.extend(tmp)
-      fp.write('\n'.join(hfile.lines()))
+            writer.write(self._writeRunnableProto(runnable))
+      writer.endHeader()
       fp.write('\n')
 
    def _genInitValues(self, ws, ports):
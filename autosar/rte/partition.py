@@ -1,6 +1,7 @@
 import autosar.component
 import autosar.rte.base
 import cfile as C
+import pickle
 from collections import namedtuple
 
 def _type2arg(typeObj,pointer=False):
@@ -312,6 +313,7 @@ class Partition:
       self.components = [] #clients (components)
       self.serverAPI = ComponentAPI() #functions that the RTE must support towards its clients
       self.data_elements = {}
+      self.server_runnables = {} #maps (portInterface.ref, operation.ref) to list of (component, rte_runnable) tuples
       self.types = autosar.rte.RteTypeManager() #centralized type manager
       self.isFinalized = False
       self.comLayerPrefix = None
@@ -367,6 +369,8 @@ class Partition:
                      raise ValueError('invalid reference: '+iref.operationRef)
                   rte_runnable = Runnable.OperationInvokedRunnable(runnable.name, runnable.symbol, ws, port, operation)
                   component.create_server_runnable(ws, port, operation, rte_runnable)                  
+                  key = (rte_runnable.serverPortInterface.ref, rte_runnable.serverOperation.ref)
+                  self.server_runnables.setdefault(key, []).append((component, rte_runnable))
                   for argument in operation.arguments:
                      dataType = ws.find(argument.typeRef)
                      if dataType is None:
@@ -440,6 +444,14 @@ class Partition:
             self.serverAPI.update(component.clientAPI)
       self.serverAPI.finalize()
       self.isFinalized=True
+   
+   def snapshot(self):
+      """
+      Finalizes the partition and returns it (together with the workspace of its components) as pickled bytes.
+      The snapshot is used to hand the partition over to worker processes, use loadSnapshot to restore it.
+      """
+      self.finalize()
+      return pickle.dumps(self, pickle.HIGHEST_PROTOCOL)
     
    def _resolveCallPoints(self, component):
       if len(component.clientAPI.call):
@@ -454,14 +466,14 @@ class Partition:
 
    
    def _findServerRunnable(self, component, port_func):
-      for component2 in self.components:
-         if component2 is component:
-            next
-         for rte_runnable in component2.rte_runnables.values():
-            if rte_runnable.isServerRunnable:
-               if (rte_runnable.serverPortInterface is port_func.portInterface) and (rte_runnable.serverOperation is port_func.operation):
-                   return rte_runnable
-      return None
+      """
+      Returns the first server runnable that implements the operation called by port_func.
+      Like the linear search it replaces, this includes the server runnables of component itself.
+      """
+      entries = self.server_runnables.get((port_func.portInterface.ref, port_func.operation.ref))
+      if entries is None:
+         return None
+      return entries[0][1]
                         
 
    # def _findServerRunnable(self, portInterface, operation):
@@ -543,3 +555,7 @@ class Partition:
             isPointer = True
          func.add_arg(C.variable(argument.name, dataType.name, pointer=isPointer))
       return func
+
+def loadSnapshot(data):
+   """Restores a partition from the bytes returned by Partition.snapshot"""
+   return pickle.loads(data)
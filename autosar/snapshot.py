@@ -0,0 +1,81 @@
+import os
+import pickle
+import hashlib
+
+_snapshotFormat = 2
+
+class SnapshotCache(object):
+   """
+   On-disk cache of parsed ARXML files.
+   Each file is stored as a pickled snapshot of the workspace created from that file. A snapshot is only used when the path, size
+   and content hash of the ARXML file matches the values stored in the snapshot header (an unchanged mtime skips the hash check).
+   Snapshots are read using pickle, which can execute arbitrary code. Only use a cache directory that cannot be written by other users.
+   """
+   def __init__(self, directory):
+      self.directory = directory
+      if not os.path.isdir(directory):
+         os.makedirs(directory)
+
+   def snapshotPath(self, filename):
+      """returns the path of the snapshot file used for ARXML file filename"""
+      key = hashlib.sha1(os.path.abspath(filename).encode('utf-8')).hexdigest()
+      return os.path.join(self.directory, key+'.snapshot')
+
+   def createHeader(self, filename):
+      """creates the snapshot header for the current contents of filename"""
+      st = os.stat(filename)
+      return {'format': _snapshotFormat, 'path': os.path.abspath(filename), 'size': st.st_size, 'mtime': st.st_mtime_ns,
+              'hash': _fileHash(filename)}
+
+   def load(self, filename):
+      """
+      Returns the cached workspace for filename. Returns None if there is no snapshot or if the snapshot is outdated.
+      When only the mtime of filename has changed (same content hash) the header of the snapshot is updated with the new mtime.
+      Warning: the snapshot is unpickled, never load snapshots from an untrusted directory.
+      """
+      path = self.snapshotPath(filename)
+      if not os.path.isfile(path):
+         return None
+      st = os.stat(filename)
+      try:
+         with open(path, 'rb') as fp:
+            header = pickle.load(fp)
+            if (not isinstance(header, dict)) or (header.get('format') != _snapshotFormat) or \
+               (header.get('path') != os.path.abspath(filename)) or (header.get('size') != st.st_size):
+               return None
+            if header.get('mtime') == st.st_mtime_ns:
+               return pickle.load(fp)
+            if header.get('hash') != _fileHash(filename):
+               return None
+            data = fp.read()
+         ws = pickle.loads(data)
+      except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, TypeError, ValueError):
+         return None
+      #same content with a new mtime, store the new mtime so that the next load skips the hash check
+      header['mtime'] = st.st_mtime_ns
+      try:
+         self._write(path, header, data)
+      except OSError:
+         pass
+      return ws
+
+   def save(self, header, ws):
+      """
+      Saves ws as snapshot. The header must have been created (using createHeader) before the ARXML file was parsed.
+      """
+      self._write(self.snapshotPath(header['path']), header, pickle.dumps(ws, pickle.HIGHEST_PROTOCOL))
+
+   def _write(self, path, header, data):
+      """writes header and data (the pickled workspace) to the snapshot file path, replacing it atomically"""
+      tmpPath = '%s.%d.tmp'%(path, os.getpid())
+      with open(tmpPath, 'wb') as fp:
+         pickle.dump(header, fp, pickle.HIGHEST_PROTOCOL)
+         fp.write(data)
+      os.replace(tmpPath, path)
+
+def _fileHash(filename):
+   sha1 = hashlib.sha1()
+   with open(filename, 'rb') as fp:
+      for chunk in iter(lambda: fp.read(1024*1024), b''):
+         sha1.update(chunk)
+   return sha1.hexdigest()
@@ -1,21 +1,295 @@
 import autosar.package
 import autosar.parser.package_parser
 import autosar.writer
-from autosar.base import parseXMLFile,getXMLNamespace,removeNamespace
+import autosar.behavior
+import autosar.component
+import autosar.snapshot
+import autosar.xml_backend
+import autosar.xml_index
+from autosar.base import getXMLNamespace,iterparseXMLFile
 import json
+import io
 import os
 import ntpath
 import collections
+import collections.abc
+import itertools
+import multiprocessing
+import pickle
 import re
 
 _validWSRoles = ['DataType', 'Constant', 'PortInterface', 'ComponentType', 'ModeDclrGroup', 'CompuMethod', 'Unit']
 
+#reference attributes covered by the reverse reference index (see Workspace.findReferences)
+_reverseRefAttributes = frozenset(['typeRef', 'portInterfaceRef', 'initValueRef', 'compuMethodRef', 'startOnEventRef', 'componentRef',
+                                   'behaviorRef', 'portRef'])
+#package roles used to resolve reference attributes that only contain an element name
+_reverseRefRoles = {'typeRef': 'DataType', 'portInterfaceRef': 'PortInterface', 'initValueRef': 'Constant', 'compuMethodRef': 'CompuMethod'}
+
+def _parseVersion(namespace):
+   """Returns the AUTOSAR version (float) found in an XML namespace string"""
+   version = None
+   assert (namespace is not None)
+   tmp = namespace.split('/')[-1]
+   result = re.match(r'(\d+\.\d+)', tmp)
+   if result is None:
+      result = re.match(r'r(\d+\.\d+)', tmp)
+   if result is not None:
+      version = float(result.group(1))
+   if version is None:
+      raise NotImplementedError('unsupported autosar vesion: %s'%namespace)
+   return version
+
+def _xmlElementTags(namespace, elementFilter=None):
+   """returns the package element tags handled by the parser of the AUTOSAR version found in namespace"""
+   return autosar.parser.package_parser.PackageParser(_parseVersion(namespace), None, elementFilter).elementTags()
+
+def _createElementFilter(elementRefs, elementTags):
+   if elementRefs is None and elementTags is None:
+      return None
+   return autosar.parser.package_parser.ElementFilter(elementRefs, elementTags)
+
+def _writeFile(filename, writeFunc, encoding=None):
+   """
+   Calls writeFunc with a file object opened on a temporary file next to filename, which then replaces filename.
+   When writeFunc raises, the temporary file is removed and filename is left unchanged.
+   """
+   tmpPath = '%s.%d.tmp'%(filename, os.getpid())
+   try:
+      with open(tmpPath, 'w', encoding=encoding) as fp:
+         writeFunc(fp)
+      os.replace(tmpPath, filename)
+   except BaseException:
+      if os.path.exists(tmpPath):
+         os.remove(tmpPath)
+      raise
+
+def _loadXMLWorker(filename, streaming=False):
+   """
+   Loads a single ARXML file into a new workspace and returns it (runs in a worker process of Workspace.loadXMLFiles)
+   """
+   ws = Workspace()
+   ws.loadXML(filename, streaming=streaming)
+   ws.xmlroot = None
+   ws.packageParser = None
+   ws.refMap = {}
+   ws.reverseRefIndex = None
+   ws.stringPool = autosar.base.StringPool()
+   return ws
+
+def _collectReferences(obj, owner, visited, references, objects=None):
+   """
+   Appends a tuple (owner, holder, attribute, ref) to references for each reference attribute of obj and its child objects.
+   Reference attributes are string attributes with names ending with Ref and lists of strings with names ending with Refs or RefList.
+   holder is the object having the attribute and owner is the closest object with a parent (references made by objects without
+   parent such as com-specs are registered for their port). Objects belonging to another parent than owner (such as the behavior
+   of a component) are visited from their own parent.
+   When objects is not None all visited objects having a parent (as well as packages) are appended to it.
+   """
+   if isinstance(obj, (list, tuple)):
+      for item in obj:
+         _collectReferences(item, owner, visited, references, objects)
+   elif isinstance(obj, dict):
+      for item in obj.values():
+         _collectReferences(item, owner, visited, references, objects)
+   elif isinstance(obj, autosar.package.Package):
+      if id(obj) not in visited:
+         visited.add(id(obj))
+         if objects is not None:
+            objects.append(obj)
+         for elem in obj.elements:
+            _collectReferences(elem, None, visited, references, objects)
+         for subPackage in obj.subPackages:
+            _collectReferences(subPackage, None, visited, references, objects)
+   elif (hasattr(obj, '__dict__') or hasattr(obj, '__slots__')) and not isinstance(obj, Workspace):
+      if id(obj) in visited:
+         return
+      parent = getattr(obj, 'parent', None)
+      if (owner is not None) and (parent is not None) and (parent is not owner):
+         return
+      visited.add(id(obj))
+      if hasattr(obj, 'parent'):
+         owner = obj
+         if objects is not None:
+            objects.append(obj)
+      for key, value in autosar.base.trackObject(obj):
+         if key == 'parent':
+            continue
+         if isinstance(value, str):
+            if key.endswith('Ref') and (owner is not None):
+               references.append((owner, obj, key, value))
+         elif isinstance(value, list) and (key.endswith('Refs') or key.endswith('RefList')) and \
+            all(isinstance(item, str) for item in value):
+            if owner is not None:
+               for item in value:
+                  references.append((owner, obj, key, item))
+         else:
+            _collectReferences(value, owner, visited, references, objects)
+
+def _expectedTargetTypes(holder, attribute):
+   """
+   Returns a tuple of the valid target types of the reference attribute of holder (empty when any type is accepted).
+   Returns None for attributes that are not references to workspace objects.
+   """
+   if attribute == 'typeRef':
+      if isinstance(holder, autosar.component.ComponentPrototype):
+         return (autosar.component.ComponentType,)
+      elif isinstance(holder, autosar.portinterface.ModeGroup):
+         return (autosar.portinterface.ModeDeclarationGroup,)
+      elif isinstance(holder, autosar.behavior.PerInstanceMemory):
+         return None #name of C type
+      return (autosar.datatype.DataType,)
+   elif attribute == 'componentRef':
+      if isinstance(holder, autosar.behavior.InternalBehavior):
+         return (autosar.component.ComponentType,)
+      return (autosar.component.ComponentPrototype,)
+   return _referenceTargetTypes().get(attribute, ())
+
+def _referenceTargetTypes():
+   return {'portInterfaceRef': (autosar.portinterface.PortInterface,),
+           'initValueRef': (autosar.constant.Constant, autosar.constant.Value),
+           'compuMethodRef': (autosar.datatype.CompuMethodConst, autosar.datatype.CompuMethodRational),
+           'unitRef': (autosar.datatype.DataTypeUnitElement,),
+           'startOnEventRef': (autosar.behavior.RunnableEntity,),
+           'behaviorRef': (autosar.behavior.InternalBehavior,),
+           'portRef': (autosar.component.Port,),
+           'dataElemRef': (autosar.portinterface.DataElement,),
+           'operationRef': (autosar.portinterface.Operation,),
+           'errorRefs': (autosar.portinterface.ApplicationError,),
+           'swAddrMethodRefList': (autosar.portinterface.SoftwareAddressMethod,),
+           'exclusiveAreaRefs': (autosar.behavior.ExclusiveArea,)}
+
+#attributes ignored by Workspace.diff (InternalBehavior.swc is a cached link to the component referenced by componentRef)
+_diffIgnoredAttributes = frozenset(['parent', 'swc'])
+
+def _collectPackageElements(package, result):
+   """adds all elements of package (and its sub-packages) to the dictionary result, using the element reference as key"""
+   for elem in package.elements:
+      result[elem.ref] = elem
+   for subPackage in package.subPackages:
+      _collectPackageElements(subPackage, result)
+
+def _equalElements(lhs, rhs, visited):
+   """
+   Compares two objects of different workspaces attribute by attribute, reference attributes are compared as strings.
+   Packages and package elements found inside an attribute of the compared element are compared by their reference.
+   """
+   if isinstance(lhs, (list, tuple)):
+      if (not isinstance(rhs, (list, tuple))) or (len(lhs) != len(rhs)):
+         return False
+      for i,item in enumerate(lhs):
+         if not _equalElements(item, rhs[i], visited):
+            return False
+      return True
+   elif isinstance(lhs, dict):
+      if (not isinstance(rhs, dict)) or (set(lhs.keys()) != set(rhs.keys())):
+         return False
+      for key in lhs.keys():
+         if not _equalElements(lhs[key], rhs[key], visited):
+            return False
+      return True
+   elif (hasattr(lhs, '__dict__') or hasattr(lhs, '__slots__')) and not isinstance(lhs, (str, int, float, bool)):
+      if type(lhs) is not type(rhs):
+         return False
+      if isinstance(lhs, (autosar.package.Package, Workspace)) or ((len(visited) > 0) and isinstance(getattr(lhs, 'parent', None), autosar.package.Package)):
+         return lhs.ref == rhs.ref
+      key = (id(lhs), id(rhs))
+      if key in visited:
+         return True
+      visited.add(key)
+      lhsItems = [(name, value) for name, value in autosar.base.objectItems(lhs) if name not in _diffIgnoredAttributes]
+      rhsItems = [(name, value) for name, value in autosar.base.objectItems(rhs) if name not in _diffIgnoredAttributes]
+      if len(lhsItems) != len(rhsItems):
+         return False
+      for i,(name, value) in enumerate(lhsItems):
+         if (name != rhsItems[i][0]) or not _equalElements(value, rhsItems[i][1], visited):
+            return False
+      return True
+   return lhs == rhs
+
+class _ReverseRefIndex(object):
+   """
+   Reverse reference index of a workspace (see Workspace.findReferences), updated one package element at a time.
+   refs maps reference strings to lists of (referencing object, attribute name, package element).
+   entries maps the id of each indexed package element to the set of reference strings it has added to refs.
+   changed maps ids to the package elements that need to be indexed again.
+   """
+   def __init__(self):
+      self.refs = {}
+      self.entries = {}
+      self.changed = {}
+
+   def add(self, elem):
+      self.remove(elem)
+      references = []
+      _collectReferences(elem, None, set(), references)
+      refs = set()
+      for owner, holder, attribute, ref in references:
+         if attribute in _reverseRefAttributes:
+            self.refs.setdefault(ref, []).append((owner, attribute, elem))
+            refs.add(ref)
+      self.entries[id(elem)] = refs
+
+   def remove(self, elem):
+      refs = self.entries.pop(id(elem), None)
+      if refs is not None:
+         for ref in refs:
+            items = [item for item in self.refs[ref] if item[2] is not elem]
+            if len(items) > 0:
+               self.refs[ref] = items
+            else:
+               del self.refs[ref]
+
+class InvalidReference(object):
+   """
+   A dangling (target is None) or wrongly typed reference found by Workspace.validateReferences
+   """
+   def __init__(self, owner, attribute, ref, target=None, expectedTypes=None):
+      self.owner = owner
+      self.attribute = attribute
+      self.ref = ref
+      self.target = target
+      self.expectedTypes = expectedTypes
+
+   def __str__(self):
+      ownerRef = getattr(self.owner, 'ref', None)
+      ownerName = ownerRef if ownerRef is not None else '%s %s'%(self.owner.__class__.__name__, getattr(self.owner, 'name', ''))
+      if self.target is None:
+         return '%s: %s "%s" not found'%(ownerName, self.attribute, self.ref)
+      expected = ' or '.join([x.__name__ for x in self.expectedTypes])
+      return '%s: %s "%s" refers to %s, expected %s'%(ownerName, self.attribute, self.ref, self.target.__class__.__name__, expected)
+
+class WorkspaceDiff(object):
+   """
+   Differences between two workspaces, created by Workspace.diff.
+   added, removed and changed are sorted lists of references to package elements (data types, port interfaces, components etc.)
+   """
+   def __init__(self, added, removed, changed):
+      self.added = added
+      self.removed = removed
+      self.changed = changed
+
+   def __len__(self):
+      return len(self.added)+len(self.removed)+len(self.changed)
+
+   def refs(self):
+      """returns a set of all references that were added, removed or changed"""
+      return set(self.added) | set(self.removed) | set(self.changed)
+
+   def __str__(self):
+      lines = ['+ '+ref for ref in self.added]+['- '+ref for ref in self.removed]+['~ '+ref for ref in self.changed]
+      return '\n'.join(lines)
+
 class Workspace(object):
    def __init__(self, version=3.0, packages=None):
       self.packages = []
       self.version=version
       self.packageParser=None
       self.xmlroot = None
+      self.refMap = {} #maps reference strings to packages and package elements
+      self.reverseRefIndex = None #_ReverseRefIndex, created by the first call to findReferences
+      self.stringPool = autosar.base.StringPool() #shared tag, short name and reference strings of parsed XML
+      self.xmlIndexLoaders = [] #autosar.xml_index.IndexedPackageLoader instances of files loaded with loadXML(indexed=True)
       self.roles = {'DataType': None,
                     'Constant': None,
                     'PortInterface': None,
@@ -48,7 +322,7 @@ class Workspace(object):
       dirname=ntpath.normpath(ntpath.join(basedir,ntpath.dirname(fileRef['path'])))
       retval=ntpath.join(dirname,basename)
       if os.path.sep == '/': #are we running in cygwin/Linux?
-         retval = retval.replace(r'\\','/')
+         retval = retval.replace('\\','/')
       return retval
 
    def setRole(self, ref, role):
@@ -62,36 +336,202 @@ class Workspace(object):
       package.role=role
       self.roles[role]=package.ref
 
-   def openXML(self,filename):
-      version = None
-      xmlroot = parseXMLFile(filename)
-      namespace = getXMLNamespace(xmlroot)
-
-      assert (namespace is not None)
-      tmp = namespace.split('/')[-1]
-      result = re.match(r'(\d+\.\d+)', tmp)
-      if result is None:
-         result = re.match(r'r(\d+\.\d+)', tmp)
-      if result is not None:
-         version = float(result.group(1))
-      if version is None:
-         raise NotImplementedError('unsupported autosar vesion: %s'%namespace)
-      removeNamespace(xmlroot,namespace)
-      self.packageParser = autosar.parser.package_parser.PackageParser(version,self)
+   def openXML(self,filename,xmlBackend=None,skipTags=None,elementRefs=None,elementTags=None):
+      """
+      Parses filename, the packages can then be loaded using loadPackage.
+      xmlBackend selects the XML parser ('etree', 'lxml' or 'expat', see autosar.xml_backend.getXMLBackend).
+      Subtrees with a tag in skipTags (e.g. ['ADMIN-DATA']) are not loaded.
+      elementRefs (reference patterns) and elementTags select the package elements loaded by loadPackage, see
+      autosar.parser.package_parser.ElementFilter. Other elements are skipped without being parsed.
+      """
+      elementFilter = _createElementFilter(elementRefs, elementTags)
+      backend = autosar.xml_backend.getXMLBackend(xmlBackend)
+      xmlroot, namespace = backend.parse(filename, self.stringPool, skipTags, lambda namespace: _xmlElementTags(namespace, elementFilter))
+      version = _parseVersion(namespace)
+      self.packageParser = autosar.parser.package_parser.PackageParser(version,self,elementFilter)
       self.version=version
       self.xmlroot = xmlroot
 
-   def loadXML(self, filename, roles=None):
+   def loadXML(self, filename, roles=None, streaming=False, cacheDir=None, lazy=False, xmlBackend=None, skipTags=None, elementRefs=None,
+               elementTags=None, indexed=False):
+      """
+      Loads all packages from filename.
+      indexed=True memory maps the file and only scans it for the byte offsets of its packages and package elements (see
+      autosar.xml_index.XMLIndex). Each package element is parsed the first time it is found using find, the remaining elements of a
+      package when the package contents is accessed.
+      """
       global _validWSRoles
-      self.openXML(filename)
-      self.loadPackage('*')
+      if indexed and (streaming or (cacheDir is not None)):
+         raise ValueError('indexed cannot be combined with streaming or cacheDir')
+      if cacheDir is not None:
+         if (elementRefs is not None) or (elementTags is not None):
+            raise ValueError('elementRefs and elementTags cannot be combined with cacheDir')
+         self._loadXMLCached(filename, autosar.snapshot.SnapshotCache(cacheDir), streaming)
+      elif indexed:
+         self._loadXMLIndexed(filename, _createElementFilter(elementRefs, elementTags))
+      elif streaming:
+         self._loadXMLStream(filename, _createElementFilter(elementRefs, elementTags))
+      else:
+         self.openXML(filename, xmlBackend, skipTags, elementRefs, elementTags)
+         self.loadPackage('*', lazy=lazy)
       if roles is not None:
-         if not isinstance(roles, collections.Mapping):
+         if not isinstance(roles, collections.abc.Mapping):
             raise ValueError('roles parameter must be a dictionary or Mapping')
          for ref,role in roles.items():
             self.setRole(ref,role)
    
-   def loadPackage(self, packagename, role=None):
+   def _loadXMLCached(self, filename, cache, streaming=False):
+      """
+      Loads filename from its snapshot in cache. The file is parsed (and a new snapshot is saved) when the snapshot is missing or outdated.
+      """
+      other = cache.load(filename)
+      if other is None:
+         header = cache.createHeader(filename)
+         other = _loadXMLWorker(filename, streaming)
+         cache.save(header, other)
+      self._mergeWorkspace(other)
+      self.version = other.version
+      self.xmlroot = None
+      self.packageParser = None
+
+   def loadXMLFiles(self, filenames, processes=1, cacheDir=None):
+      """
+      Loads all packages from a list of ARXML files.
+      When processes is 1 each file is loaded (in order) using loadXML.
+      Otherwise the files are parsed in parallel by a pool of worker processes (processes=None uses one process per CPU).
+      The results are merged into this workspace in the same order as in filenames, using the same rules for duplicated elements as loadXML.
+      When cacheDir is given, files with a valid snapshot in cacheDir are restored from the snapshot instead of being parsed.
+      """
+      if processes == 1:
+         for filename in filenames:
+            self.loadXML(filename, cacheDir=cacheDir)
+         return
+      if len(filenames) == 0:
+         return
+      cache = None
+      snapshots = [None]*len(filenames)
+      if cacheDir is not None:
+         cache = autosar.snapshot.SnapshotCache(cacheDir)
+         snapshots = [cache.load(filename) for filename in filenames]
+      parseList = [filename for i,filename in enumerate(filenames) if snapshots[i] is None]
+      headers = [cache.createHeader(filename) for filename in parseList] if cache is not None else None
+      pool = None
+      if len(parseList) > 0:
+         pool = multiprocessing.Pool(processes)
+         results = pool.imap(_loadXMLWorker, parseList)
+      try:
+         i = 0
+         for other in snapshots:
+            if other is None:
+               other = next(results)
+               if cache is not None:
+                  cache.save(headers[i], other)
+               i += 1
+            self._mergeWorkspace(other)
+            self.version = other.version
+      finally:
+         if pool is not None:
+            pool.terminate()
+      self.xmlroot = None
+      self.packageParser = None
+
+   def _mergeWorkspace(self, other):
+      """
+      Moves all packages from other (a workspace created by _loadXMLWorker) into self.
+      Top-level packages are merged by name, elements with a name that already exists in the package are ignored.
+      """
+      for otherPackage in other.packages:
+         package = self.find(otherPackage.name)
+         if package is None:
+            package = autosar.package.Package(otherPackage.name, parent=self)
+            self.packages.append(package)
+            self._registerRef(package)
+         elementNames = set([x.name for x in package.elements])
+         for elem in otherPackage.elements:
+            if elem.name not in elementNames:
+               package.append(elem)
+               elementNames.add(elem.name)
+               self._linkParsedElement(elem)
+         for subPackage in otherPackage.subPackages:
+            package.subPackages.append(subPackage)
+            subPackage.parent=package
+            self._registerRef(subPackage)
+
+   def _linkParsedElement(self, elem):
+      """
+      Connects elem to the components found in this workspace, the same way the XML parser does while loading a file
+      """
+      if isinstance(elem, autosar.behavior.InternalBehavior):
+         swc = self.find(elem.componentRef)
+         if swc is not None:
+            swc.behavior=elem
+      elif isinstance(elem, autosar.component.SwcImplementation):
+         behavior = self.find(elem.behaviorRef)
+         if behavior is not None:
+            swc = self.find(behavior.componentRef)
+            if swc is not None:
+               swc.implementation=elem
+
+   def _loadXMLStream(self, filename, elementFilter=None):
+      """
+      Loads all packages from filename using incremental parsing.
+      The XML tree is discarded while parsing which means that loadPackage cannot be used afterwards.
+      """
+      events = iterparseXMLFile(filename)
+      event, xmlroot = next(events)
+      assert(event == 'start')
+      namespace = getXMLNamespace(xmlroot)
+      version = _parseVersion(namespace)
+      self.packageParser = autosar.parser.package_parser.PackageParser(version,self,elementFilter)
+      self.version=version
+      self.xmlroot = None
+      self.packageParser.loadXMLStream(itertools.chain([(event, xmlroot)], events), namespace)
+
+   def _loadXMLIndexed(self, filename, elementFilter=None):
+      """
+      Creates the packages found in the index of filename. The package elements are parsed on demand from the memory mapped file.
+      """
+      index = autosar.xml_index.XMLIndex(filename)
+      if index.namespace is None:
+         index.close()
+         raise ValueError('%s: XML namespace not found'%filename)
+      version = _parseVersion(index.namespace)
+      self.packageParser = autosar.parser.package_parser.PackageParser(version,self,elementFilter)
+      self.version=version
+      self.xmlroot = None
+      loader = autosar.xml_index.IndexedPackageLoader(index, self.packageParser)
+      self.xmlIndexLoaders.append(loader)
+      for packageRef in index.topLevelPackages:
+         package = self.refMap.get(packageRef)
+         if (package is None) or (package.parent is not self):
+            package = autosar.package.Package(packageRef[1:], parent=self)
+            self.packages.append(package)
+            self._registerRef(package)
+         loader.createPackages(package, packageRef)
+      if len(loader.pendingPackages) == 0:
+         loader.close()
+
+   def _loadIndexedElement(self, ref):
+      """
+      Parses the package element containing ref (the element itself or one of its children) when it is found in an index created by
+      loadXML(indexed=True) and has not been loaded yet.
+      """
+      for loader in self.xmlIndexLoaders:
+         elements = loader.index.elements
+         prefix = ref
+         while len(prefix) > 0:
+            entry = elements.get(prefix)
+            if entry is not None:
+               package = self.refMap.get(entry[0])
+               if isinstance(package, autosar.package.Package) and (package.ref == entry[0]) and \
+                  (entry[1] not in package.map['elements']):
+                  loader.loadElement(package, prefix)
+                  return True
+               break
+            prefix = prefix.rpartition('/')[0]
+      return False
+
+   def loadPackage(self, packagename, role=None, lazy=False):
       found=False
       result=[]
       if self.xmlroot is None:
@@ -99,14 +539,14 @@ class Workspace(object):
       if self.version >= 3.0 and self.version < 4.0:
          if self.xmlroot.find('TOP-LEVEL-PACKAGES'):
             for xmlPackage in self.xmlroot.findall('./TOP-LEVEL-PACKAGES/AR-PACKAGE'):
-               if self._loadPackageInternal(result, xmlPackage, packagename, role):
+               if self._loadPackageInternal(result, xmlPackage, packagename, role, lazy):
                   found = True
                
                
       elif self.version>=4.0:
          if self.xmlroot.find('AR-PACKAGES'):
             for xmlPackage in self.xmlroot.findall('.AR-PACKAGES/AR-PACKAGE'):
-               if self._loadPackageInternal(result, xmlPackage, packagename, role):
+               if self._loadPackageInternal(result, xmlPackage, packagename, role, lazy):
                   found = True
 
       else:
@@ -115,7 +555,7 @@ class Workspace(object):
          raise KeyError('package not found: '+packagename)
       return result
    
-   def _loadPackageInternal(self, result, xmlPackage, packagename, role):
+   def _loadPackageInternal(self, result, xmlPackage, packagename, role, lazy=False):
       name = xmlPackage.find("./SHORT-NAME").text
       found = False
       if packagename=='*' or packagename==name:
@@ -124,27 +564,33 @@ class Workspace(object):
          if package is None:
             package = autosar.package.Package(name, parent=self)
             self.packages.append(package)
+            self._registerRef(package)
             result.append(package)
-         self.packageParser.loadXML(package,xmlPackage)
+         if lazy:
+            package._deferXML(self.packageParser, xmlPackage)
+         else:
+            self.packageParser.loadXML(package,xmlPackage)
          if (packagename==name) and (role is not None):
             self.setRole(package.ref, role)
       return found
 
 
-   def loadJSON(self, filename):      
+   def loadJSON(self, filename, processes=1, cacheDir=None):      
       with open(filename) as fp:
          basedir = ntpath.dirname(filename)
          data = json.load(fp)         
          if data is not None:
+            filenames = []
             for item in data:
                if item['type']=='fileRef':
                   adjustedPath = self._adjustFileRef(item, basedir)
                   if adjustedPath.endswith('.arxml'):
-                     self.loadXML(adjustedPath)
+                     filenames.append(adjustedPath)
                   else:
                      raise NotImplementedError(adjustedPath)
                else:
                   raise ValueError('Unknown type: %s'%item['type'])
+            self.loadXMLFiles(filenames, processes, cacheDir)
    
 
    def find(self, ref, role=None):
@@ -156,8 +602,23 @@ class Workspace(object):
          if self.roles[role] is not None:
             ref=self.roles[role]+'/'+ref #appends the role packet name in front of ref
       
-      if ref[0]=='/': ref=ref[1:] #removes initial '/' if it exists
-      ref = ref.partition('/')
+      if ref[0]!='/': ref='/'+ref
+      item = self.refMap.get(ref)
+      if (item is not None) and (item.ref == ref):
+         return item
+      if (len(self.xmlIndexLoaders) > 0) and self._loadIndexedElement(ref):
+         item = self.refMap.get(ref)
+         if (item is not None) and (item.ref == ref):
+            return item
+      #ref is not in index, use the closest indexed parent to resolve the remaining part
+      parts = ref.split('/')
+      if '' not in parts[1:]:
+         for i in range(len(parts)-1,1,-1):
+            prefix = '/'.join(parts[:i])
+            item = self.refMap.get(prefix)
+            if (item is not None) and (item.ref == prefix):
+               return item.find('/'.join(parts[i:]))
+      ref = ref[1:].partition('/')
       for pkg in self.packages:
          if pkg.name == ref[0]:
             if len(ref[2])>0:
@@ -165,6 +626,171 @@ class Workspace(object):
             return pkg
       return None
 
+   def _registerRef(self, item):
+      """
+      Adds item to the reference index. When item is a package all its elements and sub-packages are added as well.
+      A package has precedence over an element using the same reference (same as Package.find).
+      The deferred content of a lazily loaded package is not parsed here, its elements and sub-packages are added when they are loaded.
+      """
+      ref = item.ref
+      if ref is not None:
+         existing = self.refMap.get(ref)
+         if (existing is None) or (existing is item) or isinstance(item, autosar.package.Package) or \
+            not isinstance(existing, autosar.package.Package) or (existing.ref != ref):
+            self.refMap[ref] = item
+      if isinstance(item, autosar.package.Package):
+         for elem in item._elements:
+            self._registerRef(elem)
+         for subPackage in item._subPackages:
+            self._registerRef(subPackage)
+      elif self.reverseRefIndex is not None:
+         self.reverseRefIndex.changed[id(item)] = item
+
+   def _unregisterRef(self, item):
+      """
+      Removes item (and its children in case item is a package) from the reference index
+      """
+      ref = item.ref
+      if (ref is not None) and (self.refMap.get(ref) is item):
+         del self.refMap[ref]
+      if isinstance(item, autosar.package.Package):
+         #only the loaded content of a lazily loaded package has been registered
+         for elem in item._elements:
+            self._unregisterRef(elem)
+         for subPackage in item._subPackages:
+            self._unregisterRef(subPackage)
+      elif self.reverseRefIndex is not None:
+         self.reverseRefIndex.changed.pop(id(item), None)
+         self.reverseRefIndex.remove(item)
+
+   def _referencesChanged(self, elem):
+      """
+      Called by autosar.base.referencesChanged, elem (a package element) is indexed again the next time the reverse reference index is used
+      """
+      if self.reverseRefIndex is not None:
+         self.reverseRefIndex.changed[id(elem)] = elem
+
+   def findReferences(self, target, attributes=None):
+      """
+      Returns a list of all objects referencing target (a reference string or an object with a ref property).
+      Objects without a parent (com-specs, connector instance references, arguments etc.) are represented by their closest
+      parent object, for example the port of a com-spec or the connector of an instance reference.
+      The optional attributes argument (a string or a list of strings) limits the result to references made by these attributes.
+      """
+      ref = target if isinstance(target, str) else target.ref
+      if isinstance(attributes, str):
+         attributes = [attributes]
+      refs = self._getReverseRefIndex().refs
+      items = list(refs.get(ref, []))
+      name = ref.rpartition('/')[2]
+      if name != ref:
+         #references only containing the element name, resolved through the package role of the attribute
+         for item in refs.get(name, []):
+            other = self._resolveName(name, item[1])
+            if (other is not None) and (other.ref == ref):
+               items.append(item)
+      result = []
+      for obj, attribute, elem in items:
+         if (attributes is None or attribute in attributes) and not any(obj is x for x in result):
+            result.append(obj)
+      return result
+
+   def _getReverseRefIndex(self):
+      """
+      Returns the reverse reference index, it is built on first use.
+      The package elements changed since the last call (see autosar.base.referencesChanged) are indexed again.
+      """
+      index = self.reverseRefIndex
+      if index is None:
+         index = self.reverseRefIndex = _ReverseRefIndex()
+         autosar.base.registerRefIndex(self)
+         def addPackage(package):
+            for elem in package.elements:
+               index.changed[id(elem)] = elem
+            for subPackage in package.subPackages:
+               addPackage(subPackage)
+         for package in self.packages:
+            addPackage(package)
+      while len(index.changed) > 0:
+         changed = index.changed
+         index.changed = {}
+         for elem in changed.values():
+            if self._isIndexedElement(elem):
+               index.add(elem)
+            else:
+               index.remove(elem)
+      return index
+
+   def _isIndexedElement(self, elem):
+      """returns True when elem is an element of a package of this workspace"""
+      parent = elem.parent
+      if (parent is None) or not isinstance(parent, autosar.package.Package) or (parent.rootWS() is not self):
+         return False
+      return (self.refMap.get(elem.ref) is elem) or any(x is elem for x in parent._elements)
+
+   def _resolveName(self, name, attribute):
+      """resolves a reference attribute only containing a name by using the package role of the attribute"""
+      role = _reverseRefRoles.get(attribute)
+      if (role is None) or (len(name) == 0):
+         return None
+      return self.find(name, role)
+
+   def validateReferences(self):
+      """
+      Resolves all reference attributes of all objects in the workspace and returns a list of InvalidReference objects
+      for each dangling or wrongly typed reference. An empty list is returned when all references are valid.
+      """
+      references = []
+      objects = []
+      visited = set()
+      for package in self.packages:
+         _collectReferences(package, None, visited, references, objects)
+      refMap = {}
+      for obj in objects:
+         ref = getattr(obj, 'ref', None)
+         if (ref is not None) and (ref not in refMap):
+            refMap[ref] = obj
+      resolved = {}
+      result = []
+      for owner, holder, attribute, ref in references:
+         expectedTypes = _expectedTargetTypes(holder, attribute)
+         if expectedTypes is None:
+            continue
+         key = (ref, attribute)
+         if key in resolved:
+            target = resolved[key]
+         else:
+            if ref.startswith('/'):
+               target = refMap.get(ref)
+               if target is None:
+                  target = self.find(ref)
+            else:
+               target = self._resolveName(ref, attribute)
+            resolved[key] = target
+         if target is None:
+            result.append(InvalidReference(owner, attribute, ref))
+         elif (len(expectedTypes) > 0) and not isinstance(target, expectedTypes):
+            result.append(InvalidReference(owner, attribute, ref, target, expectedTypes))
+      return result
+
+   def diff(self, other):
+      """
+      Compares the package elements of this workspace with the ones in the workspace other and returns a WorkspaceDiff.
+      Elements are matched by reference. Elements only found in other are added, elements only found in self are removed.
+      Elements found in both workspaces are changed when any of their attributes (including child objects such as data elements,
+      ports or runnables) differ.
+      """
+      lhs = {}
+      rhs = {}
+      for package in self.packages:
+         _collectPackageElements(package, lhs)
+      for package in other.packages:
+         _collectPackageElements(package, rhs)
+      added = sorted(ref for ref in rhs.keys() if ref not in lhs)
+      removed = sorted(ref for ref in lhs.keys() if ref not in rhs)
+      changed = sorted(ref for ref in lhs.keys() if (ref in rhs) and not _equalElements(lhs[ref], rhs[ref], set()))
+      return WorkspaceDiff(added, removed, changed)
+
    def findall(self,ref):
       """
       experimental find-method that has some rudimentary support for globs.
@@ -215,6 +841,7 @@ class Workspace(object):
       if alreadyExists == False:
          package = autosar.package.Package(name,self)
          self.packages.append(package)
+         self._registerRef(package)
       if role is not None:
          self.setRole(package.ref, role)      
       return package
@@ -238,34 +865,64 @@ class Workspace(object):
    def root(self):
       return self
    
-   def saveXML(self,filename,packages=None,ignore=None):
+   def saveXML(self,filename,packages=None,ignore=None,processes=1):
+      """
+      Saves the workspace as ARXML. The file is first written to a temporary file, an existing file is only replaced once the
+      complete workspace has been written. When processes is not 1 the packages are written by a pool of worker processes
+      (processes=None uses one process per CPU), the file content is the same.
+      """
       writer=autosar.writer.WorkspaceWriter()
-      with open(filename, 'w', encoding="utf-8") as fp:
-         if isinstance(packages,str): packages=[packages]
-         if isinstance(ignore,str): ignore=[ignore]
-         writer.saveXML(self, fp, packages, ignore)
+      if isinstance(packages,str): packages=[packages]
+      if isinstance(ignore,str): ignore=[ignore]
+      _writeFile(filename, lambda fp: writer.saveXML(self, fp, packages, ignore, processes), "utf-8")
 
-   def toXML(self, packages=None, ignore=None):
+   def toXML(self, packages=None, ignore=None, processes=1):
       writer=autosar.writer.WorkspaceWriter()
       if isinstance(packages,str): packages=[packages]
       if isinstance(ignore,str): ignore=[ignore]
-      return writer.toXML(self, packages, ignore)
+      return writer.toXML(self, packages, ignore, processes)
+
+   def snapshot(self):
+      """
+      Returns the workspace as pickled bytes, used to hand the workspace over to worker processes (restore it using pickle.loads).
+      Deferred packages (see loadXML) are loaded first. The XML tree, parser and XML indexes are not included.
+      """
+      def loadPackage(package):
+         for subPackage in package.subPackages:
+            loadPackage(subPackage)
+      for package in self.packages:
+         loadPackage(package)
+      state = (self.xmlroot, self.packageParser, self.xmlIndexLoaders, self.reverseRefIndex)
+      self.xmlroot, self.packageParser, self.xmlIndexLoaders, self.reverseRefIndex = None, None, [], None
+      try:
+         return pickle.dumps(self, pickle.HIGHEST_PROTOCOL)
+      finally:
+         self.xmlroot, self.packageParser, self.xmlIndexLoaders, self.reverseRefIndex = state
 
    def append(self,elem):
       if isinstance(elem,autosar.package.Package):
          self.packages.append(elem)
          elem.parent=self
+         self._registerRef(elem)
       else:
          raise ValueError(type(elem))
    
-   def toJSON(self,packages=None,indent=3):
-      data=ws.asdict(packages)
-      return json.dumps(data,indent=indent)
+   def toJSON(self,packages=None,indent=3,compact=False):
+      fp = io.StringIO()
+      self._writeJSON(fp, packages, indent, compact)
+      return fp.getvalue()
       
-   def saveJSON(self,filename,packages=None,indent=3):
-      data=self.asdict(packages)
-      with open(filename,'w') as fp:
-         json.dump(data,fp,indent=indent)
+   def saveJSON(self,filename,packages=None,indent=3,compact=False):
+      """
+      Saves the workspace (the same data as returned by asdict) as JSON. The file is written one package element at a time.
+      When compact is True the JSON is written without indentation and whitespace.
+      """
+      _writeFile(filename, lambda fp: self._writeJSON(fp, packages, indent, compact))
+
+   def _writeJSON(self, fp, packages, indent, compact):
+      writer=autosar.writer.JSONWriter(indent, compact)
+      if isinstance(packages,str): packages=[packages]
+      writer.saveJSON(self, fp, packages)
          
    def toCode(self, packages=None, header=None):
       writer=autosar.writer.WorkspaceWriter()
@@ -311,20 +968,40 @@ class Workspace(object):
             if len(ref[2])>0:
                return pkg.delete(ref[2])
             else:
+               self._unregisterRef(pkg)
                del self.packages[i]
                break      
 
    def createAdminData(self, data):
       return autosar.base.createAdminData(data)
    
-   def fromDict(self, data):
-      for item in data:
-         if item['type'] == 'FileRef':
-            if os.path.isfile(item['path']):
-               roles = item.get('roles',None)
-               self.loadXML(item['path'],roles=roles)
-            else:
-               raise ValueError('invalid file path "%s"'%item['path'])
+   def fromDict(self, data, processes=1, cacheDir=None):
+      if processes == 1:
+         for item in data:
+            if item['type'] == 'FileRef':
+               if os.path.isfile(item['path']):
+                  roles = item.get('roles',None)
+                  self.loadXML(item['path'],roles=roles,cacheDir=cacheDir)
+               else:
+                  raise ValueError('invalid file path "%s"'%item['path'])
+      else:
+         filenames = []
+         roleList = []
+         for item in data:
+            if item['type'] == 'FileRef':
+               if os.path.isfile(item['path']):
+                  filenames.append(item['path'])
+                  roles = item.get('roles',None)
+                  if roles is not None:
+                     if not isinstance(roles, collections.abc.Mapping):
+                        raise ValueError('roles parameter must be a dictionary or Mapping')
+                     roleList.append(roles)
+               else:
+                  raise ValueError('invalid file path "%s"'%item['path'])
+         self.loadXMLFiles(filenames, processes, cacheDir)
+         for roles in roleList:
+            for ref,role in roles.items():
+               self.setRole(ref,role)
 
    def apply(self, template):      
       template.apply(self)
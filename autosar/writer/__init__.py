@@ -1 +1,2 @@
-from autosar.writer.workspace_writer import WorkspaceWriter
\ No newline at end of file
+from autosar.writer.workspace_writer import WorkspaceWriter
+from autosar.writer.json_writer import JSONWriter
\ No newline at end of file
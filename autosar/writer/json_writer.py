@@ -0,0 +1,197 @@
+import json
+import json.encoder
+import autosar.base
+import autosar.element
+import autosar.constant
+
+_unassigned = object()
+
+class JSONWriter(object):
+   """
+   Writes a workspace as JSON directly into a file object, one package element at a time.
+   The output contains the same data as json.dump(ws.asdict(packages), fp, indent=indent).
+   Classes using the generic asdict method of Element or Value are converted using a field list which is compiled once per class.
+   Objects left in the data returned by asdict (e.g. the parent of a record element) are written as their reference instead of failing.
+   When compact is True the JSON is written without indentation and whitespace.
+   Indented output is written by _encodeIndented instead of the (much slower) pure Python indenting encoder of the json module.
+   """
+   def __init__(self, indent=3, compact=False):
+      if compact:
+         indent = None
+         self.itemSeparator, self.keySeparator = ',', ':'
+      elif indent is None:
+         self.itemSeparator, self.keySeparator = ', ', ': '
+      else:
+         self.itemSeparator, self.keySeparator = ',', ': '
+      self.indent = indent
+      self.encoder = json.JSONEncoder(indent=indent, separators=(self.itemSeparator, self.keySeparator), default=self._default)
+      self.converters = {}
+      self.newlines = []
+
+   def saveJSON(self, ws, fp, packages=None):
+      packageList = [package for package in ws.packages if (packages is None) or (package.name in packages)]
+      fp.write('{')
+      fp.write(self._newline(1))
+      fp.write(self._key('type')+self.encoder.encode(ws.__class__.__name__)+self.itemSeparator)
+      fp.write(self._newline(1))
+      fp.write(self._key('packages'))
+      self._writeList(fp, packageList, self._writePackage, 1)
+      fp.write(self._newline(0)+'}')
+
+   def _writePackage(self, fp, package, level):
+      elements = [element for element in package.elements if hasattr(element, 'asdict')]
+      subPackages = package.subPackages
+      fp.write('{')
+      fp.write(self._newline(level+1)+self._key('type')+self.encoder.encode(package.__class__.__name__)+self.itemSeparator)
+      fp.write(self._newline(level+1)+self._key('name')+self.encoder.encode(package.name))
+      if len(elements) > 0:
+         fp.write(self.itemSeparator+self._newline(level+1)+self._key('elements'))
+         self._writeList(fp, elements, self._writeElement, level+1)
+      if len(subPackages) > 0:
+         fp.write(self.itemSeparator+self._newline(level+1)+self._key('subPackages'))
+         self._writeList(fp, subPackages, self._writePackage, level+1)
+      fp.write(self._newline(level)+'}')
+
+   def _writeElement(self, fp, element, level):
+      if self.indent is None:
+         fp.write(self.encoder.encode(self._convert(element)))
+      else:
+         chunks = []
+         self._encodeIndented(self._convert(element), level, chunks)
+         fp.write(''.join(chunks))
+
+   def _encodeIndented(self, value, level, chunks):
+      """
+      Appends the indented JSON text of value to chunks. The result is identical to json.dumps(value, indent=self.indent).
+      """
+      if isinstance(value, str):
+         chunks.append(json.encoder.encode_basestring_ascii(value))
+      elif value is None:
+         chunks.append('null')
+      elif value is True:
+         chunks.append('true')
+      elif value is False:
+         chunks.append('false')
+      elif isinstance(value, int):
+         chunks.append(int.__repr__(value))
+      elif isinstance(value, float):
+         chunks.append(_floatString(value))
+      elif isinstance(value, (list, tuple)):
+         if len(value) == 0:
+            chunks.append('[]')
+            return
+         newline = self._newline(level+1)
+         separator = self.itemSeparator+newline
+         chunks.append('['+newline)
+         for i,item in enumerate(value):
+            if i > 0:
+               chunks.append(separator)
+            self._encodeIndented(item, level+1, chunks)
+         chunks.append(self._newline(level)+']')
+      elif isinstance(value, dict):
+         if len(value) == 0:
+            chunks.append('{}')
+            return
+         newline = self._newline(level+1)
+         separator = self.itemSeparator+newline
+         chunks.append('{'+newline)
+         first = True
+         for key, item in value.items():
+            if not first:
+               chunks.append(separator)
+            first = False
+            chunks.append(json.encoder.encode_basestring_ascii(_keyString(key))+self.keySeparator)
+            self._encodeIndented(item, level+1, chunks)
+         chunks.append(self._newline(level)+'}')
+      else:
+         self._encodeIndented(self._default(value), level, chunks)
+
+   def _writeList(self, fp, items, writeItem, level):
+      if len(items) == 0:
+         fp.write('[]')
+         return
+      fp.write('[')
+      for i,item in enumerate(items):
+         if i > 0:
+            fp.write(self.itemSeparator)
+         fp.write(self._newline(level+1))
+         writeItem(fp, item, level+1)
+      fp.write(self._newline(level)+']')
+
+   def _key(self, name):
+      return self.encoder.encode(name)+self.keySeparator
+
+   def _newline(self, level):
+      if self.indent is None:
+         return ''
+      while len(self.newlines) <= level:
+         self.newlines.append('\n'+' '*(self.indent*len(self.newlines)))
+      return self.newlines[level]
+
+   def _default(self, obj):
+      """
+      Called by the encoder for objects returned as is by an asdict method. Objects with a reference (e.g. the parent of a record element)
+      are written as their reference string, other objects are converted into a dict.
+      """
+      if hasattr(obj, 'ref'):
+         return obj.ref
+      if hasattr(obj, '__dict__') or hasattr(obj, '__slots__'):
+         return self._convert(obj)
+      raise TypeError('%s is not JSON serializable'%obj.__class__.__name__)
+
+   def _convert(self, obj):
+      converter = self.converters.get(obj.__class__)
+      if converter is None:
+         converter = self._compile(obj.__class__)
+         self.converters[obj.__class__] = converter
+      return converter(obj)
+
+   def _compile(self, cls):
+      """
+      Returns a function converting an instance of cls into a dict.
+      Classes with their own asdict method use it, the generic asdict methods of Element and Value are replaced by a field list.
+      """
+      asdict = getattr(cls, 'asdict', None)
+      if (asdict is not None) and (asdict is not autosar.element.Element.asdict) and (asdict is not autosar.constant.Value.asdict):
+         return lambda obj: obj.asdict()
+      typeName = cls.__name__
+      names = [name for name in autosar.base.objectAttributeNames(cls) if name != 'parent']
+      isElement = (asdict is autosar.element.Element.asdict)
+      def convert(obj):
+         data = {'type': typeName}
+         items = [(name, getattr(obj, name, _unassigned)) for name in names]
+         if hasattr(obj, '__dict__'):
+            items.extend(item for item in obj.__dict__.items() if item[0] != 'parent')
+         for name, value in items:
+            if value is None:
+               if not isElement:
+                  data[name] = None #Value.asdict keeps None values, Element.asdict skips them
+            elif value is not _unassigned:
+               data[name] = self._convert(value) if isElement and hasattr(value, 'asdict') else value
+         return data
+      return convert
+
+def _floatString(value):
+   if value != value:
+      return 'NaN'
+   if value == json.encoder.INFINITY:
+      return 'Infinity'
+   if value == -json.encoder.INFINITY:
+      return '-Infinity'
+   return float.__repr__(value)
+
+def _keyString(key):
+   """converts a dict key the same way as the json module"""
+   if isinstance(key, str):
+      return key
+   if key is None:
+      return 'null'
+   if key is True:
+      return 'true'
+   if key is False:
+      return 'false'
+   if isinstance(key, int):
+      return int.__repr__(key)
+   if isinstance(key, float):
+      return _floatString(key)
+   raise TypeError('keys must be str, int, float, bool or None, not %s'%key.__class__.__name__)
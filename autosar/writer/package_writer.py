@@ -5,7 +5,7 @@ from autosar.writer.component_writer import ComponentTypeWriter
 from autosar.writer.behavior_writer import BehaviorWriter
 from autosar.writer.portinterface_writer import PortInterfaceWriter
 from autosar.writer.signal_writer import SignalWriter
-import collections
+import collections.abc
 import autosar.behavior
 import autosar.component
 
@@ -72,38 +72,56 @@ class PackageWriter(WriterBase):
          raise NotImplementedError("AUTOSAR version not yet supported")
    
    def toXML(self,package,ignore):      
-      lines=[]
-      lines.extend(self.beginPackage(package.name))
+      return list(self.iterXML(package,ignore))
+
+   def iterXML(self,package,ignore,indent=0):
+      """
+      Generator returning the XML lines of package one by one, each line is prefixed with indent levels of indentation.
+      """
+      prefix=self.indentChar*indent
+      for line in self.iterHeadXML(package,ignore,indent):
+         yield line
+      if len(package.subPackages)>0:
+         yield prefix+self.indent("<SUB-PACKAGES>",1)
+         for subPackage in package.subPackages:
+            for line in self.iterXML(subPackage,ignore,indent+2):
+               yield line
+         yield prefix+self.indent("</SUB-PACKAGES>",1)
+      for line in self.endPackage():
+         yield prefix+line
+
+   def iterHeadXML(self,package,ignore,indent=0):
+      """
+      Generator returning the XML lines of package up to (not including) its sub-packages: the package name and its elements.
+      """
+      prefix=self.indentChar*indent
+      for line in self.beginPackage(package.name):
+         yield prefix+line
       if len(package.elements)>0:
-         lines.append(self.indent("<ELEMENTS>",1))
+         yield prefix+self.indent("<ELEMENTS>",1)
+         elemPrefix=self.indentChar*(indent+2)
          for elem in package.elements:
             elemRef = elem.ref
-            ignoreElem=True if (isinstance(ignore, collections.Iterable) and elemRef in ignore) else False
+            ignoreElem=True if (isinstance(ignore, collections.abc.Iterable) and elemRef in ignore) else False
             #if SWC was ignored by user, also ignore its InternalBehavior and SwcImplementation elements in case they are in the same package
             if not ignoreElem and isinstance(elem, autosar.behavior.InternalBehavior):
-               if (isinstance(ignore, collections.Iterable) and elem.componentRef in ignore):
+               if (isinstance(ignore, collections.abc.Iterable) and elem.componentRef in ignore):
                   ignoreElem = True
             if not ignoreElem and isinstance(elem, autosar.component.SwcImplementation):
                behavior = package.rootWS().find(elem.behaviorRef)
                if behavior is not None:
-                  if (isinstance(ignore, collections.Iterable) and behavior.componentRef in ignore):
+                  if (isinstance(ignore, collections.abc.Iterable) and behavior.componentRef in ignore):
                      ignoreElem = True
             if not ignoreElem:            
                writerFunc = self.switcherXML.get(elem.__class__.__name__)
                if writerFunc is not None:            
-                  lines.extend(self.indent(writerFunc(elem,package),2))
+                  for line in writerFunc(elem,package):
+                     yield elemPrefix+line
                else:
                   print("skipped: %s"%str(type(elem)))
-         lines.append(self.indent("</ELEMENTS>",1))
+         yield prefix+self.indent("</ELEMENTS>",1)
       else:
-         lines.append(self.indent("<ELEMENTS/>",1))
-      if len(package.subPackages)>0:
-         lines.append(self.indent("<SUB-PACKAGES>",1))
-         for subPackage in package.subPackages:
-            lines.extend(self.indent(self.toXML(subPackage,ignore),2))
-         lines.append(self.indent("</SUB-PACKAGES>",1))
-      lines.extend(self.endPackage())
-      return lines
+         yield prefix+self.indent("<ELEMENTS/>",1)
    
    def toCode(self, package, ignore, localvars):
       lines=[]
@@ -119,15 +137,15 @@ class PackageWriter(WriterBase):
             lines.append('package.createSubPackage("%s")'%(subPackage.name))            
       for elem in package.elements:
          elemRef = elem.ref
-         ignoreElem=True if (isinstance(ignore, str) and ignore==elemRef) or (isinstance(ignore, collections.Iterable) and elemRef in ignore) else False
+         ignoreElem=True if (isinstance(ignore, str) and ignore==elemRef) or (isinstance(ignore, collections.abc.Iterable) and elemRef in ignore) else False
 
          #if SWC was ignored by user, also ignore its InternalBehavior and SwcImplementation elements in case they are in the same package
          if not ignoreElem and isinstance(elem, autosar.behavior.InternalBehavior):
-            if (isinstance(ignore, str) and ignore==elem.componentRef) or (isinstance(ignore, collections.Iterable) and elem.componentRef in ignore): ignoreElem = True
+            if (isinstance(ignore, str) and ignore==elem.componentRef) or (isinstance(ignore, collections.abc.Iterable) and elem.componentRef in ignore): ignoreElem = True
          if not ignoreElem and isinstance(elem, autosar.component.SwcImplementation):
             behavior = package.rootWS().find(elem.behaviorRef)
             if behavior is not None:
-               if (isinstance(ignore, str) and ignore==behavior.componentRef) or (isinstance(ignore, collections.Iterable) and behavior.componentRef in ignore): ignoreElem = True
+               if (isinstance(ignore, str) and ignore==behavior.componentRef) or (isinstance(ignore, collections.abc.Iterable) and behavior.componentRef in ignore): ignoreElem = True
          if not ignoreElem:
             writerFunc = self.switcherCode.get(elem.__class__.__name__)
             if writerFunc is not None:
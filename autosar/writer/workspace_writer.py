@@ -1,26 +1,84 @@
 from autosar.writer.writer_base import WriterBase
 from autosar.writer.package_writer import PackageWriter
 import collections
+import collections.abc
+import io
+import pickle
+import multiprocessing
 
 class WorkspaceWriter(WriterBase):
    def __init__(self,version=3):
       super().__init__(version)
       self.packageWriter=PackageWriter(self.version)
    
-   def saveXML(self, ws, fp, packages, ignore):
-      fp.write(self.toXML(ws,packages, ignore))
+   def saveXML(self, ws, fp, packages, ignore, processes=1):
+      """
+      Writes the workspace as XML directly into the file object fp, one line at a time.
+      When processes is not 1 the packages are written in parallel by a pool of worker processes (processes=None uses one process
+      per CPU). Each worker returns the XML of whole packages, packages with many elements in their sub-packages are split into one
+      task per sub-package. The results are written in order, the output is the same as when processes is 1.
+      Workers are forked from this process when the platform supports it, otherwise each worker receives a snapshot of the workspace
+      (see Workspace.snapshot).
+      """
+      for line in self.beginFile():
+         fp.write(line+'\n')
+      selected = [(i, package) for i,package in enumerate(ws.packages) if (packages is None) or (package.name in packages)]
+      workers = processes if processes is not None else multiprocessing.cpu_count()
+      tasks = None
+      if (workers > 1) and (len(selected) > 0):
+         tasks = self._createXMLTasks(selected, workers)
+      if (tasks is None) or (len([task for task in tasks if not isinstance(task, str)]) < 2):
+         for i,package in selected:
+            for line in self.packageWriter.iterXML(package,ignore,2):
+               fp.write(line+'\n')
+      else:
+         if 'fork' in multiprocessing.get_all_start_methods():
+            #forked workers share the workspace of this process, it does not need to be pickled
+            context, workspace = multiprocessing.get_context('fork'), ws
+         else:
+            context, workspace = multiprocessing, ws.snapshot()
+         pool = context.Pool(workers, _initXMLWorker, (workspace, self.version, ignore))
+         try:
+            results = pool.imap(_xmlWorker, [task for task in tasks if not isinstance(task, str)])
+            for task in tasks:
+               fp.write(task if isinstance(task, str) else next(results))
+         finally:
+            pool.terminate()
+      for line in self.endFile():
+         fp.write(line+'\n')
+
+   def _createXMLTasks(self, selected, workers):
+      """
+      Returns the list of parts of the XML, in order. A part is either a string (written as is) or a tuple (kind, path, indent)
+      rendered by _xmlWorker. path is the list of indices leading from ws.packages to the package.
+      """
+      sizes = {}
+      def subtreeSize(package):
+         size = len(package.elements)+sum([subtreeSize(subPackage) for subPackage in package.subPackages])
+         sizes[id(package)] = size
+         return size
+      total = sum([subtreeSize(package) for i,package in selected])
+      chunkSize = max(1, total//(workers*4))
+      tasks = []
+      def addPackage(package, path, indent):
+         if (sizes[id(package)] > chunkSize) and (len(package.subPackages) > 0):
+            prefix = self.indentChar*indent
+            tasks.append(('head', path, indent))
+            tasks.append(prefix+self.indent('<SUB-PACKAGES>',1)+'\n')
+            for i,subPackage in enumerate(package.subPackages):
+               addPackage(subPackage, path+[i], indent+2)
+            tasks.append(prefix+self.indent('</SUB-PACKAGES>',1)+'\n')
+            tasks.append(''.join([prefix+line+'\n' for line in self.endPackage()]))
+         else:
+            tasks.append(('package', path, indent))
+      for i,package in selected:
+         addPackage(package, [i], 2)
+      return tasks
 
-   def toXML(self, ws, packages, ignore):
-      lines=self.beginFile()
-      result='\n'.join(lines)+'\n'
-      for package in ws.packages:
-         if (packages is None) or (package.name in packages):
-            lines=self.packageWriter.toXML(package,ignore)
-            if len(lines)>0:
-               lines=self.indent(lines,2)
-               result+='\n'.join(lines)+'\n'
-      lines=self.endFile()
-      return result+'\n'.join(lines)+'\n'
+   def toXML(self, ws, packages, ignore, processes=1):
+      fp = io.StringIO()
+      self.saveXML(ws, fp, packages, ignore, processes)
+      return fp.getvalue()
    
    def toCode(self, ws, packages=None, ignore=None, head=None, tail=None, module=False, indent=3):
       localvars = collections.OrderedDict()
@@ -40,7 +98,7 @@ class WorkspaceWriter(WriterBase):
          
          #body
          for package in ws.packages:
-            if (isinstance(packages, collections.Iterable) and package.name in packages) or (isinstance(packages, str) and package.name==packages) or (packages is None):
+            if (isinstance(packages, collections.abc.Iterable) and package.name in packages) or (isinstance(packages, str) and package.name==packages) or (packages is None):
                lines=self.packageWriter.toCode(package, ignore, localvars)
                if len(lines)>0:
                   result+='\n'.join(lines)+'\n'
@@ -61,14 +119,14 @@ class WorkspaceWriter(WriterBase):
             ]
          if len(head)!=2:
             raise ValueError('when module=True then head must have exactly two elements (list of lists)')
-         if isinstance(head[0], collections.Iterable):
+         if isinstance(head[0], collections.abc.Iterable):
             head[0] = '\n'.join(head[0])
          assert(isinstance(head[0],str))
          result = head[0]+'\n\n'
          #body
          result+='def apply(ws):\n'
          for package in ws.packages:
-            if (isinstance(packages, collections.Iterable) and package.name in packages) or (isinstance(packages, str) and package.name==packages) or (packages is None):
+            if (isinstance(packages, collections.abc.Iterable) and package.name in packages) or (isinstance(packages, str) and package.name==packages) or (packages is None):
                lines=self.packageWriter.toCode(package, ignore, localvars)
                if len(lines)>0:
                   lines=[indentStr+x for x in lines]
@@ -76,7 +134,7 @@ class WorkspaceWriter(WriterBase):
          
          #tail
          result+="\nif __name__=='__main__':\n"
-         if isinstance(head[1], collections.Iterable):
+         if isinstance(head[1], collections.abc.Iterable):
             head[1] = '\n'.join([indentStr+x for x in head[1]])
          else:
             head[1] = '\n'.join([indentStr+x for x in head[1].split('\n')])
@@ -97,4 +155,25 @@ class WorkspaceWriter(WriterBase):
 
       
    def saveCode(self, ws, fp, packages=None, ignore=None, head=None, tail=None, module=False):
-      fp.write(self.toCode(ws, packages, ignore, head, tail, module))
\ No newline at end of file
+      fp.write(self.toCode(ws, packages, ignore, head, tail, module))
+
+_workerWorkspace = None
+_workerWriter = None
+_workerIgnore = None
+
+def _initXMLWorker(workspace, version, ignore):
+   global _workerWorkspace, _workerWriter, _workerIgnore
+   _workerWorkspace = pickle.loads(workspace) if isinstance(workspace, bytes) else workspace
+   _workerWriter = PackageWriter(version)
+   _workerIgnore = ignore
+
+def _xmlWorker(task):
+   (kind, path, indent) = task
+   package = _workerWorkspace.packages[path[0]]
+   for i in path[1:]:
+      package = package.subPackages[i]
+   if kind == 'head':
+      lines = _workerWriter.iterHeadXML(package, _workerIgnore, indent)
+   else:
+      lines = _workerWriter.iterXML(package, _workerIgnore, indent)
+   return ''.join([line+'\n' for line in lines])
@@ -0,0 +1,198 @@
+import xml.etree.ElementTree as ElementTree
+import xml.parsers.expat
+import gc
+import autosar.base
+try:
+   import lxml.etree as lxmlTree
+except ImportError:
+   lxmlTree = None
+
+class XMLBackend(object):
+   """
+   Base class of the XML parsers used to read ARXML files.
+   parse returns the tuple (xmlRoot, namespace) where xmlRoot is the root node of the document with the namespace removed from all tags.
+   Tags, short names and references are interned in stringPool (when it is not None and the backend supports it).
+   Subtrees with a tag found in skipTags (e.g. 'ADMIN-DATA') are left out of the returned tree.
+   elementFilter is an optional function called with the namespace of the document, returning the set of package element tags handled
+   by the parser (or None). Backends building the nodes themselves use it to skip the package elements the parser would ignore anyway.
+   The garbage collector is paused while the tree is built, the nodes do not contain reference cycles.
+   """
+   name = None
+
+   def parse(self, filename, stringPool=None, skipTags=None, elementFilter=None):
+      gcEnabled = gc.isenabled()
+      gc.disable()
+      try:
+         return self._parse(filename, stringPool, skipTags, elementFilter)
+      finally:
+         if gcEnabled:
+            gc.enable()
+
+   def _parse(self, filename, stringPool, skipTags, elementFilter):
+      raise NotImplementedError()
+
+class ElementTreeBackend(XMLBackend):
+   """
+   Parses the file using xml.etree.ElementTree from the standard library.
+   The complete tree is built, skipped subtrees are removed afterwards. elementFilter is not used.
+   """
+   name = 'etree'
+
+   def _parse(self, filename, stringPool, skipTags, elementFilter):
+      xmlRoot = autosar.base.parseXMLFile(filename)
+      namespace = autosar.base.getXMLNamespace(xmlRoot)
+      autosar.base.removeNamespace(xmlRoot, namespace, stringPool)
+      _removeNodes(xmlRoot, skipTags)
+      return xmlRoot, namespace
+
+class LxmlBackend(XMLBackend):
+   """
+   Parses the file using lxml (when it is installed).
+   Strings returned by lxml are created on each access, stringPool is therefore not used. elementFilter is not used.
+   """
+   name = 'lxml'
+
+   def _parse(self, filename, stringPool, skipTags, elementFilter):
+      parser = lxmlTree.XMLParser(remove_comments=True, remove_pis=True, huge_tree=True)
+      xmlRoot = lxmlTree.parse(filename, parser).getroot()
+      namespace = autosar.base.getXMLNamespace(xmlRoot)
+      if skipTags:
+         #strip_elements removes the subtrees without visiting them in Python
+         prefix = '' if namespace is None else '{%s}'%namespace
+         lxmlTree.strip_elements(xmlRoot, *[prefix+tag for tag in skipTags], with_tail=False)
+      autosar.base.removeNamespace(xmlRoot, namespace)
+      return xmlRoot, namespace
+
+class ExpatBackend(XMLBackend):
+   """
+   Parses the file using the expat parser of the standard library and builds the ElementTree nodes itself.
+   Namespaces are removed and strings are interned while the nodes are created. Skipped subtrees are never built, package elements
+   with a tag not returned by elementFilter are built as empty nodes (the parser still reports the unhandled ones).
+   Text found after the end tag of a node (its tail) is not stored.
+   """
+   name = 'expat'
+
+   def _parse(self, filename, stringPool, skipTags, elementFilter):
+      builder = _ExpatTreeBuilder(stringPool, skipTags, elementFilter)
+      parser = xml.parsers.expat.ParserCreate(namespace_separator='}')
+      parser.buffer_text = True
+      parser.StartElementHandler = builder.start
+      parser.EndElementHandler = builder.end
+      parser.CharacterDataHandler = builder.data
+      with open(filename, 'rb') as fp:
+         parser.ParseFile(fp)
+      return builder.root, builder.namespace
+
+class _ExpatTreeBuilder(object):
+   def __init__(self, stringPool, skipTags, elementFilter):
+      self.stringPool = stringPool
+      self.skipTags = frozenset() if skipTags is None else frozenset(skipTags)
+      self.elementFilter = elementFilter
+      self.elementTags = None
+      self.root = None
+      self.namespace = None
+      self.stack = []
+      self.current = None #node receiving character data, None after the start tag of a child or the end tag of the node
+      self.skipDepth = 0
+      self.names = {} #maps expat names ('namespace}tag') to tags
+      self.internTags = set() #tags of nodes with interned text (same rule as StringPool.internNode)
+
+   def _tag(self, name):
+      tag = self.names.get(name)
+      if tag is None:
+         uri, separator, localName = name.rpartition('}')
+         if len(separator) == 0:
+            tag = name
+         elif uri == self.namespace:
+            tag = localName
+         else:
+            tag = '{%s}%s'%(uri, localName)
+         if self.stringPool is not None:
+            tag = self.stringPool.intern(tag)
+            if tag == 'SHORT-NAME' or tag.endswith('REF'):
+               self.internTags.add(tag)
+         self.names[name] = tag
+      return tag
+
+   def start(self, name, attrib):
+      if self.skipDepth > 0:
+         self.skipDepth += 1
+         return
+      stack = self.stack
+      if len(stack) == 0:
+         uri, separator, localName = name.rpartition('}')
+         self.namespace = uri if len(separator) > 0 else None
+         if self.elementFilter is not None:
+            self.elementTags = self.elementFilter(self.namespace)
+      tag = self.names.get(name)
+      if tag is None:
+         tag = self._tag(name)
+      if tag in self.skipTags:
+         self.current = None
+         self.skipDepth = 1
+         return
+      if (self.elementTags is not None) and (len(stack) > 1) and (stack[-1].tag == 'ELEMENTS') and \
+         (stack[-2].tag == 'AR-PACKAGE') and (tag not in self.elementTags):
+         #package element ignored by the parser: only an empty node is built
+         ElementTree.SubElement(stack[-1], tag)
+         self.current = None
+         self.skipDepth = 1
+         return
+      if attrib:
+         attrib = {self._tag(key): value for key, value in attrib.items()}
+      if len(stack) == 0:
+         xmlElem = ElementTree.Element(tag, attrib)
+         self.root = xmlElem
+      else:
+         xmlElem = ElementTree.SubElement(stack[-1], tag, attrib)
+      stack.append(xmlElem)
+      self.current = xmlElem
+
+   def end(self, name):
+      if self.skipDepth > 0:
+         self.skipDepth -= 1
+         return
+      xmlElem = self.stack.pop()
+      self.current = None
+      if (xmlElem.tag in self.internTags) and (xmlElem.text is not None):
+         xmlElem.text = self.stringPool.strings.setdefault(xmlElem.text, xmlElem.text)
+
+   def data(self, text):
+      xmlElem = self.current
+      if xmlElem is not None:
+         if xmlElem.text is None:
+            xmlElem.text = text
+         else:
+            xmlElem.text += text
+
+def _removeNodes(xmlRoot, skipTags):
+   """removes the subtrees with a tag in skipTags from the tree"""
+   if skipTags:
+      skipTags = frozenset(skipTags)
+      stack = [xmlRoot]
+      while len(stack) > 0:
+         xmlElem = stack.pop()
+         for xmlChild in list(xmlElem):
+            if xmlChild.tag in skipTags:
+               xmlElem.remove(xmlChild)
+            else:
+               stack.append(xmlChild)
+
+_backends = {'etree': ElementTreeBackend, 'lxml': LxmlBackend, 'expat': ExpatBackend}
+
+def getXMLBackend(name=None):
+   """
+   Returns an XMLBackend instance by name ('etree', 'lxml' or 'expat').
+   None returns the default backend: lxml when it is installed, xml.etree.ElementTree otherwise. 'lxml' returns the ElementTree backend
+   when lxml is not installed. Instances of XMLBackend are returned as is.
+   """
+   if isinstance(name, XMLBackend):
+      return name
+   if name is None:
+      name = 'etree' if lxmlTree is None else 'lxml'
+   elif name == 'lxml' and lxmlTree is None:
+      name = 'etree'
+   backend = _backends.get(name)
+   if backend is None:
+      raise ValueError('unknown XML backend: %s'%str(name))
+   return backend()
@@ -0,0 +1,209 @@
+import mmap
+import re
+import xml.etree.ElementTree as ElementTree
+import autosar.package
+
+#matches comments, processing instructions, CDATA sections and tags (groups: closing slash, tag, attributes, self-closing slash)
+_tagPattern = re.compile(br'<!--.*?-->|<\?.*?\?>|<!\[CDATA\[.*?\]\]>|<!DOCTYPE[^>]*>|'
+                         br'<(/?)([^\s/>]+)((?:[^>"\']|"[^"]*"|\'[^\']*\')*?)(/?)>', re.S)
+_namespacePattern = re.compile(br'\sxmlns\s*=\s*["\']([^"\']*)["\']')
+_sliceHeader = b'<AR-INDEX-SLICE xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+_sliceFooter = b'</AR-INDEX-SLICE>'
+
+class XMLIndex(object):
+   """
+   Byte offset index of the packages and package elements of a memory mapped ARXML file.
+   The file is scanned once. Only the package structure is visited, the content of each package element is skipped by
+   searching for its end tag.
+   packages maps package references to tuples (start, end, elementRefs, subPackageRefs), topLevelPackages lists the references
+   of the top-level packages. elements maps element references to tuples (packageRef, name, tag, start, end).
+   The file must be encoded in UTF-8 and use a default namespace (tags without prefix), as ARXML files do.
+   """
+   def __init__(self, filename):
+      self.filename = filename
+      self.namespace = None
+      self.packages = {}
+      self.topLevelPackages = []
+      self.elements = {}
+      self.endPatterns = {}
+      with open(filename, 'rb') as fp:
+         self.data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+      self._scan()
+
+   @property
+   def closed(self):
+      return self.data.closed
+
+   def close(self):
+      """closes the memory map of the file, parseElement cannot be used afterwards"""
+      self.data.close()
+
+   def _scan(self):
+      data = self.data
+      stack = [] #tags of the open XML nodes
+      packageStack = [] #list of [ref, start, elementRefs, subPackageRefs]
+      pos = 0
+      while True:
+         match = _tagPattern.search(data, pos)
+         if match is None:
+            break
+         pos = match.end()
+         tag = match.group(2)
+         if tag is None:
+            continue #comment, processing instruction etc.
+         if match.group(1):
+            stack.pop()
+            if tag == b'AR-PACKAGE':
+               entry = packageStack.pop()
+               if entry[0] is not None:
+                  self.packages[entry[0]] = (entry[1], pos, entry[2], entry[3])
+            continue
+         if match.group(4):
+            continue
+         if len(stack) == 0:
+            if b':' in tag:
+               raise NotImplementedError('namespace prefixes are not supported')
+            namespace = _namespacePattern.search(match.group(3))
+            self.namespace = None if namespace is None else namespace.group(1).decode('utf-8')
+         elif tag == b'SHORT-NAME':
+            end = data.find(b'</SHORT-NAME>', pos)
+            if stack[-1] == b'AR-PACKAGE':
+               name = data[pos:end].decode('utf-8')
+               package = packageStack[-1]
+               parentRef = packageStack[-2][0] if len(packageStack) > 1 else ''
+               if package[0] is None and parentRef is not None:
+                  package[0] = parentRef+'/'+name
+                  if len(packageStack) > 1:
+                     packageStack[-2][3].append(package[0])
+                  else:
+                     self.topLevelPackages.append(package[0])
+            pos = end+len(b'</SHORT-NAME>')
+            continue
+         elif (stack[-1] == b'ELEMENTS') and (len(stack) > 1) and (stack[-2] == b'AR-PACKAGE'):
+            pos = self._addElement(packageStack[-1], tag, match.start(), pos)
+            continue
+         if tag == b'AR-PACKAGE':
+            packageStack.append([None, match.start(), [], []])
+         stack.append(tag)
+
+   def _addElement(self, package, tag, start, pos):
+      """adds the package element starting at start to the index, returns the position after its end tag"""
+      pattern = self.endPatterns.get(tag)
+      if pattern is None:
+         #comments and CDATA sections are matched as well, so that tags found inside them are skipped
+         pattern = re.compile(br'<!--.*?-->|<!\[CDATA\[.*?\]\]>|<(/?)'+re.escape(tag)+br'(?:\s(?:[^>"\']|"[^"]*"|\'[^\']*\')*?)?(/?)>',
+                              re.S)
+         self.endPatterns[tag] = pattern
+      depth = 1
+      while depth > 0:
+         match = pattern.search(self.data, pos)
+         if match is None:
+            raise ValueError('%s: end tag of %s not found'%(self.filename, tag.decode('utf-8')))
+         pos = match.end()
+         if match.group(1) is None:
+            continue #comment or CDATA section
+         if match.group(1):
+            depth -= 1
+         elif not match.group(2):
+            depth += 1
+      nameStart = self.data.find(b'<SHORT-NAME>', start, pos)
+      if (nameStart >= 0) and (package[0] is not None):
+         nameStart += len(b'<SHORT-NAME>')
+         name = self.data[nameStart:self.data.find(b'</SHORT-NAME>', nameStart, pos)].decode('utf-8')
+         ref = package[0]+'/'+name
+         if ref not in self.elements:
+            self.elements[ref] = (package[0], name, tag.decode('utf-8'), start, pos)
+            package[2].append(ref)
+      return pos
+
+   def parseElement(self, ref, stringPool=None):
+      """
+      Parses the XML of the package element ref and returns its root node. Returns None when ref is not a package element in the index.
+      """
+      entry = self.elements.get(ref)
+      if entry is None:
+         return None
+      xmlSlice = ElementTree.fromstring(_sliceHeader+self.data[entry[3]:entry[4]]+_sliceFooter)
+      xmlElem = xmlSlice[0]
+      if stringPool is not None:
+         for xmlNode in xmlElem.iter():
+            stringPool.internNode(xmlNode)
+      return xmlElem
+
+class IndexedPackageLoader(object):
+   """
+   Loads package elements from the byte slices of an XMLIndex, using the parse functions of parser (a PackageParser).
+   Instances are stored in the deferred XML list of each package (see Package._deferXML).
+   The index is closed (and the loader removed from the workspace) once the elements of all its packages have been loaded.
+   """
+   def __init__(self, index, parser):
+      self.index = index
+      self.parser = parser
+      self.elementOffsets = {} #maps package references to the number of elements the package contained before the index was loaded
+      self.pendingPackages = set() #references of the packages whose elements have not all been loaded yet
+
+   def loadXML(self, package, packageRef, lazy=True):
+      """loads all elements of the package packageRef (that were not loaded already) into package"""
+      elementNames = set(package.map['elements'].keys())
+      offset = self.elementOffsets.get(packageRef, 0)
+      loaded = len(package.elements) > offset
+      for ref in self.index.packages[packageRef][2]:
+         if self.index.elements[ref][1] not in elementNames:
+            self._loadElement(package, ref, elementNames)
+      if loaded:
+         #elements found using Workspace.find were loaded first, restore the order of the file
+         positions = {self.index.elements[ref][1]: i for i, ref in enumerate(self.index.packages[packageRef][2])}
+         package.elements[offset:] = sorted(package.elements[offset:], key=lambda elem: positions.get(elem.name, len(positions)))
+      self.pendingPackages.discard(packageRef)
+      if len(self.pendingPackages) == 0:
+         self.close()
+
+   def close(self):
+      """closes the index and removes this loader from the workspace"""
+      ws = self.parser.rootProject
+      if (ws is not None) and (self in ws.xmlIndexLoaders):
+         ws.xmlIndexLoaders.remove(self)
+      self.index.close()
+
+   def loadElement(self, package, ref):
+      """loads the package element ref into package, without loading the other elements of the package"""
+      deferredXML = package._deferredXML
+      package._deferredXML = None
+      try:
+         self._loadElement(package, ref, set(package.map['elements'].keys()))
+      finally:
+         package._deferredXML = deferredXML
+
+   def _loadElement(self, package, ref, elementNames):
+      packageRef, name, tag, start, end = self.index.elements[ref]
+      parser = self.parser
+      if parser.switcher is None:
+         parser.switcher = parser._createSwitcher()
+      if (parser.elementFilter is not None) and not (parser.elementFilter.matchTag(tag) and parser.elementFilter.matchRef(ref)):
+         return
+      ws = parser.rootProject
+      xmlElem = self.index.parseElement(ref, None if ws is None else ws.stringPool)
+      parser._loadElement(package, xmlElem, elementNames, packageRef)
+
+   def createPackages(self, package, packageRef):
+      """
+      Creates the sub-packages of package packageRef in package (and registers them in the workspace).
+      The package elements are loaded the first time the content of a package is accessed.
+      """
+      ws = self.parser.rootProject
+      for subPackageRef in self.index.packages[packageRef][3]:
+         name = subPackageRef.rpartition('/')[2]
+         subPackage = None
+         for item in package.subPackages:
+            if item.name == name:
+               subPackage = item
+         if subPackage is None:
+            subPackage = autosar.package.Package(name)
+            package.subPackages.append(subPackage)
+            subPackage.parent = package
+            if ws is not None:
+               ws._registerRef(subPackage)
+         self.createPackages(subPackage, subPackageRef)
+      self.elementOffsets[packageRef] = len(package.elements)
+      self.pendingPackages.add(packageRef)
+      package._deferXML(self, packageRef)
@@ -0,0 +1,4 @@
+"""
+Benchmarks of the AUTOSAR toolkit using synthetic models of configurable size.
+Run using: python -m benchmark.run --help
+"""
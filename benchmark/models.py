@@ -0,0 +1,183 @@
+"""
+Synthetic AUTOSAR models used by the benchmarks.
+"""
+import autosar
+from xml.sax.saxutils import escape
+
+class ModelSize(object):
+   """
+   Size knobs of a synthetic model.
+   numDataTypes: number of integer data types (a few enumeration, physical, record and array types are always added)
+   numPortInterfaces: number of port interfaces (every tenth is a client-server interface, the rest are sender-receiver interfaces)
+   numComponents: number of application software components
+   portsPerComponent: number of sender-receiver ports on each component
+   runnablesPerComponent: number of cyclic runnables on each component
+   numCompositions: number of compositions, components are distributed evenly over the compositions
+   """
+   def __init__(self, numDataTypes=100, numPortInterfaces=50, numComponents=20, portsPerComponent=10, runnablesPerComponent=2, numCompositions=2):
+      self.numDataTypes = max(numDataTypes, 1)
+      self.numPortInterfaces = max(numPortInterfaces, 1)
+      self.numComponents = max(numComponents, 1)
+      self.portsPerComponent = max(portsPerComponent, 1)
+      self.runnablesPerComponent = max(runnablesPerComponent, 1)
+      self.numCompositions = max(numCompositions, 0)
+
+   @property
+   def numClientServerInterfaces(self):
+      return self.numPortInterfaces // 10
+
+   @property
+   def numSenderReceiverInterfaces(self):
+      return max(self.numPortInterfaces - self.numClientServerInterfaces, 1)
+
+   def asdict(self):
+      return {'numDataTypes': self.numDataTypes, 'numPortInterfaces': self.numPortInterfaces, 'numComponents': self.numComponents,
+              'portsPerComponent': self.portsPerComponent, 'runnablesPerComponent': self.runnablesPerComponent,
+              'numCompositions': self.numCompositions}
+
+def _dataTypeName(i):
+   return 'U%d_T'%i
+
+def _senderReceiverPortIndices(size, k):
+   """
+   Returns the sender-receiver interface indices used by component k.
+   Components 2j and 2j+1 use the same interfaces, 2j provides them and 2j+1 requires them.
+   """
+   first = (k//2)*size.portsPerComponent
+   return [(first+i) % size.numSenderReceiverInterfaces for i in range(size.portsPerComponent)]
+
+def createWorkspace3(size):
+   """
+   Creates an AUTOSAR 3.x workspace of the given ModelSize.
+   Returns the workspace and the list of created application software components.
+   """
+   ws = autosar.workspace()
+   dataTypes = ws.getDataTypePackage()
+   for i in range(size.numDataTypes):
+      dataTypes.createIntegerDataType(_dataTypeName(i), min=0, max=255+i)
+   dataTypes.createIntegerDataType('Enum_T', valueTable=['Enum_Off', 'Enum_On', 'Enum_Error', 'Enum_NotAvailable'])
+   dataTypes.createIntegerDataType('Phys_T', min=0, max=65535, offset=0, scaling=0.125, unit='km')
+   typeRef = lambda name: dataTypes.ref+'/'+name
+   dataTypes.createRecordDataType('Rec_T', [('a', typeRef(_dataTypeName(0))), ('b', typeRef('Enum_T')), ('c', typeRef('Phys_T'))])
+   dataTypes.createArrayDataType('Arr_T', typeRef(_dataTypeName(0)), 8)
+   constants = ws.getConstantPackage()
+   portInterfaces = ws.getPortInterfacePackage()
+   for i in range(size.numSenderReceiverInterfaces):
+      typeName = _dataTypeName(i % size.numDataTypes)
+      constants.createConstant('C_SR%d_IV'%i, typeName, i % 256)
+      portInterfaces.createSenderReceiverInterface('SR%d_I'%i, autosar.DataElement('D%d'%i, typeName))
+   constants.createConstant('C_Rec_IV', 'Rec_T', {'a': 0, 'b': 3, 'c': 65535})
+   for i in range(size.numClientServerInterfaces):
+      portInterface = portInterfaces.createClientServerInterface('CS%d_I'%i, ['Get', 'Set'], autosar.ApplicationError('E_NOT_OK', 1))
+      portInterface['Get'].createOutArgument('value', 'Rec_T')
+      portInterface['Set'].createInArgument('value', _dataTypeName(i % size.numDataTypes))
+   componentTypes = ws.getComponentTypePackage()
+   components = []
+   for k in range(size.numComponents):
+      swc = componentTypes.createApplicationSoftwareComponent('Swc%d'%k)
+      portAccess = []
+      for i in _senderReceiverPortIndices(size, k):
+         portName = 'SR%d'%i
+         if k % 2 == 0:
+            swc.createProvidePort(portName, 'SR%d_I'%i, initValueRef='C_SR%d_IV'%i)
+         else:
+            swc.createRequirePort(portName, 'SR%d_I'%i, initValueRef='C_SR%d_IV'%i)
+         portAccess.append(portName)
+      if size.numClientServerInterfaces > 0:
+         csIndex = (k//4) % size.numClientServerInterfaces
+         if k % 4 == 0:
+            swc.createProvidePort('Srv', 'CS%d_I'%csIndex)
+         else:
+            swc.createRequirePort('Cli', 'CS%d_I'%csIndex)
+            portAccess.extend(['Cli/Get', 'Cli/Set'])
+      swc.behavior.createRunnable('Swc%d_Init'%k)
+      for j in range(size.runnablesPerComponent):
+         runnableName = 'Swc%d_Run%d'%(k, j)
+         swc.behavior.createRunnable(runnableName, portAccess=portAccess)
+         swc.behavior.createTimerEvent(runnableName, 10*(j+1))
+      if (size.numClientServerInterfaces > 0) and (k % 4 == 0):
+         for operationName in ['Get', 'Set']:
+            runnableName = 'Swc%d_%s'%(k, operationName)
+            swc.behavior.createRunnable(runnableName)
+            swc.behavior.createOperationInvokedEvent(runnableName, 'Srv/%s'%operationName)
+      components.append(swc)
+   if size.numCompositions > 0:
+      perComposition = -(-size.numComponents // size.numCompositions)
+      for c in range(size.numCompositions):
+         members = range(c*perComposition, min((c+1)*perComposition, size.numComponents))
+         if len(members) == 0:
+            break
+         composition = componentTypes.createCompositionComponent('Composition%d'%c)
+         for k in members:
+            composition.createComponentRef('Swc%d'%k)
+         for k in members:
+            if (k % 2 == 0) and (k+1 in members):
+               for i in _senderReceiverPortIndices(size, k):
+                  composition.createConnector('Swc%d/SR%d'%(k, i), 'Swc%d/SR%d'%(k+1, i))
+   return ws, components
+
+def saveWorkspace4(filename, size):
+   """
+   Writes an AUTOSAR 4.x ARXML file of the given ModelSize.
+   The XML writer only supports AUTOSAR 3.x, the 4.x model is therefore written directly. It only contains the elements
+   supported by the AUTOSAR 4.x parser (application software components with ports, internal behavior and implementation).
+   """
+   with open(filename, 'w') as fh:
+      for line in _iterWorkspace4(size):
+         fh.write(line+'\n')
+
+def _iterWorkspace4(size):
+   yield '<?xml version="1.0" encoding="UTF-8"?>'
+   yield '<AUTOSAR xmlns="http://autosar.org/schema/r4.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+   yield '  <AR-PACKAGES>'
+   yield '    <AR-PACKAGE>'
+   yield '      <SHORT-NAME>ComponentType</SHORT-NAME>'
+   yield '      <ELEMENTS>'
+   for k in range(size.numComponents):
+      name = escape('Swc%d'%k)
+      behaviorName = name+'_InternalBehavior'
+      yield '        <APPLICATION-SW-COMPONENT-TYPE>'
+      yield '          <SHORT-NAME>%s</SHORT-NAME>'%name
+      yield '          <PORTS>'
+      for i in _senderReceiverPortIndices(size, k):
+         if k % 2 == 0:
+            yield '            <P-PORT-PROTOTYPE>'
+            yield '              <SHORT-NAME>SR%d</SHORT-NAME>'%i
+            yield '              <PROVIDED-INTERFACE-TREF DEST="SENDER-RECEIVER-INTERFACE">/PortInterface/SR%d_I</PROVIDED-INTERFACE-TREF>'%i
+            yield '            </P-PORT-PROTOTYPE>'
+         else:
+            yield '            <R-PORT-PROTOTYPE>'
+            yield '              <SHORT-NAME>SR%d</SHORT-NAME>'%i
+            yield '              <REQUIRED-INTERFACE-TREF DEST="SENDER-RECEIVER-INTERFACE">/PortInterface/SR%d_I</REQUIRED-INTERFACE-TREF>'%i
+            yield '            </R-PORT-PROTOTYPE>'
+      yield '          </PORTS>'
+      yield '          <INTERNAL-BEHAVIORS>'
+      yield '            <SWC-INTERNAL-BEHAVIOR>'
+      yield '              <SHORT-NAME>%s</SHORT-NAME>'%behaviorName
+      yield '              <EVENTS>'
+      for j in range(size.runnablesPerComponent):
+         yield '                <TIMING-EVENT>'
+         yield '                  <SHORT-NAME>TMT_%s_Run%d</SHORT-NAME>'%(name, j)
+         yield '                  <START-ON-EVENT-REF DEST="RUNNABLE-ENTITY">/ComponentType/%s/%s/%s_Run%d</START-ON-EVENT-REF>'%(name, behaviorName, name, j)
+         yield '                  <PERIOD>%s</PERIOD>'%repr(0.01*(j+1))
+         yield '                </TIMING-EVENT>'
+      yield '              </EVENTS>'
+      yield '              <RUNNABLES>'
+      for j in range(size.runnablesPerComponent):
+         yield '                <RUNNABLE-ENTITY>'
+         yield '                  <SHORT-NAME>%s_Run%d</SHORT-NAME>'%(name, j)
+         yield '                  <CAN-BE-INVOKED-CONCURRENTLY>false</CAN-BE-INVOKED-CONCURRENTLY>'
+         yield '                  <SYMBOL>%s_Run%d</SYMBOL>'%(name, j)
+         yield '                </RUNNABLE-ENTITY>'
+      yield '              </RUNNABLES>'
+      yield '            </SWC-INTERNAL-BEHAVIOR>'
+      yield '          </INTERNAL-BEHAVIORS>'
+      yield '        </APPLICATION-SW-COMPONENT-TYPE>'
+      yield '        <SWC-IMPLEMENTATION>'
+      yield '          <SHORT-NAME>%s_Implementation</SHORT-NAME>'%name
+      yield '          <BEHAVIOR-REF DEST="SWC-INTERNAL-BEHAVIOR">/ComponentType/%s/%s</BEHAVIOR-REF>'%(name, behaviorName)
+      yield '        </SWC-IMPLEMENTATION>'
+   yield '      </ELEMENTS>'
+   yield '    </AR-PACKAGE>'
+   yield '  </AR-PACKAGES>'
+   yield '</AUTOSAR>'
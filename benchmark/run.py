@@ -0,0 +1,203 @@
+"""
+Runs the benchmarks and writes the results as JSON.
+
+usage: python -m benchmark.run [--components K] [--datatypes N] [--interfaces M] ... [-o result.json]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import autosar
+import autosar.rte
+from benchmark.models import ModelSize, createWorkspace3, saveWorkspace4
+
+_defaultTimer = getattr(time, 'perf_counter', time.time)
+
+class BenchmarkRunner(object):
+   """
+   Runs each benchmark function repeat times and keeps the best and mean execution time.
+   A benchmark raising an exception is reported with its error message instead of aborting the run.
+   """
+   def __init__(self, repeat=3, timer=_defaultTimer, verbose=False):
+      self.repeat = max(repeat, 1)
+      self.timer = timer
+      self.verbose = verbose
+      self.results = {}
+
+   def run(self, name, func, *args, **kwargs):
+      times = []
+      result = None
+      try:
+         for i in range(self.repeat):
+            begin = self.timer()
+            result = func(*args, **kwargs)
+            times.append(self.timer() - begin)
+      except Exception as e:
+         self.results[name] = {'error': '%s: %s'%(e.__class__.__name__, str(e))}
+         if self.verbose:
+            print('%-32s error (%s)'%(name, self.results[name]['error']))
+         return None
+      self.results[name] = {'best': min(times), 'mean': sum(times)/len(times), 'repeat': len(times)}
+      if self.verbose:
+         print('%-32s %10.6f s'%(name, min(times)))
+      return result
+
+   def annotate(self, name, **kwargs):
+      """adds extra information to the result of benchmark name"""
+      self.results.setdefault(name, {}).update(kwargs)
+
+def _collectRefs(ws):
+   refs = []
+   def visit(item):
+      if not hasattr(item, 'ref'):
+         return
+      refs.append(item.ref)
+      for child in getattr(item, 'elements', []):
+         visit(child)
+      for child in getattr(item, 'subPackages', []):
+         visit(child)
+   for package in ws.packages:
+      visit(package)
+   return refs
+
+def _findAll(ws, refs, loops):
+   for i in range(loops):
+      for ref in refs:
+         ws.find(ref)
+
+def _findRoles(ws, names, loops):
+   for i in range(loops):
+      for name in names:
+         ws.find(name, role='DataType')
+
+def _loadXML(filename, **kwargs):
+   ws = autosar.workspace()
+   ws.loadXML(filename, **kwargs)
+   return ws
+
+def _writeFileRefs(filename, arxmlFiles):
+   """writes the JSON file list read by Workspace.loadJSON (paths are relative to the JSON file)"""
+   basedir = os.path.dirname(filename)
+   data = [{'type': 'fileRef', 'path': os.path.relpath(arxmlFile, basedir)} for arxmlFile in arxmlFiles]
+   with open(filename, 'w') as fp:
+      json.dump(data, fp, indent=2)
+
+def _loadJSON(filename):
+   ws = autosar.workspace()
+   ws.loadJSON(filename)
+   return ws
+
+def _createPartition(components):
+   partition = autosar.rte.Partition()
+   for swc in components:
+      partition.addComponent(swc)
+   partition.finalize()
+   return partition
+
+def _generateRte(components, outputDir):
+   partition = _createPartition(components)
+   autosar.rte.TypeGenerator(partition).generate(os.path.join(outputDir, 'Rte_Type.h'))
+   autosar.rte.RteGenerator(partition).generate(os.path.join(outputDir, 'Rte.c'))
+   autosar.rte.ComponentHeaderGenerator(partition).generate(outputDir)
+
+def runAutosar3(runner, size, workDir, findLoops):
+   """benchmarks of the AUTOSAR 3.x workspace (model creation, XML, JSON, code and RTE generation)"""
+   ws, components = runner.run('3.x/create', createWorkspace3, size) or (None, None)
+   if ws is None:
+      return
+   arxmlFile = os.path.join(workDir, 'model3.arxml')
+   runner.run('3.x/toXML', ws.toXML)
+   runner.run('3.x/saveXML', ws.saveXML, arxmlFile)
+   runner.run('3.x/saveXML(parallel)', ws.saveXML, os.path.join(workDir, 'model3_parallel.arxml'), processes=None)
+   runner.run('3.x/toCode', ws.toCode, [package.name for package in ws.packages])
+   jsonFile = os.path.join(workDir, 'model3.json')
+   runner.run('3.x/asdict', ws.asdict)
+   runner.run('3.x/saveJSON', ws.saveJSON, jsonFile)
+   if not os.path.isfile(arxmlFile):
+      return
+   fileRefFile = os.path.join(workDir, 'model3_files.json')
+   _writeFileRefs(fileRefFile, [arxmlFile])
+   runner.run('3.x/loadJSON', _loadJSON, fileRefFile)
+   runner.run('3.x/loadXML', _loadXML, arxmlFile)
+   runner.run('3.x/loadXML(streaming)', _loadXML, arxmlFile, streaming=True)
+   runner.run('3.x/loadXML(lazy)', _loadXML, arxmlFile, lazy=True)
+   runner.run('3.x/loadXML(expat)', _loadXML, arxmlFile, xmlBackend='expat')
+   runner.run('3.x/loadXML(indexed)', _loadXML, arxmlFile, indexed=True)
+   loaded = _loadXML(arxmlFile)
+   refs = _collectRefs(loaded)
+   runner.run('3.x/find', _findAll, loaded, refs, findLoops)
+   runner.annotate('3.x/find', refs=len(refs), loops=findLoops)
+   typeNames = [dataType.name for dataType in loaded.find('/DataType').elements]
+   runner.run('3.x/find(role)', _findRoles, loaded, typeNames, findLoops)
+   runner.annotate('3.x/find(role)', names=len(typeNames), loops=findLoops)
+   rteDir = os.path.join(workDir, 'rte')
+   if not os.path.isdir(rteDir):
+      os.makedirs(rteDir)
+   partition = runner.run('3.x/rte/partition', _createPartition, components)
+   if partition is not None:
+      runner.run('3.x/rte/TypeGenerator', autosar.rte.TypeGenerator(partition).generate, os.path.join(rteDir, 'Rte_Type.h'))
+      runner.run('3.x/rte/RteGenerator', autosar.rte.RteGenerator(partition).generate, os.path.join(rteDir, 'Rte.c'))
+      runner.run('3.x/rte/ComponentHeaderGenerator', autosar.rte.ComponentHeaderGenerator(partition).generate, rteDir)
+      runner.run('3.x/rte/ComponentHeaderGenerator(parallel)', autosar.rte.ComponentHeaderGenerator(partition).generate, rteDir,
+                 processes=None)
+   runner.run('3.x/rte/total', _generateRte, components, rteDir)
+
+def runAutosar4(runner, size, workDir, findLoops):
+   """benchmarks of the AUTOSAR 4.x parser"""
+   arxmlFile = os.path.join(workDir, 'model4.arxml')
+   runner.run('4.x/create', saveWorkspace4, arxmlFile, size)
+   if not os.path.isfile(arxmlFile):
+      return
+   runner.run('4.x/loadXML', _loadXML, arxmlFile)
+   runner.run('4.x/loadXML(streaming)', _loadXML, arxmlFile, streaming=True)
+   loaded = runner.run('4.x/loadXML(lazy)', _loadXML, arxmlFile, lazy=True)
+   if loaded is not None:
+      refs = _collectRefs(loaded)
+      runner.run('4.x/find', _findAll, loaded, refs, findLoops)
+      runner.annotate('4.x/find', refs=len(refs), loops=findLoops)
+
+def main(argv=None):
+   parser = argparse.ArgumentParser(description='AUTOSAR toolkit benchmarks')
+   parser.add_argument('-n', '--datatypes', type=int, default=100, help='number of data types')
+   parser.add_argument('-m', '--interfaces', type=int, default=50, help='number of port interfaces')
+   parser.add_argument('-k', '--components', type=int, default=20, help='number of software components')
+   parser.add_argument('--ports', type=int, default=10, help='number of ports per component')
+   parser.add_argument('--runnables', type=int, default=2, help='number of cyclic runnables per component')
+   parser.add_argument('--compositions', type=int, default=2, help='number of compositions')
+   parser.add_argument('--find-loops', type=int, default=10, help='number of iterations of the find benchmarks')
+   parser.add_argument('-r', '--repeat', type=int, default=3, help='number of times each benchmark is run')
+   parser.add_argument('--version', choices=['3', '4', 'all'], default='all', help='AUTOSAR versions to benchmark')
+   parser.add_argument('--workdir', help='directory for generated files (default: temporary directory)')
+   parser.add_argument('-o', '--output', help='JSON result file (default: stdout)')
+   parser.add_argument('-v', '--verbose', action='store_true', help='print each result while running')
+   args = parser.parse_args(argv)
+
+   size = ModelSize(args.datatypes, args.interfaces, args.components, args.ports, args.runnables, args.compositions)
+   runner = BenchmarkRunner(args.repeat, verbose=args.verbose)
+   workDir = args.workdir if args.workdir is not None else tempfile.mkdtemp(prefix='autosar_benchmark_')
+   if not os.path.isdir(workDir):
+      os.makedirs(workDir)
+   try:
+      if args.version in ('3', 'all'):
+         runAutosar3(runner, size, workDir, args.find_loops)
+      if args.version in ('4', 'all'):
+         runAutosar4(runner, size, workDir, args.find_loops)
+   finally:
+      if args.workdir is None:
+         shutil.rmtree(workDir, ignore_errors=True)
+   report = {'python': platform.python_version(), 'platform': platform.platform(), 'size': size.asdict(),
+             'repeat': runner.repeat, 'results': runner.results}
+   if args.output is not None:
+      with open(args.output, 'w') as fp:
+         json.dump(report, fp, indent=2, sort_keys=True)
+   else:
+      json.dump(report, sys.stdout, indent=2, sort_keys=True)
+      sys.stdout.write('\n')
+   return 0
+
+if __name__ == '__main__':
+   sys.exit(main())
@@ -0,0 +1,4 @@
+"""
+Unit tests of the AUTOSAR toolkit.
+Run using: python -m unittest discover -s tests -t . (or python -m pytest tests)
+"""
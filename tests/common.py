@@ -0,0 +1,103 @@
+"""
+Helpers shared by the unit tests.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import autosar
+import autosar.rte
+
+dataDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+def createModel():
+   """
+   Returns a new AUTOSAR 3.x workspace and the list of its application software components.
+   Swc0 provides the sender-receiver ports SR0 to SR2 and the client-server port Srv, Swc1 to Swc3 require them.
+   """
+   ws = autosar.workspace()
+   dataTypes = ws.getDataTypePackage()
+   for i in range(4):
+      dataTypes.createIntegerDataType('U%d_T'%i, min=0, max=255+i)
+   dataTypes.createIntegerDataType('Enum_T', valueTable=['Enum_Off', 'Enum_On', 'Enum_Error', 'Enum_NotAvailable'])
+   dataTypes.createIntegerDataType('Phys_T', min=0, max=65535, offset=0, scaling=0.125, unit='km')
+   dataTypes.createRecordDataType('Rec_T', [('a', '/DataType/U0_T'), ('b', '/DataType/Enum_T'), ('c', '/DataType/Phys_T')])
+   dataTypes.createArrayDataType('Arr_T', '/DataType/U0_T', 8)
+   constants = ws.getConstantPackage()
+   portInterfaces = ws.getPortInterfacePackage()
+   for i in range(3):
+      constants.createConstant('C_SR%d_IV'%i, 'U%d_T'%i, i)
+      portInterfaces.createSenderReceiverInterface('SR%d_I'%i, autosar.DataElement('D%d'%i, 'U%d_T'%i))
+   constants.createConstant('C_Rec_IV', 'Rec_T', {'a': 0, 'b': 3, 'c': 65535})
+   portInterface = portInterfaces.createClientServerInterface('CS0_I', ['Get', 'Set'], autosar.ApplicationError('E_NOT_OK', 1))
+   portInterface['Get'].createOutArgument('value', 'Rec_T')
+   portInterface['Set'].createInArgument('value', 'U0_T')
+   componentTypes = ws.getComponentTypePackage()
+   components = []
+   for k in range(4):
+      swc = componentTypes.createApplicationSoftwareComponent('Swc%d'%k)
+      portAccess = []
+      for i in range(3):
+         if k == 0:
+            swc.createProvidePort('SR%d'%i, 'SR%d_I'%i, initValueRef='C_SR%d_IV'%i)
+         else:
+            swc.createRequirePort('SR%d'%i, 'SR%d_I'%i, initValueRef='C_SR%d_IV'%i)
+         portAccess.append('SR%d'%i)
+      if k == 0:
+         swc.createProvidePort('Srv', 'CS0_I')
+      else:
+         swc.createRequirePort('Cli', 'CS0_I')
+         portAccess.extend(['Cli/Get', 'Cli/Set'])
+      swc.behavior.createRunnable('Swc%d_Init'%k)
+      for j in range(2):
+         swc.behavior.createRunnable('Swc%d_Run%d'%(k, j), portAccess=portAccess)
+         swc.behavior.createTimerEvent('Swc%d_Run%d'%(k, j), 10*(j+1))
+      if k == 0:
+         for operationName in ['Get', 'Set']:
+            swc.behavior.createRunnable('Swc0_%s'%operationName)
+            swc.behavior.createOperationInvokedEvent('Swc0_%s'%operationName, 'Srv/%s'%operationName)
+      components.append(swc)
+   composition = componentTypes.createCompositionComponent('Composition0')
+   for swc in components:
+      composition.createComponentRef(swc.name)
+   for i in range(3):
+      composition.createConnector('Swc0/SR%d'%i, 'Swc1/SR%d'%i)
+   return ws, components
+
+def createWorkspace():
+   """returns a new AUTOSAR 3.x workspace containing the model of createModel"""
+   ws, components = createModel()
+   return ws
+
+def createPartition(components):
+   """returns a finalized RTE partition of components"""
+   partition = autosar.rte.Partition()
+   for swc in components:
+      partition.addComponent(swc)
+   partition.finalize()
+   return partition
+
+class TempDirTestCase(unittest.TestCase):
+   """test case with a temporary directory, removed after each test"""
+   def setUp(self):
+      self.tempDir = tempfile.mkdtemp(prefix='autosar_test_')
+
+   def tearDown(self):
+      shutil.rmtree(self.tempDir, ignore_errors=True)
+
+   def path(self, name):
+      return os.path.join(self.tempDir, name)
+
+   def saveModel(self, name='model.arxml', ws=None):
+      """saves the model of createModel (or ws) as ARXML in the temporary directory and returns the file path"""
+      filename = self.path(name)
+      if ws is None:
+         ws = createWorkspace()
+      ws.saveXML(filename)
+      return filename
+
+   def saveModel4(self, name='model4.arxml'):
+      """copies the AUTOSAR 4.x file tests/data/components4.arxml to the temporary directory and returns the file path"""
+      filename = self.path(name)
+      shutil.copyfile(os.path.join(dataDir, 'components4.arxml'), filename)
+      return filename
@@ -0,0 +1,42 @@
+import os
+import json
+import unittest
+import benchmark.run
+from benchmark.models import ModelSize
+from tests.common import TempDirTestCase
+
+class TestBenchmarkRunner(unittest.TestCase):
+   def test_error_is_reported(self):
+      def fail():
+         raise ValueError('broken')
+      runner = benchmark.run.BenchmarkRunner(repeat=2)
+      self.assertIsNone(runner.run('fail', fail))
+      self.assertEqual(runner.results['fail'], {'error': 'ValueError: broken'})
+
+   def test_result(self):
+      runner = benchmark.run.BenchmarkRunner(repeat=2)
+      self.assertEqual(runner.run('add', lambda x, y: x+y, 1, 2), 3)
+      self.assertEqual(runner.results['add']['repeat'], 2)
+      self.assertLessEqual(runner.results['add']['best'], runner.results['add']['mean'])
+
+class TestBenchmarkRun(TempDirTestCase):
+   def test_all_benchmarks_succeed(self):
+      size = ModelSize(numDataTypes=8, numPortInterfaces=10, numComponents=3, portsPerComponent=2, numCompositions=1)
+      runner = benchmark.run.BenchmarkRunner(repeat=1)
+      benchmark.run.runAutosar3(runner, size, self.tempDir, 1)
+      benchmark.run.runAutosar4(runner, size, self.tempDir, 1)
+      errors = dict((name, result['error']) for name, result in runner.results.items() if 'error' in result)
+      self.assertEqual(errors, {})
+      self.assertIn('3.x/loadJSON', runner.results)
+
+   def test_main_writes_report(self):
+      output = self.path('result.json')
+      benchmark.run.main(['-n', '4', '-m', '10', '-k', '2', '--ports', '2', '-r', '1', '--version', '4',
+                          '--workdir', self.path('work'), '-o', output])
+      with open(output) as fp:
+         report = json.load(fp)
+      self.assertEqual(report['size']['numComponents'], 2)
+      self.assertIn('4.x/loadXML', report['results'])
+
+if __name__ == '__main__':
+   unittest.main()
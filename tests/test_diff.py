@@ -0,0 +1,43 @@
+import unittest
+import autosar
+from tests.common import TempDirTestCase, createWorkspace
+
+class TestWorkspaceDiff(TempDirTestCase):
+   def test_same_model(self):
+      diff = createWorkspace().diff(createWorkspace())
+      self.assertEqual(len(diff), 0)
+      self.assertEqual(str(diff), '')
+
+   def test_loaded_model(self):
+      filename = self.saveModel()
+      ws = autosar.workspace()
+      ws.loadXML(filename)
+      other = autosar.workspace()
+      other.loadXML(filename, streaming=True)
+      self.assertEqual(len(ws.diff(other)), 0)
+
+   def test_added_and_removed(self):
+      ws = createWorkspace()
+      other = createWorkspace()
+      other.find('/DataType').createIntegerDataType('New_T', min=0, max=1)
+      other.find('/PortInterface').delete('SR1_I')
+      diff = ws.diff(other)
+      self.assertEqual(diff.added, ['/DataType/New_T'])
+      self.assertEqual(diff.removed, ['/PortInterface/SR1_I'])
+      self.assertEqual(diff.changed, [])
+      self.assertEqual(str(diff), '+ /DataType/New_T\n- /PortInterface/SR1_I')
+
+   def test_changed(self):
+      ws = createWorkspace()
+      other = createWorkspace()
+      other.find('/DataType/U1_T').maxVal = 1000
+      other.find('/PortInterface/SR2_I/D2').typeRef = '/DataType/U3_T'
+      other.find('/ComponentType/Swc1/SR0').comspec[0].initValueRef = '/Constant/C_SR1_IV'
+      other.find('/ComponentType/Swc2_InternalBehavior').runnables[0].symbol = 'Other'
+      diff = ws.diff(other)
+      self.assertEqual(diff.changed, ['/ComponentType/Swc1', '/ComponentType/Swc2_InternalBehavior', '/DataType/U1_T',
+                                      '/PortInterface/SR2_I'])
+      self.assertEqual(diff.refs(), set(diff.changed))
+
+if __name__ == '__main__':
+   unittest.main()
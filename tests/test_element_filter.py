@@ -0,0 +1,99 @@
+import unittest
+import autosar
+from autosar.parser.package_parser import ElementFilter
+from tests.common import TempDirTestCase
+
+_loadModes = [{}, {'streaming': True}, {'lazy': True}, {'xmlBackend': 'expat'}, {'indexed': True}]
+
+class TestElementFilter(unittest.TestCase):
+   def test_matchRef(self):
+      elementFilter = ElementFilter(['/ComponentType/Swc?', '/DataType/*'])
+      self.assertTrue(elementFilter.matchRef('/ComponentType/Swc1'))
+      self.assertFalse(elementFilter.matchRef('/ComponentType/Swc10'))
+      self.assertFalse(elementFilter.matchRef('/ComponentType/Swc1_InternalBehavior'))
+      self.assertTrue(elementFilter.matchRef('/DataType/Sub/U0_T'))
+      self.assertFalse(elementFilter.matchRef('/Constant/C_SR0_IV'))
+      self.assertTrue(elementFilter.matchTag('CONSTANT-SPECIFICATION'))
+
+   def test_single_pattern(self):
+      elementFilter = ElementFilter('/DataType/U[01]_T', 'INTEGER-TYPE')
+      self.assertEqual(elementFilter.refs, ['/DataType/U[01]_T'])
+      self.assertTrue(elementFilter.matchRef('/DataType/U1_T'))
+      self.assertFalse(elementFilter.matchRef('/DataType/U2_T'))
+      self.assertTrue(elementFilter.matchTag('INTEGER-TYPE'))
+      self.assertFalse(elementFilter.matchTag('RECORD-TYPE'))
+
+   def test_no_restriction(self):
+      elementFilter = ElementFilter()
+      self.assertIsNone(elementFilter.refPatterns)
+      self.assertTrue(elementFilter.matchRef('/Any/Ref'))
+      self.assertTrue(elementFilter.matchTag('ANY-TAG'))
+
+class TestLoadFiltered(TempDirTestCase):
+   def setUp(self):
+      TempDirTestCase.setUp(self)
+      self.filename = self.saveModel()
+
+   def _load(self, **kwargs):
+      ws = autosar.workspace()
+      ws.loadXML(self.filename, **kwargs)
+      return ws
+
+   def _elementNames(self, ws, packageRef):
+      return [elem.name for elem in ws.find(packageRef).elements]
+
+   def test_elementRefs(self):
+      for mode in _loadModes:
+         with self.subTest(**mode):
+            ws = self._load(elementRefs=['/ComponentType/Swc1*', '/DataType/U?_T'], **mode)
+            self.assertEqual(self._elementNames(ws, '/DataType'), ['U0_T', 'U1_T', 'U2_T', 'U3_T'])
+            self.assertEqual(self._elementNames(ws, '/ComponentType'), ['Swc1', 'Swc1_InternalBehavior', 'Swc1_Implementation'])
+            self.assertEqual(self._elementNames(ws, '/Constant'), [])
+            swc = ws.find('/ComponentType/Swc1')
+            self.assertIs(swc.behavior, ws.find('/ComponentType/Swc1_InternalBehavior'))
+            self.assertIs(swc.implementation, ws.find('/ComponentType/Swc1_Implementation'))
+            self.assertIsNone(ws.find('/ComponentType/Swc0'))
+            self.assertIsNone(ws.find('/DataType/Enum_T'))
+            self.assertIsNone(ws.find('/Constant/C_SR0_IV'))
+
+   def test_elementTags(self):
+      for mode in _loadModes:
+         with self.subTest(**mode):
+            ws = self._load(elementTags=['APPLICATION-SOFTWARE-COMPONENT-TYPE', 'CONSTANT-SPECIFICATION'], **mode)
+            self.assertEqual(self._elementNames(ws, '/ComponentType'), ['Swc0', 'Swc1', 'Swc2', 'Swc3'])
+            self.assertEqual(self._elementNames(ws, '/Constant'), ['C_SR0_IV', 'C_SR1_IV', 'C_SR2_IV', 'C_Rec_IV'])
+            self.assertEqual(self._elementNames(ws, '/DataType'), [])
+            swc = ws.find('/ComponentType/Swc0')
+            self.assertIsNone(swc.behavior)
+            self.assertIsNone(swc.implementation)
+            self.assertIsNone(ws.find('/ComponentType/Swc0_InternalBehavior'))
+            self.assertIsNone(ws.find('/ComponentType/Composition0'))
+
+   def test_refs_and_tags(self):
+      ws = self._load(elementRefs='/ComponentType/Swc[01]*', elementTags='INTERNAL-BEHAVIOR')
+      self.assertEqual(self._elementNames(ws, '/ComponentType'), ['Swc0_InternalBehavior', 'Swc1_InternalBehavior'])
+
+   def test_filtered_component_is_not_linked(self):
+      for mode in _loadModes:
+         with self.subTest(**mode):
+            ws = self._load(elementRefs=['/ComponentType/Swc0_*', '/ComponentType/Swc1'], **mode)
+            self.assertIsNone(ws.find('/ComponentType/Swc0'))
+            self.assertIsNotNone(ws.find('/ComponentType/Swc0_InternalBehavior'))
+            self.assertIsNone(ws.find('/ComponentType/Swc1').behavior)
+            self.assertIsNone(ws.find('/ComponentType/Swc1_InternalBehavior'))
+
+   def test_openXML(self):
+      ws = autosar.workspace()
+      ws.openXML(self.filename, elementRefs=['/Constant/C_SR?_IV'])
+      ws.loadPackage('Constant')
+      ws.loadPackage('DataType')
+      self.assertEqual(self._elementNames(ws, '/Constant'), ['C_SR0_IV', 'C_SR1_IV', 'C_SR2_IV'])
+      self.assertEqual(self._elementNames(ws, '/DataType'), [])
+
+   def test_cacheDir_not_possible(self):
+      ws = autosar.workspace()
+      with self.assertRaises(ValueError):
+         ws.loadXML(self.filename, cacheDir=self.path('cache'), elementTags=['CONSTANT-SPECIFICATION'])
+
+if __name__ == '__main__':
+   unittest.main()
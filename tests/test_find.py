@@ -0,0 +1,47 @@
+import unittest
+import autosar
+from tests.common import createWorkspace
+
+def _walk(ws, ref):
+   """resolves ref without the reference index (same as the workspace did before it had one)"""
+   parts = ref[1:].partition('/')
+   for package in ws.packages:
+      if package.name == parts[0]:
+         return package.find(parts[2]) if len(parts[2]) > 0 else package
+   return None
+
+class TestFind(unittest.TestCase):
+   def test_find_matches_walk(self):
+      ws = createWorkspace()
+      refs = ['/DataType', '/DataType/U0_T', '/Constant/C_SR1_IV', '/PortInterface/SR2_I', '/PortInterface/SR2_I/D2',
+              '/ComponentType/Swc0', '/ComponentType/Swc0/SR0', '/ComponentType/Swc0_InternalBehavior/Swc0_Init']
+      for ref in refs:
+         item = ws.find(ref)
+         self.assertIsNotNone(item, ref)
+         self.assertIs(item, _walk(ws, ref))
+         self.assertEqual(item.ref, ref)
+
+   def test_find_with_role(self):
+      ws = createWorkspace()
+      self.assertIs(ws.find('U1_T', role='DataType'), ws.find('/DataType/U1_T'))
+      self.assertIs(ws.find('DataType/U1_T'), ws.find('/DataType/U1_T'))
+
+   def test_not_found(self):
+      ws = createWorkspace()
+      self.assertIsNone(ws.find('/DataType/Missing_T'))
+      self.assertIsNone(ws.find('/Missing'))
+      self.assertIsNone(ws.find('/ComponentType/Swc0/Missing'))
+
+   def test_append_and_delete(self):
+      ws = createWorkspace()
+      package = ws.find('/DataType')
+      dataType = package.createIntegerDataType('New_T', min=0, max=3)
+      self.assertIs(ws.find('/DataType/New_T'), dataType)
+      package.delete('New_T')
+      self.assertIsNone(ws.find('/DataType/New_T'))
+      ws.delete('/Constant')
+      self.assertIsNone(ws.find('/Constant'))
+      self.assertIsNone(ws.find('/Constant/C_SR1_IV'))
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,74 @@
+import pickle
+import unittest
+import autosar
+from tests.common import createWorkspace
+
+class TestFingerprint(unittest.TestCase):
+   def setUp(self):
+      self.ws = createWorkspace()
+      self.package = self.ws.find('/ComponentType')
+      self.swc = self.ws.find('/ComponentType/Swc1')
+
+   def assertChanged(self, modify, *objects):
+      fingerprints = [obj.fingerprint() for obj in objects]
+      modify()
+      for obj, fingerprint in zip(objects, fingerprints):
+         self.assertNotEqual(obj.fingerprint(), fingerprint)
+         self.assertEqual(obj.fingerprint(), autosar.base.getFingerprint(pickle.loads(pickle.dumps(obj))))
+
+   def test_same_model(self):
+      self.assertEqual(self.package.fingerprint(), createWorkspace().find('/ComponentType').fingerprint())
+
+   def test_unchanged_subtree_is_cached(self):
+      self.package.fingerprint()
+      other = self.ws.find('/ComponentType/Swc2')
+      fingerprint = other._fingerprint
+      self.swc.requirePorts[0].portInterfaceRef = '/PortInterface/SR2_I'
+      self.assertIsNone(self.swc._fingerprint)
+      self.assertIsNone(self.package._fingerprint)
+      self.assertIs(other._fingerprint, fingerprint)
+
+   def test_attribute_assigned(self):
+      port = self.swc.requirePorts[0]
+      self.assertChanged(lambda: setattr(port, 'portInterfaceRef', '/PortInterface/SR2_I'), port, self.swc, self.package)
+
+   def test_list_item_deleted(self):
+      def modify():
+         del self.swc.requirePorts[0]
+      self.assertChanged(modify, self.swc, self.package)
+
+   def test_list_item_appended(self):
+      swc = self.ws.find('/ComponentType/Swc0')
+      self.assertChanged(lambda: swc.createRequirePort('Cli', 'CS0_I'), swc, self.package)
+
+   def test_comspec_changed_in_place(self):
+      port = self.swc.requirePorts[0]
+      def modify():
+         port.comspec[0].initValueRef = '/Constant/C_SR1_IV/C_SR1_IV'
+      self.assertChanged(modify, port, self.swc, self.package)
+
+   def test_data_receive_points_cleared(self):
+      behavior = self.swc.behavior
+      runnable = behavior.find('Swc1_Run0')
+      self.assertGreater(len(runnable.dataReceivePoints), 0)
+      self.assertChanged(lambda: runnable.dataReceivePoints.clear(), runnable, behavior, self.package)
+
+   def test_nested_object_changed_in_place(self):
+      runnable = self.swc.behavior.find('Swc1_Run0')
+      def modify():
+         runnable.serverCallPoints[0].operationInstanceRefs[0].operationRef = '/PortInterface/CS0_I/Set'
+      self.assertChanged(modify, runnable, self.swc.behavior)
+
+   def test_pickled_workspace(self):
+      fingerprint = self.package.fingerprint()
+      ws = pickle.loads(pickle.dumps(self.ws))
+      package = ws.find('/ComponentType')
+      self.assertEqual(package.fingerprint(), fingerprint)
+      port = ws.find('/ComponentType/Swc1').requirePorts[0]
+      port.comspec[0].initValueRef = '/Constant/C_SR1_IV/C_SR1_IV'
+      self.assertNotEqual(package.fingerprint(), fingerprint)
+      del ws.find('/ComponentType/Swc1').requirePorts[0]
+      self.assertNotEqual(package.fingerprint(), fingerprint)
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,50 @@
+import json
+import unittest
+import autosar
+import autosar.behavior
+from tests.common import TempDirTestCase, createWorkspace
+
+def _default(obj):
+   return obj.ref
+
+class TestJSONWriter(TempDirTestCase):
+   def setUp(self):
+      super().setUp()
+      self.ws = createWorkspace()
+      behavior = self.ws.find('/ComponentType/Swc0').behavior
+      behavior.createSharedCalParam('Param0', 'U0_T', '/SwAddrMethod/CALPRM')
+      modeDependency = autosar.behavior.ModeDependency()
+      modeDependency.append(autosar.behavior.ModeDependencyRef('/ModeDclrGroup/Mode_G/ON', '/ModeDclrGroup/Mode_G', '/ComponentType/Swc0/SR0'))
+      behavior.events[0].modeDependency = modeDependency
+
+   def expected(self, **kwargs):
+      return json.dumps(self.ws.asdict(), default=_default, **kwargs)
+
+   def test_indented(self):
+      self.assertEqual(self.ws.toJSON(), self.expected(indent=3))
+      self.assertEqual(self.ws.toJSON(indent=1), self.expected(indent=1))
+
+   def test_compact(self):
+      self.assertEqual(self.ws.toJSON(compact=True), self.expected(separators=(',', ':')))
+
+   def test_saveJSON(self):
+      filename = self.path('model.json')
+      self.ws.saveJSON(filename, packages=['ComponentType'])
+      with open(filename) as fp:
+         self.assertEqual(fp.read(), json.dumps(self.ws.asdict(['ComponentType']), default=_default, indent=3))
+
+   def test_asdict_contents(self):
+      swc0, swc1 = [self.ws.find('/ComponentType/Swc%d'%i).asdict() for i in range(2)]
+      behavior0, behavior1 = [self.ws.find('/ComponentType/Swc%d_InternalBehavior'%i).asdict() for i in range(2)]
+      self.assertEqual(swc1['requirePorts'][0]['attributes'][0]['type'], 'DataElementComSpec')
+      self.assertEqual(swc0['providePorts'][-1]['attributes'][0]['type'], 'OperationComSpec')
+      runnables0 = dict((runnable['name'], runnable) for runnable in behavior0['runnables'])
+      runnables1 = dict((runnable['name'], runnable) for runnable in behavior1['runnables'])
+      self.assertEqual(runnables0['Swc0_Run0']['dataSendPoints'][0]['type'], 'DataSendPoint')
+      self.assertEqual(runnables1['Swc1_Run0']['dataReceivePoints'][0]['type'], 'DataReceivePoint')
+      self.assertEqual(runnables1['Swc1_Run0']['syncServerCallPoints'][0]['type'], 'SyncServerCallPoint')
+      self.assertEqual([x['name'] for x in behavior0['sharedCalPrms']], ['Param0'])
+      self.assertEqual(behavior0['events'][0]['modeDependency']['modeInstanceRefs'][0]['type'], 'ModeDependencyRef')
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import autosar
+from tests.common import TempDirTestCase
+
+class TestLazyLoad(TempDirTestCase):
+   def setUp(self):
+      super().setUp()
+      self.filename = self.saveModel()
+
+   def test_packages_are_deferred(self):
+      ws = autosar.workspace()
+      ws.loadXML(self.filename, lazy=True)
+      self.assertEqual([package.name for package in ws.packages], ['DataType', 'Constant', 'PortInterface', 'ComponentType'])
+      for package in ws.packages:
+         self.assertIsNotNone(package._deferredXML)
+
+   def test_sub_packages_stay_deferred(self):
+      ws = autosar.workspace()
+      ws.loadXML(self.filename, lazy=True)
+      self.assertEqual(ws.find('/DataType/U0_T').name, 'U0_T')
+      dataTypes = ws.find('/DataType')
+      self.assertIsNone(dataTypes._deferredXML)
+      subPackages = dataTypes._subPackages
+      self.assertEqual([package.name for package in subPackages], ['DataTypeSemantics', 'DataTypeUnits'])
+      for package in subPackages:
+         self.assertIsNotNone(package._deferredXML)
+         self.assertIs(ws.find(package.ref), package)
+         self.assertIsNotNone(package._deferredXML)
+      for package in ws.packages[1:]:
+         self.assertIsNotNone(package._deferredXML)
+
+   def test_find_in_sub_package(self):
+      expected = autosar.workspace()
+      expected.loadXML(self.filename)
+      ref = expected.find('/DataType/DataTypeSemantics').elements[0].ref
+      ws = autosar.workspace()
+      ws.loadXML(self.filename, lazy=True)
+      self.assertEqual(ws.find(ref).ref, ref)
+      self.assertIsNone(ws.find('/DataType/DataTypeSemantics')._deferredXML)
+      self.assertIsNotNone(ws.find('/DataType/DataTypeUnits')._deferredXML)
+
+   def test_same_result_as_loadXML(self):
+      expected = autosar.workspace()
+      expected.loadXML(self.filename)
+      ws = autosar.workspace()
+      ws.loadXML(self.filename, lazy=True)
+      self.assertEqual(ws.toXML(), expected.toXML())
+
+   def test_openXML_loadPackage(self):
+      ws = autosar.workspace()
+      ws.openXML(self.filename)
+      ws.loadPackage('DataType', role='DataType', lazy=True)
+      self.assertEqual([package.name for package in ws.packages], ['DataType'])
+      self.assertIsNotNone(ws.packages[0]._deferredXML)
+      self.assertEqual(ws.find('U1_T', role='DataType').ref, '/DataType/U1_T')
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,78 @@
+import json
+import unittest
+import autosar
+from tests.common import TempDirTestCase, createWorkspace
+
+_packageNames = ['DataType', 'Constant', 'PortInterface', 'ComponentType']
+
+class TestParallelLoad(TempDirTestCase):
+   def setUp(self):
+      super().setUp()
+      ws = createWorkspace()
+      self.filenames = []
+      for name in _packageNames:
+         filename = self.path(name+'.arxml')
+         ws.saveXML(filename, packages=[name])
+         self.filenames.append(filename)
+
+   def loadSequential(self, filenames=None):
+      ws = autosar.workspace()
+      for filename in (self.filenames if filenames is None else filenames):
+         ws.loadXML(filename)
+      return ws
+
+   def test_loadXMLFiles(self):
+      expected = self.loadSequential()
+      ws = autosar.workspace()
+      ws.loadXMLFiles(self.filenames, processes=2)
+      self.assertEqual([package.name for package in ws.packages], _packageNames)
+      self.assertEqual(ws.toXML(), expected.toXML())
+      self.assertEqual(ws.find('/ComponentType/Swc0_Implementation').behaviorRef, ws.find('/ComponentType/Swc0_InternalBehavior').ref)
+
+   def test_duplicated_files(self):
+      filenames = self.filenames+self.filenames[1:3]
+      expected = self.loadSequential(filenames)
+      ws = autosar.workspace()
+      ws.loadXMLFiles(filenames, processes=2)
+      self.assertEqual(ws.toXML(), expected.toXML())
+
+   def test_duplicated_element_in_second_file(self):
+      other = createWorkspace()
+      other.find('/ComponentType/Swc0_InternalBehavior').createRunnable('Swc0_Extra')
+      duplicate = self.path('Duplicate.arxml')
+      other.saveXML(duplicate, packages=['ComponentType'])
+      filenames = self.filenames+[duplicate]
+      expected = self.loadSequential(filenames)
+      ws = autosar.workspace()
+      ws.loadXMLFiles(filenames, processes=2)
+      self.assertEqual(ws.toXML(), expected.toXML())
+      behavior = ws.find('/ComponentType/Swc0_InternalBehavior')
+      self.assertIsNone(behavior.find('Swc0_Extra'))
+      self.assertIs(ws.find('/ComponentType/Swc0').behavior, behavior)
+      self.assertIs(ws.find('/ComponentType/Swc0').implementation, ws.find('/ComponentType/Swc0_Implementation'))
+
+   def test_fromDict(self):
+      data = [{'type': 'FileRef', 'path': filename, 'roles': {'/'+name: name}} for name, filename in zip(_packageNames, self.filenames)]
+      for processes in (1, 2):
+         ws = autosar.workspace()
+         ws.fromDict(data, processes=processes)
+         self.assertEqual(ws.roles['DataType'], '/DataType')
+         self.assertEqual(ws.roles['ComponentType'], '/ComponentType')
+         self.assertIs(ws.find('U0_T', role='DataType'), ws.find('/DataType/U0_T'))
+
+   def test_fromDict_invalid_roles(self):
+      data = [{'type': 'FileRef', 'path': self.filenames[0], 'roles': [('/DataType', 'DataType')]}]
+      with self.assertRaises(ValueError):
+         autosar.workspace().fromDict(data, processes=2)
+
+   def test_loadJSON(self):
+      jsonFile = self.path('files.json')
+      with open(jsonFile, 'w') as fp:
+         json.dump([{'type': 'fileRef', 'path': name+'.arxml'} for name in _packageNames], fp)
+      expected = self.loadSequential()
+      ws = autosar.workspace()
+      ws.loadJSON(jsonFile, processes=2)
+      self.assertEqual(ws.toXML(), expected.toXML())
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,40 @@
+import json
+import os
+import unittest
+import xml.etree.ElementTree as ElementTree
+import autosar
+import autosar.base
+from tests.common import dataDir
+
+def _asdict(ws):
+   return json.loads(json.dumps(ws.asdict(), default=lambda obj: obj.ref))
+
+class TestParserParity(unittest.TestCase):
+   """
+   parser3.json holds Workspace.asdict of parser3.arxml as loaded by the data type, constant and port interface parsers
+   before they read the children of an element in a single pass (autosar.base.childNodeMap)
+   """
+   def setUp(self):
+      self.filename = os.path.join(dataDir, 'parser3.arxml')
+      with open(os.path.join(dataDir, 'parser3.json')) as fp:
+         self.expected = json.load(fp)
+
+   def test_loadXML(self):
+      ws = autosar.workspace()
+      ws.loadXML(self.filename)
+      self.assertEqual(_asdict(ws), self.expected)
+
+   def test_loadXML_streaming(self):
+      ws = autosar.workspace()
+      ws.loadXML(self.filename, streaming=True)
+      self.assertEqual(_asdict(ws), self.expected)
+
+   def test_childNodeMap(self):
+      xmlElem = ElementTree.fromstring('<A><B>1</B><C>2</C><B>3</B></A>')
+      nodeMap = autosar.base.childNodeMap(xmlElem)
+      self.assertEqual(sorted(nodeMap), ['B', 'C'])
+      self.assertIs(nodeMap['B'], xmlElem.find('B'))
+      self.assertEqual(nodeMap['C'].text, '2')
+
+if __name__ == '__main__':
+   unittest.main()
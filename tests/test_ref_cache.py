@@ -0,0 +1,58 @@
+import unittest
+import autosar
+from tests.common import createWorkspace
+
+class TestRefCache(unittest.TestCase):
+   def test_ref_values(self):
+      ws = createWorkspace()
+      self.assertEqual(ws.find('/DataType').ref, '/DataType')
+      self.assertEqual(ws.find('/DataType/U0_T').ref, '/DataType/U0_T')
+      self.assertEqual(ws.find('/ComponentType/Swc0').providePorts[0].ref, '/ComponentType/Swc0/SR0')
+      self.assertEqual(ws.find('/Constant/C_SR1_IV').value.ref, '/Constant/C_SR1_IV/C_SR1_IV')
+
+   def test_rename_element(self):
+      ws = createWorkspace()
+      swc = ws.find('/ComponentType/Swc0')
+      port = swc.providePorts[0]
+      self.assertEqual(port.ref, '/ComponentType/Swc0/SR0')
+      swc.name = 'Renamed'
+      self.assertEqual(swc.ref, '/ComponentType/Renamed')
+      self.assertEqual(port.ref, '/ComponentType/Renamed/SR0')
+
+   def test_rename_package(self):
+      ws = createWorkspace()
+      dataType = ws.find('/DataType/U0_T')
+      self.assertEqual(dataType.ref, '/DataType/U0_T')
+      ws.find('/DataType').name = 'Types'
+      self.assertEqual(dataType.ref, '/Types/U0_T')
+
+   def test_move_element(self):
+      ws = createWorkspace()
+      dataType = ws.find('/DataType/U0_T')
+      self.assertEqual(dataType.ref, '/DataType/U0_T')
+      package = ws.createPackage('Other')
+      dataType.parent = package
+      self.assertEqual(dataType.ref, '/Other/U0_T')
+      dataType.parent = None
+      self.assertIsNone(dataType.ref)
+
+   def test_rename_invalidates_subtree_only(self):
+      ws = createWorkspace()
+      port = ws.find('/ComponentType/Swc0').providePorts[0]
+      dataType = ws.find('/DataType/U0_T')
+      portRef = port.ref
+      dataTypeRef = dataType.ref
+      ws.find('/ComponentType').name = 'Components'
+      self.assertEqual(port.ref, '/Components/Swc0/SR0')
+      self.assertIs(dataType.ref, dataTypeRef)
+      self.assertIsNot(port.ref, portRef)
+
+   def test_setattr_keeps_ref_cache(self):
+      ws = createWorkspace()
+      swc = ws.find('/ComponentType/Swc0')
+      ref = swc.ref
+      swc.desc = 'description'
+      self.assertIs(swc.ref, ref)
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import autosar
+from autosar.workspace import _ReverseRefIndex
+from tests.common import createWorkspace
+
+def _refs(objects):
+   return sorted(obj.ref for obj in objects)
+
+class TestFindReferences(unittest.TestCase):
+   def setUp(self):
+      self.ws = createWorkspace()
+      self.added = []
+      original = _ReverseRefIndex.add
+      def add(index, elem):
+         self.added.append(elem.ref)
+         original(index, elem)
+      _ReverseRefIndex.add = add
+      self.addCleanup(setattr, _ReverseRefIndex, 'add', original)
+
+   def test_find_references(self):
+      ws = self.ws
+      self.assertEqual(_refs(ws.findReferences('/PortInterface/CS0_I')),
+                       ['/ComponentType/Swc0/Srv', '/ComponentType/Swc1/Cli', '/ComponentType/Swc2/Cli', '/ComponentType/Swc3/Cli'])
+      self.assertEqual(_refs(ws.findReferences(ws.find('/DataType/U1_T'), 'typeRef')),
+                       ['/Constant/C_SR1_IV/C_SR1_IV', '/PortInterface/SR1_I/D1'])
+      self.assertEqual(ws.findReferences('/DataType/U1_T', 'portInterfaceRef'), [])
+
+   def test_name_reference(self):
+      ws = self.ws
+      ws.find('/Constant').createConstant('C_Name', 'U1_T', 0)
+      ws.find('/Constant/C_Name').value.typeRef = 'U1_T'
+      self.assertIn('/Constant/C_Name/C_Name', _refs(ws.findReferences('/DataType/U1_T')))
+
+   def test_index_is_updated_incrementally(self):
+      ws = self.ws
+      ws.findReferences('/PortInterface/CS0_I')
+      self.assertGreater(len(self.added), 10)
+      del self.added[:]
+      port = ws.find('/ComponentType/Swc1/Cli')
+      port.portInterfaceRef = '/PortInterface/CS1_I'
+      self.assertNotIn('/ComponentType/Swc1/Cli', _refs(ws.findReferences('/PortInterface/CS0_I')))
+      self.assertEqual(_refs(ws.findReferences('/PortInterface/CS1_I')), ['/ComponentType/Swc1/Cli'])
+      self.assertEqual(self.added, ['/ComponentType/Swc1'])
+
+   def test_child_reference_changed(self):
+      ws = self.ws
+      ws.findReferences('/DataType/U1_T')
+      del self.added[:]
+      ws.find('/PortInterface/SR1_I/D1').typeRef = '/DataType/U2_T'
+      self.assertEqual(_refs(ws.findReferences('/DataType/U1_T')), ['/Constant/C_SR1_IV/C_SR1_IV'])
+      self.assertIn('/PortInterface/SR1_I/D1', _refs(ws.findReferences('/DataType/U2_T')))
+      self.assertEqual(self.added, ['/PortInterface/SR1_I'])
+
+   def test_comspec_changed_in_place(self):
+      ws = self.ws
+      self.assertIn('/ComponentType/Swc1/SR0', _refs(ws.findReferences('/Constant/C_SR0_IV/C_SR0_IV')))
+      del self.added[:]
+      ws.find('/ComponentType/Swc1').requirePorts[0].comspec[0].initValueRef = '/Constant/C_SR1_IV/C_SR1_IV'
+      self.assertNotIn('/ComponentType/Swc1/SR0', _refs(ws.findReferences('/Constant/C_SR0_IV/C_SR0_IV')))
+      self.assertIn('/ComponentType/Swc1/SR0', _refs(ws.findReferences('/Constant/C_SR1_IV/C_SR1_IV')))
+      self.assertEqual(self.added, ['/ComponentType/Swc1'])
+
+   def test_list_item_deleted(self):
+      ws = self.ws
+      ws.findReferences('/PortInterface/CS0_I')
+      del self.added[:]
+      swc = ws.find('/ComponentType/Swc1')
+      self.assertEqual(swc.requirePorts[-1].name, 'Cli')
+      del swc.requirePorts[-1]
+      self.assertNotIn('/ComponentType/Swc1/Cli', _refs(ws.findReferences('/PortInterface/CS0_I')))
+      self.assertEqual(self.added, ['/ComponentType/Swc1'])
+
+   def test_element_added(self):
+      ws = self.ws
+      ws.findReferences('/DataType/U1_T')
+      del self.added[:]
+      ws.find('/Constant').createConstant('C_New', '/DataType/U1_T', 1)
+      self.assertIn('/Constant/C_New/C_New', _refs(ws.findReferences('/DataType/U1_T')))
+      self.assertEqual(self.added, ['/Constant/C_New'])
+
+   def test_element_deleted(self):
+      ws = self.ws
+      ws.findReferences('/DataType/U1_T')
+      del self.added[:]
+      ws.find('/PortInterface').delete('SR1_I')
+      self.assertEqual(_refs(ws.findReferences('/DataType/U1_T')), ['/Constant/C_SR1_IV/C_SR1_IV'])
+      self.assertEqual(self.added, [])
+
+   def test_element_moved(self):
+      ws = self.ws
+      ws.findReferences('/PortInterface/CS0_I')
+      swc = ws.find('/ComponentType/Swc1')
+      port = swc.requirePorts.pop()
+      port.parent = ws.find('/ComponentType/Swc0')
+      port.parent.requirePorts.append(port)
+      self.assertIn('/ComponentType/Swc0/Cli', _refs(ws.findReferences('/PortInterface/CS0_I')))
+      self.assertNotIn('/ComponentType/Swc1/Cli', _refs(ws.findReferences('/PortInterface/CS0_I')))
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,70 @@
+import os
+import unittest
+import autosar
+import autosar.rte
+from tests.common import TempDirTestCase, createModel, createPartition
+
+_oldTime = 1000000000
+
+class TestIncrementalRte(TempDirTestCase):
+   def setUp(self):
+      super().setUp()
+      self.ws, self.components = createModel()
+      self.headerNames = ['Rte_%s.h'%swc.name for swc in self.components]
+
+   def readFiles(self, names):
+      result = {}
+      for name in names:
+         with open(self.path(name)) as fp:
+            result[name] = fp.read()
+      return result
+
+   def resetTimes(self, names):
+      for name in names:
+         os.utime(self.path(name), (_oldTime, _oldTime))
+
+   def changedFiles(self, names):
+      return [name for name in names if os.stat(self.path(name)).st_mtime != _oldTime]
+
+   def test_same_output(self):
+      autosar.rte.ComponentHeaderGenerator(createPartition(self.components)).generate(self.tempDir)
+      expected = self.readFiles(self.headerNames)
+      autosar.rte.ComponentHeaderGenerator(createPartition(self.components)).generate(self.tempDir, incremental=True)
+      self.assertEqual(self.readFiles(self.headerNames), expected)
+      self.assertTrue(os.path.isfile(self.path('Rte_manifest.json')))
+
+   def test_unchanged_headers_are_not_written(self):
+      autosar.rte.ComponentHeaderGenerator(createPartition(self.components)).generate(self.tempDir, incremental=True)
+      self.resetTimes(self.headerNames)
+      autosar.rte.ComponentHeaderGenerator(createPartition(self.components)).generate(self.tempDir, incremental=True)
+      self.assertEqual(self.changedFiles(self.headerNames), [])
+
+   def test_changed_component(self):
+      autosar.rte.ComponentHeaderGenerator(createPartition(self.components)).generate(self.tempDir, incremental=True)
+      self.resetTimes(self.headerNames)
+      self.components[1].behavior.createRunnable('Swc1_Extra')
+      autosar.rte.ComponentHeaderGenerator(createPartition(self.components)).generate(self.tempDir, incremental=True)
+      self.assertEqual(self.changedFiles(self.headerNames), ['Rte_Swc1.h'])
+
+   def test_modified_output_is_regenerated(self):
+      autosar.rte.ComponentHeaderGenerator(createPartition(self.components)).generate(self.tempDir, incremental=True)
+      expected = self.readFiles(self.headerNames)
+      with open(self.path(self.headerNames[0]), 'w') as fp:
+         fp.write('edited')
+      autosar.rte.ComponentHeaderGenerator(createPartition(self.components)).generate(self.tempDir, incremental=True)
+      self.assertEqual(self.readFiles(self.headerNames), expected)
+
+   def test_type_and_rte_generators(self):
+      partition = createPartition(self.components)
+      autosar.rte.TypeGenerator(partition).generate(self.path('Rte_Type.h'))
+      autosar.rte.RteGenerator(partition).generate(self.path('Rte.c'))
+      expected = self.readFiles(['Rte_Type.h', 'Rte.c'])
+      self.resetTimes(['Rte_Type.h', 'Rte.c'])
+      partition = createPartition(self.components)
+      autosar.rte.TypeGenerator(partition).generate(self.path('Rte_Type.h'), incremental=True)
+      autosar.rte.RteGenerator(partition).generate(self.path('Rte.c'), incremental=True)
+      self.assertEqual(self.changedFiles(['Rte_Type.h', 'Rte.c']), [])
+      self.assertEqual(self.readFiles(['Rte_Type.h', 'Rte.c']), expected)
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,49 @@
+import os
+import unittest
+import autosar
+import autosar.rte
+import autosar.rte.partition
+from tests.common import TempDirTestCase, createModel, createPartition
+
+class TestParallelComponentHeaders(TempDirTestCase):
+   def setUp(self):
+      super().setUp()
+      self.ws, self.components = createModel()
+      self.serialDir = self.path('serial')
+      self.parallelDir = self.path('parallel')
+      os.makedirs(self.serialDir)
+      os.makedirs(self.parallelDir)
+
+   def readDir(self, dirname):
+      result = {}
+      for name in os.listdir(dirname):
+         with open(os.path.join(dirname, name), 'rb') as fp:
+            result[name] = fp.read()
+      return result
+
+   def test_same_output(self):
+      autosar.rte.ComponentHeaderGenerator(createPartition(self.components)).generate(self.serialDir)
+      autosar.rte.ComponentHeaderGenerator(createPartition(self.components)).generate(self.parallelDir, processes=2)
+      expected = self.readDir(self.serialDir)
+      self.assertEqual(sorted(expected.keys()), sorted('Rte_%s.h'%swc.name for swc in self.components))
+      self.assertEqual(self.readDir(self.parallelDir), expected)
+
+   def test_same_output_incremental(self):
+      autosar.rte.ComponentHeaderGenerator(createPartition(self.components)).generate(self.serialDir, incremental=True)
+      autosar.rte.ComponentHeaderGenerator(createPartition(self.components)).generate(self.parallelDir, incremental=True, processes=2)
+      self.assertEqual(self.readDir(self.parallelDir), self.readDir(self.serialDir))
+
+class TestPartitionSnapshot(unittest.TestCase):
+   def test_snapshot(self):
+      ws, components = createModel()
+      partition = createPartition(components)
+      numServerRunnables = len(partition.server_runnables)
+      restored = autosar.rte.partition.loadSnapshot(partition.snapshot())
+      self.assertEqual(len(partition.server_runnables), numServerRunnables)
+      self.assertEqual(sorted(restored.server_runnables), sorted(partition.server_runnables))
+      self.assertEqual([component.swc.ref for component in restored.components],
+                       [component.swc.ref for component in partition.components])
+      self.assertIsNot(restored.components[0].swc, partition.components[0].swc)
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import autosar
+import autosar.rte
+from tests.common import createModel, createPartition
+
+class TestServerRunnables(unittest.TestCase):
+   def test_call_points_use_server_runnable(self):
+      ws, components = createModel()
+      partition = createPartition(components)
+      server = partition.components[0]
+      for component in partition.components[1:]:
+         for name, operationName in [('Rte_Call_Cli_Get', 'Get'), ('Rte_Call_Cli_Set', 'Set')]:
+            runnable = server.rte_runnables['Swc0_%s'%operationName]
+            self.assertIs(component.clientAPI.call[name].func, runnable.prototype)
+
+   def test_index_contents(self):
+      ws, components = createModel()
+      partition = createPartition(components)
+      self.assertEqual(len(partition.server_runnables), 2)
+      for entries in partition.server_runnables.values():
+         self.assertEqual([component.swc.name for component, runnable in entries], ['Swc0'])
+
+   def test_index_keys(self):
+      ws, components = createModel()
+      partition = createPartition(components)
+      self.assertEqual(sorted(partition.server_runnables), [('/PortInterface/CS0_I', '/PortInterface/CS0_I/Get'),
+                                                           ('/PortInterface/CS0_I', '/PortInterface/CS0_I/Set')])
+
+   def test_call_point_in_server_component(self):
+      ws, components = createModel()
+      server = components[0]
+      server.createRequirePort('Cli', 'CS0_I')
+      server.behavior.createRunnable('Swc0_Call', portAccess=['Cli/Get'])
+      partition = createPartition([server])
+      component = partition.components[0]
+      self.assertIs(component.clientAPI.call['Rte_Call_Cli_Get'].func, component.rte_runnables['Swc0_Get'].prototype)
+
+   def test_missing_server_uses_default_function(self):
+      ws, components = createModel()
+      partition = createPartition(components[1:])
+      self.assertEqual(len(partition.server_runnables), 0)
+      func = partition.components[0].clientAPI.call['Rte_Call_Cli_Get'].func
+      self.assertIsNotNone(func)
+      self.assertNotEqual(func.name, 'Swc0_Get')
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,50 @@
+import io
+import os
+import unittest
+import cfile as C
+import autosar
+import autosar.rte
+from autosar.rte.generator import _CodeWriter
+from tests.common import TempDirTestCase, createModel, createPartition
+
+class TestCodeWriter(unittest.TestCase):
+   def test_same_as_hfile(self):
+      hfile = C.hfile('Test.h')
+      hfile.code.append(C.include('Std_Types.h'))
+      hfile.code.append(C.blank(1))
+      hfile.code.append(C.line('typedef uint8 A_T'))
+      hfile.code.append(C.line('typedef uint16 B_T'))
+      fp = io.StringIO()
+      writer = _CodeWriter(fp)
+      writer.beginHeader('TEST_H')
+      writer.write([C.include('Std_Types.h'), C.blank(1)])
+      writer.write([C.line('typedef uint8 A_T')])
+      writer.write([])
+      writer.write(C.sequence().append(C.line('typedef uint16 B_T')))
+      writer.endHeader()
+      self.assertEqual(fp.getvalue(), '\n'.join(hfile.lines()))
+
+   def test_empty_sections(self):
+      fp = io.StringIO()
+      writer = _CodeWriter(fp)
+      writer.write([])
+      self.assertEqual(fp.getvalue(), '')
+      writer.write([C.line('int a')])
+      writer.write([C.line('int b')])
+      self.assertEqual(fp.getvalue(), 'int a\nint b')
+
+class TestGeneratedHeaders(TempDirTestCase):
+   def test_headers(self):
+      ws, components = createModel()
+      partition = createPartition(components)
+      autosar.rte.TypeGenerator(partition).generate(self.path('Rte_Type.h'))
+      autosar.rte.ComponentHeaderGenerator(partition).generate(self.tempDir)
+      for name, guard in [('Rte_Type.h', 'RTE_TYPE_H'), ('Rte_Swc1.h', 'RTE_SWC1_H')]:
+         with open(self.path(name)) as fp:
+            text = fp.read()
+         self.assertTrue(text.startswith('#ifndef %s\n#define %s\n'%(guard, guard)), name)
+         self.assertTrue(text.rstrip().endswith('#endif //%s'%guard), name)
+         self.assertEqual(text.count('#ifndef %s\n'%guard), 1)
+
+if __name__ == '__main__':
+   unittest.main()
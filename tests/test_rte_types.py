@@ -0,0 +1,67 @@
+import os
+import unittest
+import autosar
+import autosar.rte
+from autosar.rte.base import RteTypeManager
+from tests.common import TempDirTestCase, createModel, createPartition
+
+def _createTypes():
+   ws = autosar.workspace()
+   dataTypes = ws.createPackage('DataType', role='DataType')
+   dataTypes.createIntegerDataType('Z_U8_T', min=0, max=255)
+   dataTypes.createRecordDataType('B_Inner_T', [('x', '/DataType/Z_U8_T')])
+   dataTypes.createRecordDataType('A_Outer_T', [('inner', '/DataType/B_Inner_T'), ('y', '/DataType/Z_U8_T')])
+   dataTypes.createArrayDataType('A_Arr_T', '/DataType/A_Outer_T', 4)
+   return ws
+
+class TestRteTypeManager(unittest.TestCase):
+   def test_typedef_order(self):
+      ws = _createTypes()
+      types = RteTypeManager()
+      types.processType(ws, ws.find('/DataType/A_Arr_T'))
+      self.assertEqual([dataType.name for dataType in types.getTypedefOrder()], ['Z_U8_T', 'B_Inner_T', 'A_Outer_T', 'A_Arr_T'])
+      self.assertEqual(types.childTypeMap['/DataType/A_Outer_T'], ['/DataType/B_Inner_T', '/DataType/Z_U8_T'])
+
+   def test_find_type_is_memoized(self):
+      ws = _createTypes()
+      types = RteTypeManager()
+      dataType = types.findType(ws, 'Z_U8_T')
+      self.assertIs(dataType, ws.find('/DataType/Z_U8_T'))
+      ws.find('/DataType').delete('Z_U8_T')
+      self.assertIs(types.findType(ws, 'Z_U8_T'), dataType)
+      self.assertRaises(ValueError, types.findType, ws, 'Missing_T')
+
+   def test_cyclic_reference(self):
+      ws = _createTypes()
+      ws.find('/DataType/B_Inner_T').elements[0].typeRef = '/DataType/A_Outer_T'
+      types = RteTypeManager()
+      with self.assertRaises(ValueError) as context:
+         types.processType(ws, ws.find('/DataType/A_Outer_T'))
+      self.assertIn('cyclic type reference', str(context.exception))
+
+   def test_order_cache(self):
+      ws = _createTypes()
+      types = RteTypeManager()
+      types.processType(ws, ws.find('/DataType/B_Inner_T'))
+      self.assertEqual([dataType.name for dataType in types.getTypedefOrder()], ['Z_U8_T', 'B_Inner_T'])
+      types.processType(ws, ws.find('/DataType/A_Arr_T'))
+      self.assertEqual([dataType.name for dataType in types.getTypedefOrder()], ['Z_U8_T', 'B_Inner_T', 'A_Outer_T', 'A_Arr_T'])
+
+class TestTypeGenerator(TempDirTestCase):
+   def test_record_after_element_types(self):
+      ws, components = createModel()
+      partition = createPartition(components)
+      filename = self.path('Rte_Type.h')
+      autosar.rte.TypeGenerator(partition).generate(filename)
+      with open(filename) as fp:
+         text = fp.read()
+      names = [dataType.name for dataType in partition.types.getTypedefOrder()]
+      self.assertIn('Rec_T', names)
+      positions = [text.index('} %s;'%name) if name == 'Rec_T' else text.index(' %s;'%name) for name in names]
+      self.assertEqual(positions, sorted(positions))
+      for ref, childRefs in partition.types.childTypeMap.items():
+         for childRef in childRefs:
+            self.assertLess(names.index(childRef.rpartition('/')[2]), names.index(ref.rpartition('/')[2]))
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,73 @@
+import sys
+import tracemalloc
+import unittest
+import autosar
+import autosar.base
+from tests.common import createWorkspace
+
+class TestModelObjectAttributes(unittest.TestCase):
+   def test_slot_attributes(self):
+      ws = createWorkspace()
+      dataType = ws.find('/DataType/U0_T')
+      self.assertIn('name', autosar.base.objectAttributeNames(dataType.__class__))
+      self.assertNotIn('__dict__', autosar.base.objectAttributeNames(dataType.__class__))
+      self.assertEqual(dataType.__dict__, {})
+
+   def test_extra_attributes(self):
+      ws = createWorkspace()
+      swc = ws.find('/ComponentType/Swc1')
+      port = swc.requirePorts[0]
+      objects = [ws.find('/DataType/U0_T'), swc, port, swc.behavior.runnables[0], ws.find('/Constant/C_SR0_IV').value]
+      for obj in objects:
+         obj.userData = 'extra'
+         self.assertEqual(obj.userData, 'extra')
+         self.assertEqual(vars(obj), {'userData': 'extra'})
+
+   def test_helper_objects_without_dict(self):
+      ws = createWorkspace()
+      swc = ws.find('/ComponentType/Swc1')
+      runnable = swc.behavior.find('Swc1_Run0')
+      objects = [swc.requirePorts[0].comspec[0], runnable.dataReceivePoints[0], runnable.serverCallPoints[0],
+                 runnable.serverCallPoints[0].operationInstanceRefs[0], ws.find('/PortInterface/CS0_I/Get').arguments[0]]
+      for obj in objects:
+         self.assertFalse(hasattr(obj, '__dict__'))
+         with self.assertRaises(AttributeError):
+            obj.userData = 'extra'
+
+   def test_helper_object_memory(self):
+      comspecClass = autosar.component.DataElementComSpec
+      class DictComSpec(object):
+         def __init__(self, name):
+            self.name = name
+            self.initValueRef = None
+            self._aliveTimeout = None
+            self._queueLength = None
+            self.canInvalidate = None
+      def allocated(create):
+         tracemalloc.start()
+         try:
+            objects = [create('D%d'%i) for i in range(1000)]
+            return tracemalloc.get_traced_memory()[0]
+         finally:
+            tracemalloc.stop()
+      self.assertLess(allocated(comspecClass), allocated(DictComSpec))
+
+   def test_extra_attribute_in_asdict_and_fingerprint(self):
+      ws = createWorkspace()
+      dataType = ws.find('/DataType/U0_T')
+      fingerprint = dataType.fingerprint()
+      dataType.userData = 'extra'
+      self.assertEqual(dataType.asdict()['userData'], 'extra')
+      self.assertNotEqual(dataType.fingerprint(), fingerprint)
+
+   def test_items_of_unassigned_slots(self):
+      ws = createWorkspace()
+      dataType = ws.find('/DataType/U0_T')
+      self.assertFalse(hasattr(dataType, 'desc'))
+      self.assertNotIn('desc', dict(autosar.base.objectItems(dataType)))
+      dataType.desc = 'description'
+      self.assertEqual(dict(autosar.base.objectItems(dataType))['desc'], 'description')
+      self.assertNotIn('desc', vars(dataType))
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,63 @@
+import os
+import pickle
+import sys
+import unittest
+import unittest.mock
+import autosar
+import autosar.snapshot
+from tests.common import TempDirTestCase
+
+class TestSnapshotCache(TempDirTestCase):
+   def setUp(self):
+      super().setUp()
+      self.filename = self.saveModel()
+      self.cacheDir = self.path('cache')
+
+   def load(self):
+      ws = autosar.workspace()
+      ws.loadXML(self.filename, cacheDir=self.cacheDir)
+      return ws
+
+   def readHeader(self):
+      cache = autosar.snapshot.SnapshotCache(self.cacheDir)
+      with open(cache.snapshotPath(self.filename), 'rb') as fp:
+         return pickle.load(fp)
+
+   def test_snapshot_is_used(self):
+      expected = self.load().toXML()
+      with unittest.mock.patch.object(sys.modules['autosar.workspace'], '_loadXMLWorker') as worker:
+         ws = self.load()
+         self.assertFalse(worker.called)
+      self.assertEqual(ws.toXML(), expected)
+      self.assertIs(ws.find('/DataType/U0_T').parent, ws.find('/DataType'))
+
+   def test_changed_file(self):
+      self.load()
+      ws = autosar.workspace()
+      ws.loadXML(self.filename)
+      ws.find('/DataType').createIntegerDataType('New_T', min=0, max=7)
+      ws.saveXML(self.filename)
+      self.assertIsNotNone(self.load().find('/DataType/New_T'))
+
+   def test_touched_file(self):
+      self.load()
+      st = os.stat(self.filename)
+      os.utime(self.filename, ns=(st.st_atime_ns, st.st_mtime_ns+10**9))
+      with unittest.mock.patch.object(sys.modules['autosar.workspace'], '_loadXMLWorker') as worker:
+         self.assertIsNotNone(self.load().find('/DataType/U0_T'))
+         self.assertFalse(worker.called)
+      self.assertEqual(self.readHeader()['mtime'], os.stat(self.filename).st_mtime_ns)
+      with unittest.mock.patch('autosar.snapshot._fileHash') as fileHash:
+         self.assertIsNotNone(self.load().find('/DataType/U0_T'))
+         self.assertFalse(fileHash.called)
+
+   def test_corrupt_snapshot(self):
+      self.load()
+      cache = autosar.snapshot.SnapshotCache(self.cacheDir)
+      with open(cache.snapshotPath(self.filename), 'wb') as fp:
+         fp.write(b'not a snapshot')
+      self.assertIsNone(cache.load(self.filename))
+      self.assertIsNotNone(self.load().find('/DataType/U0_T'))
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import autosar
+from tests.common import TempDirTestCase
+
+_unhandledXML = '''<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="http://autosar.org/3.0.2">
+<TOP-LEVEL-PACKAGES>
+<AR-PACKAGE>
+<SHORT-NAME>Other</SHORT-NAME>
+<ELEMENTS>
+<UNKNOWN-ELEMENT-TYPE><SHORT-NAME>X</SHORT-NAME></UNKNOWN-ELEMENT-TYPE>
+</ELEMENTS>
+</AR-PACKAGE>
+</TOP-LEVEL-PACKAGES>
+</AUTOSAR>
+'''
+
+class TestStreamingLoad(TempDirTestCase):
+   def test_same_result_as_loadXML(self):
+      filename = self.saveModel()
+      expected = autosar.workspace()
+      expected.loadXML(filename)
+      ws = autosar.workspace()
+      ws.loadXML(filename, streaming=True)
+      self.assertEqual(ws.toXML(), expected.toXML())
+      self.assertIsNone(ws.xmlroot)
+
+   def test_autosar4(self):
+      filename = self.saveModel4()
+      expected = autosar.workspace()
+      expected.loadXML(filename)
+      ws = autosar.workspace()
+      ws.loadXML(filename, streaming=True)
+      self.assertEqual(ws.asdict(), expected.asdict())
+
+   def test_unhandled_element_is_logged(self):
+      filename = self.path('unhandled.arxml')
+      with open(filename, 'w') as fp:
+         fp.write(_unhandledXML)
+      for streaming in (False, True):
+         ws = autosar.workspace()
+         with self.assertLogs('autosar.parser.package_parser', 'WARNING') as context:
+            ws.loadXML(filename, streaming=streaming)
+         self.assertEqual(context.output, ['WARNING:autosar.parser.package_parser:unhandled element: UNKNOWN-ELEMENT-TYPE'])
+         self.assertEqual(ws.find('/Other').elements, [])
+
+   def test_loadPackage_not_possible(self):
+      filename = self.saveModel()
+      ws = autosar.workspace()
+      ws.loadXML(filename, streaming=True)
+      with self.assertRaises(ValueError):
+         ws.loadPackage('DataType')
+
+if __name__ == '__main__':
+   unittest.main()
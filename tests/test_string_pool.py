@@ -0,0 +1,59 @@
+import unittest
+import xml.etree.ElementTree as ElementTree
+import autosar
+import autosar.base
+from tests.common import TempDirTestCase
+
+class TestStringPool(unittest.TestCase):
+   def test_intern(self):
+      pool = autosar.base.StringPool()
+      first = ''.join(['/DataType/', 'U8_T'])
+      second = ''.join(['/DataType/', 'U8_T'])
+      self.assertIsNot(first, second)
+      self.assertIs(pool.intern(first), first)
+      self.assertIs(pool.intern(second), first)
+      self.assertIsNone(pool.intern(None))
+      self.assertEqual(len(pool), 1)
+
+   def test_intern_node(self):
+      pool = autosar.base.StringPool()
+      nodes = [ElementTree.fromstring('<R><SHORT-NAME>Name</SHORT-NAME><TYPE-TREF>/A/B</TYPE-TREF><DESC>Text</DESC></R>')
+               for i in range(2)]
+      for node in nodes:
+         for child in node:
+            pool.internNode(child)
+      for i in range(3):
+         self.assertIs(nodes[0][i].tag, nodes[1][i].tag)
+      self.assertIs(nodes[0][0].text, nodes[1][0].text)
+      self.assertIs(nodes[0][1].text, nodes[1][1].text)
+      self.assertNotIn('Text', pool.strings)
+
+   def test_remove_namespace(self):
+      pool = autosar.base.StringPool()
+      xmlRoot = ElementTree.fromstring('<AR xmlns="http://autosar.org/3.0.2"><SHORT-NAME>Name</SHORT-NAME></AR>')
+      autosar.base.removeNamespace(xmlRoot, 'http://autosar.org/3.0.2', pool)
+      self.assertEqual(xmlRoot.tag, 'AR')
+      self.assertIs(xmlRoot[0].text, pool.intern('Name'))
+
+class TestWorkspaceStringPool(TempDirTestCase):
+   def _checkShared(self, ws):
+      self.assertGreater(len(ws.stringPool), 0)
+      refs = [port.portInterfaceRef for name in ('Swc1', 'Swc2') for port in ws.find('/ComponentType/'+name).requirePorts
+              if port.portInterfaceRef == '/PortInterface/CS0_I']
+      self.assertEqual(len(refs), 2)
+      self.assertIs(refs[0], refs[1])
+
+   def test_loadXML(self):
+      filename = self.saveModel()
+      ws = autosar.workspace()
+      ws.loadXML(filename)
+      self._checkShared(ws)
+
+   def test_loadXML_streaming(self):
+      filename = self.saveModel()
+      ws = autosar.workspace()
+      ws.loadXML(filename, streaming=True)
+      self._checkShared(ws)
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import autosar
+from tests.common import TempDirTestCase, createWorkspace
+
+class TestValidateReferences(TempDirTestCase):
+   def test_valid_model(self):
+      ws = createWorkspace()
+      self.assertEqual(ws.validateReferences(), [])
+
+   def test_valid_loaded_model(self):
+      filename = self.saveModel()
+      ws = autosar.workspace()
+      ws.loadXML(filename)
+      self.assertEqual([str(x) for x in ws.validateReferences()], [])
+
+   def test_dangling_reference(self):
+      ws = createWorkspace()
+      port = ws.find('/ComponentType/Swc1/Cli')
+      port.portInterfaceRef = '/PortInterface/Missing_I'
+      errors = ws.validateReferences()
+      self.assertEqual(len(errors), 1)
+      self.assertIs(errors[0].owner, port)
+      self.assertEqual(errors[0].attribute, 'portInterfaceRef')
+      self.assertIsNone(errors[0].target)
+      self.assertEqual(str(errors[0]), '/ComponentType/Swc1/Cli: portInterfaceRef "/PortInterface/Missing_I" not found')
+
+   def test_wrong_target_type(self):
+      ws = createWorkspace()
+      port = ws.find('/ComponentType/Swc1/Cli')
+      port.portInterfaceRef = '/DataType/U0_T'
+      errors = ws.validateReferences()
+      self.assertEqual(len(errors), 1)
+      self.assertIs(errors[0].target, ws.find('/DataType/U0_T'))
+      self.assertEqual(str(errors[0]), '/ComponentType/Swc1/Cli: portInterfaceRef "/DataType/U0_T" refers to IntegerDataType, '
+                                       'expected PortInterface')
+
+   def test_reference_of_object_without_parent(self):
+      ws = createWorkspace()
+      port = ws.find('/ComponentType/Swc1/SR0')
+      port.comspec[0].initValueRef = '/Constant/Missing'
+      errors = ws.validateReferences()
+      self.assertEqual([(error.owner, error.attribute) for error in errors], [(port, 'initValueRef')])
+
+   def test_name_reference(self):
+      ws = createWorkspace()
+      ws.find('/PortInterface/SR0_I/D0').typeRef = 'U1_T'
+      self.assertEqual(ws.validateReferences(), [])
+      ws.find('/PortInterface/SR0_I/D0').typeRef = 'Missing_T'
+      self.assertEqual(len(ws.validateReferences()), 1)
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,110 @@
+import gc
+import json
+import os
+import unittest
+import autosar
+import autosar.xml_backend
+from tests.common import TempDirTestCase, dataDir
+
+_unhandledXML = '''<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="http://autosar.org/3.0.2">
+<TOP-LEVEL-PACKAGES>
+<AR-PACKAGE>
+<SHORT-NAME>Other</SHORT-NAME>
+<ELEMENTS>
+<UNKNOWN-ELEMENT-TYPE><SHORT-NAME>X</SHORT-NAME><DESC><L-2 L="FOR-ALL">x</L-2></DESC></UNKNOWN-ELEMENT-TYPE>
+</ELEMENTS>
+</AR-PACKAGE>
+</TOP-LEVEL-PACKAGES>
+</AUTOSAR>
+'''
+
+def _asdict(ws):
+   return json.loads(json.dumps(ws.asdict(), default=lambda obj: obj.ref))
+
+_backendNames = ['etree', 'expat'] if autosar.xml_backend.lxmlTree is None else ['etree', 'expat', 'lxml']
+
+class TestXMLBackend(TempDirTestCase):
+   def setUp(self):
+      TempDirTestCase.setUp(self)
+      self.filename = os.path.join(dataDir, 'parser3.arxml')
+
+   def _load(self, filename, xmlBackend, **kwargs):
+      ws = autosar.workspace()
+      ws.loadXML(filename, xmlBackend=xmlBackend, **kwargs)
+      return ws
+
+   def test_same_workspace(self):
+      filename4 = self.saveModel4()
+      expected = self._load(self.filename, 'etree')
+      expected4 = self._load(filename4, 'etree')
+      for name in _backendNames:
+         with self.subTest(backend=name):
+            self.assertEqual(_asdict(self._load(self.filename, name)), _asdict(expected))
+            self.assertEqual(self._load(filename4, name).asdict(), expected4.asdict())
+
+   def test_skipTags(self):
+      for name in _backendNames:
+         with self.subTest(backend=name):
+            xmlRoot, namespace = autosar.xml_backend.getXMLBackend(name).parse(self.filename, skipTags=['DESC'])
+            self.assertEqual(namespace, 'http://autosar.org/3.0.2')
+            self.assertIsNotNone(xmlRoot.find('.//SHORT-NAME'))
+            self.assertIsNone(xmlRoot.find('.//DESC'))
+            self.assertEqual(getattr(self._load(self.filename, name).find('/DataType/U0_T'), 'desc', None), 'Unsigned 8-bit')
+            self.assertIsNone(getattr(self._load(self.filename, name, skipTags=['DESC']).find('/DataType/U0_T'), 'desc', None))
+
+   def test_gc_enabled_after_error(self):
+      filename = self.path('malformed.arxml')
+      with open(filename, 'w') as fp:
+         fp.write(_unhandledXML[:200])
+      self.assertTrue(gc.isenabled())
+      for name in _backendNames:
+         backend = autosar.xml_backend.getXMLBackend(name)
+         with self.subTest(backend=name):
+            with self.assertRaises(Exception):
+               backend.parse(filename)
+            self.assertTrue(gc.isenabled())
+            with self.assertRaises(OSError):
+               backend.parse(self.path('missing.arxml'))
+            self.assertTrue(gc.isenabled())
+
+   def test_gc_stays_disabled(self):
+      gc.disable()
+      try:
+         autosar.xml_backend.getXMLBackend('expat').parse(self.filename)
+         self.assertFalse(gc.isenabled())
+      finally:
+         gc.enable()
+
+   def test_unhandled_element_is_logged(self):
+      filename = self.path('unhandled.arxml')
+      with open(filename, 'w') as fp:
+         fp.write(_unhandledXML)
+      for name in _backendNames:
+         with self.subTest(backend=name):
+            with self.assertLogs('autosar.parser.package_parser', 'WARNING') as context:
+               ws = self._load(filename, name)
+            self.assertEqual(context.output, ['WARNING:autosar.parser.package_parser:unhandled element: UNKNOWN-ELEMENT-TYPE'])
+            self.assertEqual(ws.find('/Other').elements, [])
+
+   def test_expat_elementFilter(self):
+      filename = self.path('unhandled.arxml')
+      with open(filename, 'w') as fp:
+         fp.write(_unhandledXML)
+      xmlRoot, namespace = autosar.xml_backend.getXMLBackend('expat').parse(filename, elementFilter=lambda namespace: set())
+      xmlElements = xmlRoot.findall('.//ELEMENTS/*')
+      self.assertEqual([xmlElem.tag for xmlElem in xmlElements], ['UNKNOWN-ELEMENT-TYPE'])
+      self.assertEqual(len(xmlElements[0]), 0)
+
+   def test_getXMLBackend(self):
+      default = 'etree' if autosar.xml_backend.lxmlTree is None else 'lxml'
+      self.assertEqual(autosar.xml_backend.getXMLBackend().name, default)
+      self.assertEqual(autosar.xml_backend.getXMLBackend('lxml').name, default)
+      self.assertEqual(autosar.xml_backend.getXMLBackend('etree').name, 'etree')
+      backend = autosar.xml_backend.ExpatBackend()
+      self.assertIs(autosar.xml_backend.getXMLBackend(backend), backend)
+      with self.assertRaises(ValueError):
+         autosar.xml_backend.getXMLBackend('sax')
+
+if __name__ == '__main__':
+   unittest.main()
@@ -0,0 +1,154 @@
+import unittest
+import autosar
+import autosar.xml_index
+from tests.common import TempDirTestCase
+
+_commentXML = '''<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="http://autosar.org/3.0.2">
+<TOP-LEVEL-PACKAGES>
+<AR-PACKAGE>
+<SHORT-NAME>DataType</SHORT-NAME>
+<ELEMENTS>
+<INTEGER-TYPE>
+<SHORT-NAME>A_T</SHORT-NAME>
+<!-- <INTEGER-TYPE> </INTEGER-TYPE> </INTEGER-TYPE> -->
+<DESC><L-2 L="FOR-ALL"><![CDATA[</INTEGER-TYPE>]]></L-2></DESC>
+<LOWER-LIMIT INTERVAL-TYPE="CLOSED">0</LOWER-LIMIT>
+<UPPER-LIMIT INTERVAL-TYPE="CLOSED">255</UPPER-LIMIT>
+</INTEGER-TYPE>
+<INTEGER-TYPE>
+<SHORT-NAME>B_T</SHORT-NAME>
+<LOWER-LIMIT INTERVAL-TYPE="CLOSED">0</LOWER-LIMIT>
+<UPPER-LIMIT INTERVAL-TYPE="CLOSED">65535</UPPER-LIMIT>
+</INTEGER-TYPE>
+</ELEMENTS>
+</AR-PACKAGE>
+</TOP-LEVEL-PACKAGES>
+</AUTOSAR>
+'''
+
+def _loadAll(package):
+   """accesses the contents of package and all its sub-packages"""
+   for subPackage in package.subPackages:
+      _loadAll(subPackage)
+
+class TestXMLIndex(TempDirTestCase):
+   def setUp(self):
+      TempDirTestCase.setUp(self)
+      self.filename = self.saveModel()
+
+   def test_index(self):
+      index = autosar.xml_index.XMLIndex(self.filename)
+      try:
+         self.assertEqual(index.namespace, 'http://autosar.org/3.0.2')
+         self.assertEqual(index.topLevelPackages, ['/DataType', '/Constant', '/PortInterface', '/ComponentType'])
+         self.assertEqual(index.packages['/DataType'][3], ['/DataType/DataTypeSemantics', '/DataType/DataTypeUnits'])
+         self.assertEqual(index.packages['/Constant'][2], ['/Constant/C_SR0_IV', '/Constant/C_SR1_IV', '/Constant/C_SR2_IV',
+                                                         '/Constant/C_Rec_IV'])
+         packageRef, name, tag, start, end = index.elements['/ComponentType/Swc0_InternalBehavior']
+         self.assertEqual((packageRef, name, tag), ('/ComponentType', 'Swc0_InternalBehavior', 'INTERNAL-BEHAVIOR'))
+         xmlElem = index.parseElement('/PortInterface/CS0_I')
+         self.assertEqual(xmlElem.tag, 'CLIENT-SERVER-INTERFACE')
+         self.assertEqual(xmlElem.find('SHORT-NAME').text, 'CS0_I')
+         self.assertIsNone(index.parseElement('/PortInterface/CS0_I/Get'))
+         self.assertIsNone(index.parseElement('/PortInterface'))
+      finally:
+         index.close()
+      self.assertTrue(index.closed)
+
+   def test_comments_and_CDATA(self):
+      filename = self.path('comments.arxml')
+      with open(filename, 'w') as fp:
+         fp.write(_commentXML)
+      index = autosar.xml_index.XMLIndex(filename)
+      try:
+         self.assertEqual(index.packages['/DataType'][2], ['/DataType/A_T', '/DataType/B_T'])
+         self.assertEqual(index.parseElement('/DataType/A_T').find('./DESC/L-2').text, '</INTEGER-TYPE>')
+         self.assertEqual(index.parseElement('/DataType/B_T').find('SHORT-NAME').text, 'B_T')
+      finally:
+         index.close()
+      ws = autosar.workspace()
+      ws.loadXML(filename, indexed=True)
+      self.assertEqual(ws.find('/DataType/B_T').maxVal, 65535)
+      self.assertEqual(ws.find('/DataType/A_T').desc, '</INTEGER-TYPE>')
+
+   def test_find_loads_element(self):
+      ws = autosar.workspace()
+      ws.loadXML(self.filename, indexed=True)
+      componentTypes = ws.find('/ComponentType')
+      self.assertIsNotNone(componentTypes._deferredXML)
+      swc = ws.find('/ComponentType/Swc1')
+      self.assertEqual(swc.ref, '/ComponentType/Swc1')
+      self.assertIs(ws.find('/ComponentType/Swc1'), swc)
+      self.assertIsNotNone(componentTypes._deferredXML)
+      self.assertEqual([elem.name for elem in componentTypes._elements], ['Swc1'])
+      self.assertEqual(len(ws.xmlIndexLoaders), 1)
+
+   def test_find_nested_ref(self):
+      expected = autosar.workspace()
+      expected.loadXML(self.filename)
+      ws = autosar.workspace()
+      ws.loadXML(self.filename, indexed=True)
+      for ref in ['/ComponentType/Swc0/SR0', '/PortInterface/CS0_I/Get', '/ComponentType/Swc0_InternalBehavior/Swc0_Run0']:
+         with self.subTest(ref=ref):
+            self.assertEqual(ws.find(ref).ref, expected.find(ref).ref)
+            #the element is loaded now, ref is resolved by the element found using the indexed prefix
+            self.assertNotIn(ref, ws.refMap)
+            self.assertIs(ws.find(ref), ws.find(ref))
+      self.assertEqual([elem.name for elem in ws.find('/ComponentType')._elements], ['Swc0', 'Swc0_InternalBehavior'])
+      self.assertIsNotNone(ws.find('/ComponentType')._deferredXML)
+
+   def test_find_ref_not_in_index(self):
+      ws = autosar.workspace()
+      ws.loadXML(self.filename, indexed=True)
+      for ref in ['/ComponentType/Swc0/Missing', '/ComponentType/Swc0_InternalBehavior/Missing', '/Missing/Swc0']:
+         with self.subTest(ref=ref):
+            self.assertIsNone(ws.find(ref))
+      componentTypes = ws.find('/ComponentType')
+      self.assertEqual([elem.name for elem in componentTypes._elements], ['Swc0', 'Swc0_InternalBehavior'])
+      self.assertIsNotNone(componentTypes._deferredXML)
+      #an element missing in the package itself is searched in the complete package
+      self.assertIsNone(ws.find('/ComponentType/Missing'))
+      self.assertIsNone(componentTypes._deferredXML)
+      self.assertIsNone(ws.find('/ComponentType/Swc0//SR0'))
+      self.assertEqual(len(componentTypes._elements), 13)
+
+   def test_same_result_as_loadXML(self):
+      expected = autosar.workspace()
+      expected.loadXML(self.filename)
+      ws = autosar.workspace()
+      ws.loadXML(self.filename, indexed=True)
+      ws.find('/ComponentType/Swc2_Implementation')
+      ws.find('/DataType/Rec_T')
+      self.assertEqual(ws.toXML(), expected.toXML())
+
+   def test_index_closed_after_loading(self):
+      ws = autosar.workspace()
+      ws.loadXML(self.filename, indexed=True)
+      loader = ws.xmlIndexLoaders[0]
+      ws.find('/Constant/C_SR1_IV')
+      for package in ws.packages[:-1]:
+         _loadAll(package)
+      self.assertFalse(loader.index.closed)
+      self.assertIs(ws.xmlIndexLoaders[0], loader)
+      _loadAll(ws.packages[-1])
+      self.assertTrue(loader.index.closed)
+      self.assertEqual(ws.xmlIndexLoaders, [])
+      self.assertEqual(ws.find('/ComponentType/Swc3/Cli').ref, '/ComponentType/Swc3/Cli')
+      self.assertIsNone(ws.find('/ComponentType/Missing'))
+
+   def test_index_closed_without_packages(self):
+      filename = self.path('empty.arxml')
+      with open(filename, 'w') as fp:
+         fp.write('<?xml version="1.0" encoding="UTF-8"?>\n<AUTOSAR xmlns="http://autosar.org/3.0.2">\n</AUTOSAR>\n')
+      ws = autosar.workspace()
+      ws.loadXML(filename, indexed=True)
+      self.assertEqual(ws.xmlIndexLoaders, [])
+
+   def test_not_combined_with_streaming(self):
+      ws = autosar.workspace()
+      with self.assertRaises(ValueError):
+         ws.loadXML(self.filename, indexed=True, streaming=True)
+
+if __name__ == '__main__':
+   unittest.main()
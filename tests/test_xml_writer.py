@@ -0,0 +1,84 @@
+import multiprocessing
+import os
+import unittest
+import unittest.mock
+import autosar
+import autosar.writer.package_writer
+import autosar.writer.workspace_writer
+from autosar.workspace import Workspace
+from tests.common import TempDirTestCase, createWorkspace
+
+class TestSaveXML(TempDirTestCase):
+   def test_saveXML_same_as_toXML(self):
+      ws = createWorkspace()
+      filename = self.path('model.arxml')
+      ws.saveXML(filename)
+      with open(filename, encoding='utf-8') as fp:
+         self.assertEqual(fp.read(), ws.toXML())
+      self.assertEqual(os.listdir(self.tempDir), ['model.arxml'])
+
+   def test_package_selection(self):
+      ws = createWorkspace()
+      xml = ws.toXML(packages='DataType')
+      self.assertIn('<SHORT-NAME>DataType</SHORT-NAME>', xml)
+      self.assertNotIn('<SHORT-NAME>Constant</SHORT-NAME>', xml)
+      reloaded = autosar.workspace()
+      filename = self.path('types.arxml')
+      ws.saveXML(filename, packages=['DataType'])
+      reloaded.loadXML(filename)
+      self.assertEqual([package.name for package in reloaded.packages], ['DataType'])
+
+   def test_error_keeps_existing_file(self):
+      ws = createWorkspace()
+      filename = self.path('model.arxml')
+      with open(filename, 'w') as fp:
+         fp.write('previous content')
+      iterXML = autosar.writer.package_writer.PackageWriter.iterXML
+      def failingIterXML(self, package, ignore, indent=0):
+         for i, line in enumerate(iterXML(self, package, ignore, indent)):
+            if i == 10:
+               raise RuntimeError('write error')
+            yield line
+      with unittest.mock.patch.object(autosar.writer.package_writer.PackageWriter, 'iterXML', failingIterXML):
+         with self.assertRaises(RuntimeError):
+            ws.saveXML(filename)
+      with open(filename) as fp:
+         self.assertEqual(fp.read(), 'previous content')
+      self.assertEqual(os.listdir(self.tempDir), ['model.arxml'])
+
+class TestParallelSaveXML(TempDirTestCase):
+   def readFile(self, ws, name, **kwargs):
+      filename = self.path(name)
+      ws.saveXML(filename, **kwargs)
+      with open(filename, 'rb') as fp:
+         return fp.read()
+
+   def assertSameOutput(self, ws, **kwargs):
+      expected = self.readFile(ws, 'serial.arxml', **kwargs)
+      for processes in (2, 3):
+         self.assertEqual(self.readFile(ws, 'parallel%d.arxml'%processes, processes=processes, **kwargs), expected)
+
+   @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), 'fork is not supported')
+   def test_fork(self):
+      ws = createWorkspace()
+      with unittest.mock.patch.object(Workspace, 'snapshot', autospec=True, side_effect=Workspace.snapshot) as snapshot:
+         self.assertSameOutput(ws)
+         self.assertSameOutput(ws, packages=['DataType', 'ComponentType'])
+         self.assertFalse(snapshot.called)
+
+   def test_snapshot(self):
+      ws = createWorkspace()
+      with unittest.mock.patch.object(multiprocessing, 'get_all_start_methods', return_value=['spawn']):
+         with unittest.mock.patch.object(Workspace, 'snapshot', autospec=True, side_effect=Workspace.snapshot) as snapshot:
+            self.assertSameOutput(ws)
+            self.assertTrue(snapshot.called)
+
+   def test_split_package(self):
+      ws = createWorkspace()
+      writer = autosar.writer.workspace_writer.WorkspaceWriter(ws.version)
+      tasks = writer._createXMLTasks(list(enumerate(ws.packages)), 2)
+      self.assertEqual([task for task in tasks if not isinstance(task, str)][:3],
+                       [('head', [0], 2), ('package', [0, 0], 4), ('package', [0, 1], 4)])
+
+if __name__ == '__main__':
+   unittest.main()